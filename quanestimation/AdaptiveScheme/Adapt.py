@@ -1,10 +1,9 @@
 import numpy as np
-from scipy.integrate import simpson
 from itertools import product
 
-from quanestimation.Common.Common import extract_ele, SIC
+from quanestimation.Common.Common import extract_ele, VectorPOVM, _povm_prob
 from quanestimation.MeasurementOpt.MeasurementStruct import MeasurementOpt
-from quanestimation.Parameterization.GeneralDynamics import Lindblad
+from quanestimation.Parameterization.GeneralDynamics import Lindblad_batch
 from quanestimation.AsymptoticBound.CramerRao import QFIM, CFIM
 
 
@@ -141,7 +140,7 @@ class Adapt:
         > **W:** `matrix`
             -- Weight matrix.
 
-        > **M:** `list of matrices`
+        > **M:** `list of matrices or VectorPOVM`
             -- A set of positive operator-valued measure (POVM). The default measurement 
             is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
 
@@ -152,7 +151,7 @@ class Adapt:
         """
 
         if M == []:
-            M = SIC(len(self.rho0))
+            M = VectorPOVM.SIC(len(self.rho0))
         if W == []:
             W = np.eye(len(self.x))
         self.W = W
@@ -214,37 +213,17 @@ class Adapt:
 
         if self.dynamic_type == "dynamics":
             if self.para_num == 1:
-                F = []
-                if self.dyn_method == "expm":
-                    for i in range(len(self.H)):
-                        dynamics = Lindblad(
-                            self.tspan,
-                            self.rho0,
-                            self.H[i],
-                            self.dH[i],
-                            decay=self.decay,
-                            Hc=self.Hc,
-                            ctrl=self.ctrl,
-                        )
-                        rho_tp, drho_tp = dynamics.expm()
-                        rho, drho = rho_tp[-1], drho_tp[-1]
-                        F_tp = QFIM(rho, drho)
-                        F.append(F_tp)
-                elif self.dyn_method == "ode":
-                    for i in range(len(self.H)):
-                        dynamics = Lindblad(
-                            self.tspan,
-                            self.rho0,
-                            self.H[i],
-                            self.dH[i],
-                            decay=self.decay,
-                            Hc=self.Hc,
-                            ctrl=self.ctrl,
-                        )
-                        rho_tp, drho_tp = dynamics.ode()
-                        rho, drho = rho_tp[-1], drho_tp[-1]
-                        F_tp = QFIM(rho, drho)
-                        F.append(F_tp)
+                rho_all, drho_all = Lindblad_batch(
+                    self.tspan,
+                    self.rho0,
+                    self.H,
+                    self.dH,
+                    decay=self.decay,
+                    Hc=self.Hc,
+                    ctrl=self.ctrl,
+                    method=self.dyn_method,
+                )
+                F = [QFIM(rho, list(drho)) for rho, drho in zip(rho_all, drho_all)]
                 idx = np.argmax(F)
                 H_res, dH_res = self.H[idx], self.dH[idx]
             else:
@@ -258,45 +237,25 @@ class Adapt:
                     H_list.append(H_ele)
                     dH_list.append(dH_ele)
 
+                rho_all, drho_all = Lindblad_batch(
+                    self.tspan,
+                    self.rho0,
+                    H_list,
+                    dH_list,
+                    decay=self.decay,
+                    Hc=self.Hc,
+                    ctrl=self.ctrl,
+                    method=self.dyn_method,
+                )
                 F = []
-                if self.dyn_method == "expm":
-                    for i in range(len(p_list)):
-                        dynamics = Lindblad(
-                            self.tspan,
-                            self.rho0,
-                            self.H_list[i],
-                            self.dH_list[i],
-                            decay=self.decay,
-                            Hc=self.Hc,
-                            ctrl=self.ctrl,
-                        )
-                        rho_tp, drho_tp = dynamics.expm()
-                        rho, drho = rho_tp[-1], drho_tp[-1]
-                        F_tp = QFIM(rho, drho)
-                        if np.linalg.det(F_tp) < self.eps:
-                            F.append(self.eps)
-                        else:
-                            F.append(1.0 / np.trace(np.dot(W, np.linalg.inv(F_tp))))
-                elif self.dyn_method == "ode":
-                    for i in range(len(p_list)):
-                        dynamics = Lindblad(
-                            self.tspan,
-                            self.rho0,
-                            self.H_list[i],
-                            self.dH_list[i],
-                            decay=self.decay,
-                            Hc=self.Hc,
-                            ctrl=self.ctrl,
-                        )
-                        rho_tp, drho_tp = dynamics.ode()
-                        rho, drho = rho_tp[-1], drho_tp[-1]
-                        F_tp = QFIM(rho, drho)
-                        if np.linalg.det(F_tp) < self.eps:
-                            F.append(self.eps)
-                        else:
-                            F.append(1.0 / np.trace(np.dot(W, np.linalg.inv(F_tp))))
+                for rho, drho in zip(rho_all, drho_all):
+                    F_tp = QFIM(rho, list(drho))
+                    if np.linalg.det(F_tp) < self.eps:
+                        F.append(self.eps)
+                    else:
+                        F.append(1.0 / np.trace(np.dot(W, np.linalg.inv(F_tp))))
                 idx = np.argmax(F)
-                H_res, dH_res = self.H_list[idx], self.dH_list[idx]
+                H_res, dH_res = H_list[idx], dH_list[idx]
             m = MeasurementOpt(mtype="projection", minput=[], method="DE")
             m.dynamics(
                 self.tspan,
@@ -385,22 +344,9 @@ def adaptive_dynamics(x, p, M, tspan, rho0, H, dH, decay, Hc, ctrl, W, max_episo
         #### singleparameter senario ####
         p_num = len(p)
 
-        F = []
-        rho_all = []
-        if dyn_method == "expm":
-            for hi in range(p_num):
-                dynamics = Lindblad(tspan, rho0, H[hi], dH[hi], decay=decay, Hc=Hc, ctrl=ctrl)
-                rho_tp, drho_tp = dynamics.expm()
-                F_tp = CFIM(rho_tp[-1], drho_tp[-1], M)
-                F.append(F_tp)
-                rho_all.append(rho_tp[-1])
-        elif dyn_method == "ode":
-            for hi in range(p_num):
-                dynamics = Lindblad(tspan, rho0, H[hi], dH[hi], decay=decay, Hc=Hc, ctrl=ctrl)
-                rho_tp, drho_tp = dynamics.ode()
-                F_tp = CFIM(rho_tp[-1], drho_tp[-1], M)
-                F.append(F_tp)
-                rho_all.append(rho_tp[-1])
+        rho_all, drho_all = Lindblad_batch(tspan, rho0, H, dH, decay=decay, Hc=Hc, ctrl=ctrl, method=dyn_method)
+        F = [CFIM(rho_tp, list(drho_tp), M) for rho_tp, drho_tp in zip(rho_all, drho_all)]
+        rho_all = list(rho_all)
         
         u = 0.0
         if method == "FOP":
@@ -450,28 +396,15 @@ def adaptive_dynamics(x, p, M, tspan, rho0, H, dH, decay, Hc, ctrl, W, max_episo
             dH_list.append(dH_ele)
 
         p_num = len(p_list)
+        rho_all, drho_all = Lindblad_batch(tspan, rho0, H_list, dH_list, decay=decay, Hc=Hc, ctrl=ctrl, method=dyn_method)
         F = []
-        rho_all = []
-        if dyn_method == "expm":
-            for hi in range(p_num):
-                dynamics = Lindblad(tspan, rho0, H_list[hi], dH_list[hi], decay=decay, Hc=Hc, ctrl=ctrl)
-                rho_tp, drho_tp = dynamics.expm()
-                F_tp = CFIM(rho_tp[-1], drho_tp[-1], M)
-                if np.linalg.det(F_tp) < eps:
-                    F.append(eps)
-                else:
-                    F.append(1.0 / np.trace(np.dot(W, np.linalg.inv(F_tp))))
-                rho_all.append(rho_tp[-1])
-        elif dyn_method == "ode":
-            for hi in range(p_num):
-                dynamics = Lindblad(tspan, rho0, H_list[hi], dH_list[hi], decay=decay, Hc=Hc, ctrl=ctrl)
-                rho_tp, drho_tp = dynamics.ode()
-                F_tp = CFIM(rho_tp[-1], drho_tp[-1], M)
-                if np.linalg.det(F_tp) < eps:
-                    F.append(eps)
-                else:
-                    F.append(1.0 / np.trace(np.dot(W, np.linalg.inv(F_tp))))
-                rho_all.append(rho_tp[-1])
+        for rho_tp, drho_tp in zip(rho_all, drho_all):
+            F_tp = CFIM(rho_tp, list(drho_tp), M)
+            if np.linalg.det(F_tp) < eps:
+                F.append(eps)
+            else:
+                F.append(1.0 / np.trace(np.dot(W, np.linalg.inv(F_tp))))
+        rho_all = list(rho_all)
 
         u = [0.0 for i in range(para_num)]
         if method == "FOP":
@@ -608,6 +541,8 @@ def adaptive_Kraus(x, p, M, rho0, K, dK, W, max_episode, eps, savefile, method):
                     savefile_true(np.array(p), x_out, res_exp)
 
 def iter_FOP_singlepara(p, p_num, x, u, rho_all, M, dim, x_opt, ei):
+    from scipy.integrate import simpson
+
     rho = [np.zeros((dim, dim), dtype=np.complex128) for i in range(p_num)]
     for hj in range(p_num):
         x_idx = np.argmin(np.abs(x[0] - (x[0][hj] + u)))
@@ -615,9 +550,7 @@ def iter_FOP_singlepara(p, p_num, x, u, rho_all, M, dim, x_opt, ei):
     print("The tunable parameter is %f" % u)
     res_exp = input("Please enter the experimental result: ")
     res_exp = int(res_exp)
-    pyx = np.zeros(p_num)
-    for xi in range(p_num):
-        pyx[xi] = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
+    pyx = _povm_prob(np.array(rho), M[res_exp : res_exp + 1])[:, 0]
 
     arr = np.array([pyx[m] * p[m] for m in range(p_num)])
     py = simpson(arr, x[0])
@@ -640,6 +573,8 @@ def iter_FOP_singlepara(p, p_num, x, u, rho_all, M, dim, x_opt, ei):
     return p, x_out, res_exp, u
 
 def iter_FOP_multipara(p, p_num, para_num, x, x_list, u, rho_all, M, dim, x_opt, ei, p_shape):
+    from scipy.integrate import simpson
+
     rho = [np.zeros((dim, dim), dtype=np.complex128) for i in range(p_num)]
     for hj in range(p_num):
         idx_list = [np.argmin(np.abs(x[i] - (x_list[hj][i] + u[i]))) for i in range(para_num)]
@@ -648,9 +583,7 @@ def iter_FOP_multipara(p, p_num, para_num, x, x_list, u, rho_all, M, dim, x_opt,
     print("The tunable parameter are %s" % (u))
     res_exp = input("Please enter the experimental result: ")
     res_exp = int(res_exp)
-    pyx_list = np.zeros(p_num)
-    for xi in range(p_num):
-        pyx_list[xi] = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
+    pyx_list = _povm_prob(np.array(rho), M[res_exp : res_exp + 1])[:, 0]
     pyx = pyx_list.reshape(p_shape)
     arr = p * pyx
     for si in reversed(range(para_num)):
@@ -683,6 +616,8 @@ def iter_FOP_multipara(p, p_num, para_num, x, x_list, u, rho_all, M, dim, x_opt,
     return p, x_out, res_exp, u
 
 def iter_MI_singlepara(p, p_num, x, u, rho_all, M, dim, ei):
+    from scipy.integrate import simpson
+
     rho = [np.zeros((dim, dim), dtype=np.complex128) for i in range(p_num)]
     for hj in range(p_num):
         x_idx = np.argmin(np.abs(x[0] - (x[0][hj] + u)))
@@ -691,9 +626,7 @@ def iter_MI_singlepara(p, p_num, x, u, rho_all, M, dim, ei):
 
     res_exp = input("Please enter the experimental result: ")
     res_exp = int(res_exp)
-    pyx = np.zeros(p_num)
-    for xi in range(p_num):
-        pyx[xi] = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
+    pyx = _povm_prob(np.array(rho), M[res_exp : res_exp + 1])[:, 0]
 
     arr = np.array([pyx[m] * p[m] for m in range(p_num)])
     py = simpson(arr, x[0])
@@ -716,8 +649,9 @@ def iter_MI_singlepara(p, p_num, x, u, rho_all, M, dim, ei):
             x_idx = np.argmin(np.abs(x[0] - (x[0][hk] + x[0][ui])))
             rho_u[hk] = rho_all[x_idx]
         value_tp = np.zeros(p_num)
+        pyx_all = _povm_prob(np.array(rho_u), M)
         for mi in range(len(M)):
-            pyx_tp = np.array([np.real(np.trace(np.dot(rho_u[xi], M[mi]))) for xi in range(p_num)])
+            pyx_tp = pyx_all[:, mi]
             mean_tp = simpson(np.array([pyx_tp[i] * p[i] for i in range(p_num)]), x[0])
             value_tp += pyx_tp*np.log2(pyx_tp/mean_tp)
         # arr = np.array([value_tp[i] * p[i] for i in range(p_num)])
@@ -734,6 +668,8 @@ def iter_MI_singlepara(p, p_num, x, u, rho_all, M, dim, ei):
     return p, x_out, res_exp, u
 
 def iter_MI_multipara(p, p_num, para_num, x, x_list, u, rho_all, M, dim, ei, p_shape):
+    from scipy.integrate import simpson
+
     rho = [np.zeros((dim, dim), dtype=np.complex128) for i in range(p_num)]
     for hj in range(p_num):
         idx_list = [np.argmin(np.abs(x[i] - (x_list[hj][i] + u[i]))) for i in range(para_num)]
@@ -742,9 +678,7 @@ def iter_MI_multipara(p, p_num, para_num, x, x_list, u, rho_all, M, dim, ei, p_s
     print("The tunable parameter are %s" % (u))
     res_exp = input("Please enter the experimental result: ")
     res_exp = int(res_exp)
-    pyx_list = np.zeros(p_num)
-    for xi in range(p_num):
-        pyx_list[xi] = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
+    pyx_list = _povm_prob(np.array(rho), M[res_exp : res_exp + 1])[:, 0]
     pyx = pyx_list.reshape(p_shape)
     arr = p * pyx
     for si in reversed(range(para_num)):
@@ -776,8 +710,9 @@ def iter_MI_multipara(p, p_num, para_num, x, x_list, u, rho_all, M, dim, ei, p_s
             x_idx = int(sum([idx_list[i] * np.prod(np.array(p_shape[(i + 1) :])) for i in range(para_num)]))
             rho_u[hj] = rho_all[x_idx]
         value_tp = np.zeros(p_shape)
+        pyx_all = _povm_prob(np.array(rho_u), M)
         for mi in range(len(M)):
-            pyx_list_tp = np.array([np.real(np.trace(np.dot(rho_u[xi], M[mi]))) for xi in range(p_num)])
+            pyx_list_tp = pyx_all[:, mi]
             pyx_tp = pyx_list_tp.reshape(p_shape)
             mean_tp = p * pyx_tp
             for si in reversed(range(para_num)):
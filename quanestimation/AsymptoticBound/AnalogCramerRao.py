@@ -1,7 +1,9 @@
 import numpy as np
 import scipy as sp
-import cvxpy as cp
-from quanestimation.Common.Common import suN_generator
+import os
+import numbers
+from concurrent.futures import ProcessPoolExecutor
+from quanestimation.Common.Common import suN_basis
 from quanestimation.AsymptoticBound.CramerRao import QFIM
 from numpy.linalg import matrix_rank
 
@@ -48,46 +50,92 @@ def HCRB(rho, drho, W, eps=1e-8):
         F = QFIM(rho, drho, eps=eps)
         return np.trace(W @ np.linalg.pinv(F))
     else:
-        dim = len(rho)
+        return HCRBSolver(len(rho), len(drho), W).solve(rho, drho, eps=eps)
+
+
+class HCRBSolver:
+    r"""
+    Reusable solver of the Holevo Cramer-Rao bound (HCRB) via the semidefinite program 
+    (SDP). The SDP is built once for the dimension, the number of parameters and the 
+    weight matrix, with the factor $R$ of the matrix $S_{ab}=\mathrm{Tr}(\Lambda_a
+    \Lambda_b\rho)$ and the vectorized derivatives of the density matrix as the 
+    parameters of the problem. It is compiled on the first call of solve and each 
+    further call, for example, on a grid of states or in the iterations of an 
+    optimization, only updates the parameters and is solved with a warm start.
+
+    Parameters
+    ----------
+    > **dim:** `int`
+        -- The dimension of the density matrix.
+
+    > **para_num:** `int`
+        -- The number of the unknown parameters.
+
+    > **W:** `matrix`
+        -- Weight matrix.
+    """
+
+    def __init__(self, dim, para_num, W):
+
+        import cvxpy as cp
+
+        self.dim = dim
+        self.para_num = para_num
+        self.W = np.asarray(W)
         num = dim * dim
-        para_num = len(drho)
-
-        Lambda = [np.identity(dim)] + suN_generator(dim)
-        Lambda = Lambda / np.sqrt(2)
-
-        vec_drho = [[] for i in range(para_num)]
-        for pi in range(para_num):
-            vec_drho[pi] = np.array(
-                [
-                    np.real(np.trace(drho[pi] @ Lambda[i]))
-                    for i in range(len(Lambda))
-                ]
-            )
-
-        S = np.zeros((num, num), dtype=np.complex128)
-        for a in range(num):
-            for b in range(num):
-                S[a][b] = np.trace(Lambda[a] @ Lambda[b] @ rho)
-
-        accu = len(str(int(1 / eps))) - 1
-        lu, d, perm = sp.linalg.ldl(S.round(accu))
-        R = (lu @ sp.linalg.sqrtm(d)).conj().T
+
+        self.R = cp.Parameter((num, num), complex=True)
+        self.vec_drho = cp.Parameter((para_num, num))
         # ============optimization variables================
         V = cp.Variable((para_num, para_num))
         X = cp.Variable((num, para_num))
         # ================add constraints===================
-        constraints = [cp.bmat([[V, X.T @ R.conj().T], [R @ X, np.identity(num)]]) >> 0]
-        for i in range(para_num):
-            for j in range(para_num):
-                if i == j:
-                    constraints += [X[:, i].T @ vec_drho[j] == 1]
-                else:
-                    constraints += [X[:, i].T @ vec_drho[j] == 0]
+        constraints = [cp.bmat([[V, X.T @ self.R.conj().T], [self.R @ X, np.identity(num)]]) >> 0]
+        constraints += [X.T @ self.vec_drho.T == np.identity(para_num)]
+        self.problem = cp.Problem(cp.Minimize(cp.trace(self.W @ V)), constraints)
 
-        prob = cp.Problem(cp.Minimize(cp.trace(W @ V)), constraints)
-        prob.solve()
+    def solve(self, rho, drho, eps=1e-8):
+        """
+        Calculation of the HCRB for a density matrix and its derivatives.
+
+        Parameters
+        ----------
+        > **rho:** `matrix`
+            -- Density matrix.
+
+        > **drho:** `list`
+            -- Derivatives of the density matrix on the unknown parameters to be 
+            estimated. For example, drho[0] is the derivative vector on the first 
+            parameter.
+
+        > **eps:** `float`
+            -- Machine epsilon.
+
+        Returns
+        ----------
+        **HCRB:** `float`
+            -- The value of Holevo Cramer-Rao bound.
+        """
+
+        if type(drho) != list:
+            raise TypeError("Please make sure drho is a list!")
+
+        self.R.value, self.vec_drho.value = _HCRB_input(rho, drho, eps)
+        self.problem.solve(warm_start=True)
+        return self.problem.value
+
+
+def _HCRB_input(rho, drho, eps):
+    dim = len(rho)
+    Lambda = np.concatenate([np.identity(dim)[None], suN_basis(dim)]) / np.sqrt(2)
+    vec_drho = np.real(np.einsum("pij,aji->pa", np.asarray(drho), Lambda))
+    S = np.einsum("aij,bjk,ki->ab", Lambda, Lambda, np.asarray(rho), optimize=True)
+
+    accu = len(str(int(1 / eps))) - 1
+    lu, d, perm = sp.linalg.ldl(S.round(accu))
+    R = (lu @ sp.linalg.sqrtm(d)).conj().T
+    return R, vec_drho
 
-        return prob.value
 
 def NHB(rho, drho, W):
     """
@@ -113,28 +161,144 @@ def NHB(rho, drho, W):
     """
     if type(drho) != list:
         raise TypeError("Please make sure drho is a list!")
-    
-    dim = len(rho)
-    para_num = len(drho)
-    
-    L_tp = [[[] for i in range(para_num)] for j in range(para_num)]
-    for para_i in range(para_num):
-        for para_j in range(para_i, para_num):
-            L_tp[para_i][para_j] = cp.Variable((dim, dim), hermitian=True)
-            L_tp[para_j][para_i] = L_tp[para_i][para_j]
-    L = cp.vstack([cp.hstack(L_tp[i]) for i in range(para_num)])
-    X = [cp.Variable((dim, dim), hermitian=True) for j in range(para_num)]
-    
-    constraints = [cp.bmat([[L, cp.vstack(X)], [cp.hstack(X), np.identity(dim)]])  >> 0]
-    
-    for i in range(para_num):
-        constraints += [cp.trace(X[i] @ rho) == 0]
-        for j in range(para_num):
-            if i == j:
-                constraints += [cp.trace(X[i] @ drho[j]) == 1]
-            else:
-                constraints += [cp.trace(X[i] @ drho[j]) == 0]
-    prob = cp.Problem(cp.Minimize(cp.real(cp.trace(cp.kron(W, rho) @ L))), constraints)
-    prob.solve()
-
-    return prob.value
+
+    return NHBSolver(len(rho), len(drho), W).solve(rho, drho)
+
+
+class NHBSolver:
+    r"""
+    Reusable solver of the Nagaoka-Hayashi bound (NHB) via the semidefinite program 
+    (SDP). The SDP is built once for the dimension, the number of parameters and the 
+    weight matrix, with the density matrix and its derivatives as the parameters of 
+    the problem. It is compiled on the first call of solve and each further call 
+    only updates the parameters and is solved with a warm start. A set of states, 
+    for example, on the grid of a parameter scan, can be evaluated with solve_many, 
+    which can share the states among a pool of processes with a solver in each.
+
+    Parameters
+    ----------
+    > **dim:** `int`
+        -- The dimension of the density matrix.
+
+    > **para_num:** `int`
+        -- The number of the unknown parameters.
+
+    > **W:** `matrix`
+        -- Weight matrix.
+    """
+
+    def __init__(self, dim, para_num, W):
+
+        import cvxpy as cp
+
+        self.dim = dim
+        self.para_num = para_num
+        self.W = np.asarray(W)
+
+        self.rho = cp.Parameter((dim, dim), complex=True)
+        self.drho = [cp.Parameter((dim, dim), complex=True) for i in range(para_num)]
+
+        L_tp = [[[] for i in range(para_num)] for j in range(para_num)]
+        for para_i in range(para_num):
+            for para_j in range(para_i, para_num):
+                L_tp[para_i][para_j] = cp.Variable((dim, dim), hermitian=True)
+                L_tp[para_j][para_i] = L_tp[para_i][para_j]
+        L = cp.vstack([cp.hstack(L_tp[i]) for i in range(para_num)])
+        X = [cp.Variable((dim, dim), hermitian=True) for j in range(para_num)]
+
+        constraints = [cp.bmat([[L, cp.vstack(X)], [cp.hstack(X), np.identity(dim)]])  >> 0]
+
+        for i in range(para_num):
+            constraints += [cp.trace(X[i] @ self.rho) == 0]
+            for j in range(para_num):
+                if i == j:
+                    constraints += [cp.trace(X[i] @ self.drho[j]) == 1]
+                else:
+                    constraints += [cp.trace(X[i] @ self.drho[j]) == 0]
+        # Tr[(W x rho)L] written blockwise, which keeps the problem DPP in rho
+        objective = cp.real(
+            sum(self.W[i, j] * cp.trace(self.rho @ L_tp[j][i]) for i in range(para_num) for j in range(para_num))
+        )
+        self.problem = cp.Problem(cp.Minimize(objective), constraints)
+
+    def solve(self, rho, drho):
+        """
+        Calculation of the NHB for a density matrix and its derivatives.
+
+        Parameters
+        ----------
+        > **rho:** `matrix`
+            -- Density matrix.
+
+        > **drho:** `list`
+            -- Derivatives of the density matrix on the unknown parameters to be 
+            estimated. For example, drho[0] is the derivative vector on the first 
+            parameter.
+
+        Returns
+        ----------
+        **NHB:** `float`
+            -- The value of Nagaoka-Hayashi bound.
+        """
+
+        if type(drho) != list:
+            raise TypeError("Please make sure drho is a list!")
+
+        self.rho.value = np.asarray(rho, dtype=np.complex128)
+        for para_i in range(self.para_num):
+            self.drho[para_i].value = np.asarray(drho[para_i], dtype=np.complex128)
+        self.problem.solve(warm_start=True)
+        return self.problem.value
+
+    def solve_many(self, rhos, drhos, n_jobs=1):
+        """
+        Calculation of the NHB for a set of density matrices and their derivatives.
+
+        Parameters
+        ----------
+        > **rhos:** `list`
+            -- Density matrices.
+
+        > **drhos:** `list`
+            -- Derivatives of the density matrices on the unknown parameters to be 
+            estimated. For example, drhos[n][0] is the derivative of the nth density 
+            matrix on the first parameter.
+
+        > **n_jobs:** `int`
+            -- The number of processes among which the states are shared. Every 
+            process compiles its own solver. Setting it to -1 uses all the CPU cores.
+
+        Returns
+        ----------
+        **NHB:** `array`
+            -- The values of Nagaoka-Hayashi bound of all the density matrices.
+        """
+
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if not isinstance(n_jobs, numbers.Integral) or n_jobs < 1:
+            raise ValueError("{!r} is not a valid value for n_jobs, supported values are positive integers and -1.".format(n_jobs))
+        drhos = [list(drho) for drho in drhos]
+
+        if n_jobs == 1:
+            return np.array([self.solve(rho, drho) for rho, drho in zip(rhos, drhos)])
+
+        chunksize = max(1, len(rhos) // (4 * n_jobs))
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_NHB_worker_init, initargs=(self.dim, self.para_num, self.W)
+        ) as executor:
+            res = list(executor.map(_NHB_worker_solve, rhos, drhos, chunksize=chunksize))
+        return np.array(res)
+
+
+# solver of the worker processes of NHBSolver.solve_many
+_NHB_worker = None
+
+
+def _NHB_worker_init(dim, para_num, W):
+    global _NHB_worker
+    _NHB_worker = NHBSolver(dim, para_num, W)
+
+
+def _NHB_worker_solve(rho, drho):
+    return _NHB_worker.solve(rho, drho)
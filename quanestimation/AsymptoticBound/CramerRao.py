@@ -1,9 +1,7 @@
 import numpy as np
 from numpy.linalg import inv
 from scipy.linalg import sqrtm, schur, eigvals
-from quanestimation.Common.Common import SIC, suN_generator
-from scipy.integrate import quad
-from scipy.stats import norm, poisson, rayleigh, gamma
+from quanestimation.Common.Common import suN_structure, VectorPOVM, _povm_prob
 
 def CFIM(rho, drho, M=[], eps=1e-8):
     r"""
@@ -27,7 +25,7 @@ def CFIM(rho, drho, M=[], eps=1e-8):
         estimated. For example, drho[0] is the derivative vector on the first 
         parameter.
 
-    > **M:** `list of matrices`
+    > **M:** `list of matrices or VectorPOVM`
         -- A set of positive operator-valued measure (POVM). The default measurement 
         is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
 
@@ -50,29 +48,11 @@ def CFIM(rho, drho, M=[], eps=1e-8):
     if type(drho) != list:
         raise TypeError("Please make sure drho is a list!")
 
-    if M == []:
-        M = SIC(len(rho[0]))
-    else:
-        if type(M) != list:
-            raise TypeError("Please make sure M is a list!")
+    if type(M) != list and not isinstance(M, VectorPOVM):
+        raise TypeError("Please make sure M is a list!")
 
-    m_num = len(M)
     para_num = len(drho)
-    CFIM_res = np.zeros([para_num, para_num])
-    for pi in range(0, m_num):
-        Mp = M[pi]
-        p = np.real(np.trace(rho @ Mp))
-        Cadd = np.zeros([para_num, para_num])
-        if p > eps:
-            for para_i in range(0, para_num):
-                drho_i = drho[para_i]
-                dp_i = np.real(np.trace(drho_i @ Mp))
-                for para_j in range(para_i, para_num):
-                    drho_j = drho[para_j]
-                    dp_j = np.real(np.trace(drho_j @ Mp))
-                    Cadd[para_i][para_j] = np.real(dp_i * dp_j / p)
-                    Cadd[para_j][para_i] = np.real(dp_i * dp_j / p)
-        CFIM_res += Cadd
+    CFIM_res = CFIM_batch([rho], [drho], M=M, eps=eps)[0]
 
     if para_num == 1:
         return CFIM_res[0][0]
@@ -80,6 +60,55 @@ def CFIM(rho, drho, M=[], eps=1e-8):
         return CFIM_res
 
 
+def CFIM_batch(rho, drho, M=[], eps=1e-8):
+    r"""
+    Calculation of the classical Fisher information matrix (CFIM) for a stack of 
+    density matrices, for example, the states on the grid of a Bayesian bound. 
+    The probabilities $p(y|\textbf{x})=\mathrm{Tr}(\rho\Pi_y)$ and their derivatives 
+    are evaluated for all the states and POVM elements at once via
+    $\mathrm{Tr}(AB)=\sum_{ij}A_{ij}B_{ji}$, no matrix product is calculated.
+
+    Parameters
+    ----------
+    > **rho:** `array`
+        -- Density matrices with the shape (N, d, d).
+
+    > **drho:** `array`
+        -- Derivatives of the density matrices on the unknown parameters to be 
+        estimated with the shape (N, P, d, d). For example, drho[n][0] is the 
+        derivative of the nth density matrix on the first parameter.
+
+    > **M:** `list or array`
+        -- A set of positive operator-valued measure (POVM) with the shape (m, d, d). 
+        The default measurement is a set of rank-one symmetric informationally 
+        complete POVM (SIC-POVM), whose probabilities are calculated with fast 
+        Fourier transforms by SIC_prob.
+
+    > **eps:** `float`
+        -- Machine epsilon.
+
+    Returns
+    ----------
+    **CFIM:** `array` 
+        -- The CFIMs of all the density matrices with the shape (N, P, P).
+    """
+
+    rho = np.asarray(rho)
+    drho = np.asarray(drho)
+    if rho.ndim != 3 or drho.ndim != 4:
+        raise ValueError(
+            "Please make sure the shape of rho is (N, d, d) and the shape of drho is (N, P, d, d)!"
+        )
+
+    p = _povm_prob(rho, M)
+    dp = _povm_prob(drho, M)
+
+    p_inv = np.zeros_like(p)
+    idx = p > eps
+    p_inv[idx] = 1.0 / p[idx]
+    return (dp * p_inv[:, None, :]) @ np.swapaxes(dp, -1, -2)
+
+
 def FIM(p, dp, eps=1e-8):
     r"""
     Calculation of the classical Fisher information (CFI) and classical Fisher 
@@ -112,37 +141,67 @@ def FIM(p, dp, eps=1e-8):
         is more than one), it returns CFIM.
     """
 
-    para_num = len(dp)
-    m_num = len(p)
-    FIM_res = np.zeros([para_num, para_num])
-    for pi in range(0, m_num):
-        p_tp = p[pi]
-        Cadd = np.zeros([para_num, para_num])
-        if p_tp > eps:
-            for para_i in range(0, para_num):
-                dp_i = dp[para_i][pi]
-                for para_j in range(para_i, para_num):
-                    dp_j = dp[para_j][pi]
-                    Cadd[para_i][para_j] = np.real(dp_i * dp_j / p_tp)
-                    Cadd[para_j][para_i] = np.real(dp_i * dp_j / p_tp)
-        FIM_res += Cadd
-
-    if para_num == 1:
+    FIM_res = FIM_batch([p], [dp], eps=eps)[0]
+    if len(dp) == 1:
         return FIM_res[0][0]
     else:
         return FIM_res
 
+
+def FIM_batch(p, dp, eps=1e-8):
+    r"""
+    Calculation of the classical Fisher information matrix (CFIM) for a sequence 
+    of discrete probability distributions. The outcomes with $p_y\leq$ eps are 
+    discarded and the sums over the outcomes are done as matrix products.
+
+    Parameters
+    ----------
+    > **p:** `array` 
+        -- The probability distributions with the shape (N, Y), where Y is the 
+        number of the outcomes.
+
+    > **dp:** `array`
+        -- Derivatives of the probability distributions on the unknown parameters 
+        to be estimated with the shape (N, P, Y). For example, dp[n][0] is the 
+        derivative of the nth distribution on the first parameter.
+
+    > **eps:** `float`
+        -- Machine epsilon.
+
+    Returns
+    ----------
+    **CFIM:** `array` 
+        -- The CFIMs of all the probability distributions with the shape (N, P, P).
+    """
+
+    p = np.asarray(p)
+    dp = np.asarray(dp)
+    if p.ndim != 2 or dp.ndim != 3:
+        raise ValueError(
+            "Please make sure the shape of p is (N, Y) and the shape of dp is (N, P, Y)!"
+        )
+
+    p_inv = np.zeros(p.shape)
+    idx = np.real(p) > eps
+    p_inv[idx] = 1.0 / np.real(p[idx])
+    return np.real((dp * p_inv[:, None, :]) @ np.swapaxes(dp, -1, -2))
+
+
 def FI_Expt(y1, y2, dx, ftype="norm"):
     r"""
     Calculation of the classical Fisher information (CFI) based on the experiment data. 
+    The CFI is obtained from the fidelity $F$ (Bhattacharyya coefficient) between 
+    the distributions of the data at x and x+dx as $8(1-F)/dx^2$.
 
     Parameters
     ----------
     > **y1:** `array` 
-        -- Experimental data obtained at the true value (x).
+        -- Experimental data obtained at the true value (x). For ftype="histogram", 
+        it is the number of counts in each bin.
 
     > **y2:** `list`
-        -- Experimental data obtained at x+dx.
+        -- Experimental data obtained at x+dx. For ftype="histogram", it is the 
+        number of counts in each bin, the bins being the same as those of y1.
 
     > **dx:** `float`
         -- A known small drift of the parameter.
@@ -153,19 +212,24 @@ def FI_Expt(y1, y2, dx, ftype="norm"):
         "gamma" -- gamma distribution.
         "rayleigh" -- rayleigh distribution.
         "poisson" -- poisson distribution.
+        "histogram" -- pre-binned data, the fidelity is calculated between the 
+        normalized histograms.
 
     Returns
     ----------
     **CFI:** `float or matrix` 
 
     NOTICE: the current output is unstable and will be modified in the future.
+    For data too large to be loaded at once, use `StreamingFI`.
     """
+    from scipy.integrate import quad
+    from scipy.stats import norm, rayleigh, gamma
+
     fidelity = 0.0
     if ftype == "norm":
         mu1, std1 = norm.fit(y1)
         mu2, std2 = norm.fit(y2)
-        f_func = lambda x: np.sqrt(norm.pdf(x, mu1, std1)*norm.pdf(x, mu2, std2))
-        fidelity, err = quad(f_func, -np.inf, np.inf)
+        fidelity = _fidelity_norm(mu1, std1, mu2, std2)
     elif ftype == "gamma":
         a1, alpha1, beta1 = gamma.fit(y1)
         a2, alpha2, beta2 = gamma.fit(y2)
@@ -177,18 +241,243 @@ def FI_Expt(y1, y2, dx, ftype="norm"):
         f_func = lambda x: np.sqrt(rayleigh.pdf(x, mean1, var1)*rayleigh.pdf(x, mean2, var2))
         fidelity, err = quad(f_func, -np.inf, np.inf)
     elif ftype == "poisson":
-        k1 = np.arange(max(y1)+1)
-        k2 = np.arange(max(y2)+1)
-        p1_pois = poisson.pmf(k1, np.mean(y1))
-        p2_pois = poisson.pmf(k2, np.mean(y2))
-        p1_pois, p2_pois = p1_pois/sum(p1_pois), p2_pois/sum(p2_pois)
-        fidelity = sum([np.sqrt(p1_pois[i]*p2_pois[i]) for i in range(len(p1_pois))])
+        fidelity = _fidelity_poisson(np.mean(y1), max(y1), np.mean(y2), max(y2))
+    elif ftype == "histogram":
+        fidelity = _fidelity_hist(y1, y2)
     else:
-        raise ValueError("{!r} is not a valid value for ftype, supported values are 'norm', 'poisson', 'gamma' and 'rayleigh'.".format(ftype))
+        raise ValueError("{!r} is not a valid value for ftype, supported values are 'norm', 'poisson', 'gamma', 'rayleigh' and 'histogram'.".format(ftype))
     Fc = 8*(1-fidelity)/dx**2
     return Fc
 
 
+class StreamingFI:
+    r"""
+    Classical Fisher information (CFI) based on the experiment data which are fed 
+    in chunks via `update()`, for example while reading a large detector log. 
+    Only the sufficient statistics of the two data sets (at x and x+dx) are kept 
+    in memory: the number of data, the mean and the sum of squared deviations for 
+    the normal distribution, the number of data, the mean and the maximum for the 
+    poisson distribution, and the histograms for ftype="histogram". The fidelity 
+    and the CFI are the same as those of `FI_Expt` with all the data.
+
+    Attributes
+    ----------
+    > **ftype:** `string`
+        -- The distribution the data follows. Options are:  
+        "norm" (default) -- normal distribution.  
+        "poisson" -- poisson distribution.
+        "histogram" -- the data are binned with the bin edges `bins`.
+
+    > **bins:** `array`
+        -- The bin edges for ftype="histogram". The data outside the bins are 
+        discarded.
+    """
+
+    def __init__(self, ftype="norm", bins=None):
+
+        if ftype not in ("norm", "poisson", "histogram"):
+            raise ValueError("{!r} is not a valid value for ftype, supported values are 'norm', 'poisson' and 'histogram'.".format(ftype))
+        if ftype == "histogram" and bins is None:
+            raise ValueError("Please give the bin edges (bins) for ftype='histogram'.")
+        self.ftype = ftype
+        self.bins = None if bins is None else np.asarray(bins, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        """
+        Discard all the data fed in so far.
+        """
+        if self.ftype == "histogram":
+            self.stats = np.zeros((2, len(self.bins) - 1))
+        else:
+            # number of data, mean, and the sum of squared deviations (norm) or 
+            # the maximum (poisson) for the two data sets
+            self.stats = np.zeros((2, 3))
+
+    def update(self, y1=None, y2=None):
+        """
+        Update the statistics with a chunk of the data obtained at x (y1) and/or 
+        a chunk of the data obtained at x+dx (y2).
+
+        Parameters
+        ----------
+        > **y1:** `array`
+            -- Experimental data obtained at the true value (x).
+
+        > **y2:** `array`
+            -- Experimental data obtained at x+dx.
+        """
+        for i, y in enumerate([y1, y2]):
+            if y is None:
+                continue
+            y = np.ravel(np.asarray(y, dtype=np.float64))
+            if len(y) == 0:
+                continue
+            if self.ftype == "histogram":
+                self.stats[i] += np.histogram(y, bins=self.bins)[0]
+            else:
+                self.stats[i] = _merge_stats(self.stats[i], y, self.ftype)
+        return self
+
+    @property
+    def count(self):
+        """
+        The numbers of data fed in for the two data sets.
+        """
+        if self.ftype == "histogram":
+            return self.stats.sum(axis=1).astype(int)
+        return self.stats[:, 0].astype(int)
+
+    def fidelity(self):
+        """
+        The fidelity (Bhattacharyya coefficient) between the distributions of the 
+        two data sets.
+        """
+        if np.any(self.count == 0):
+            raise ValueError("Please feed in the data of both x and x+dx before calculating the fidelity.")
+        if self.ftype == "histogram":
+            return _fidelity_hist(self.stats[0], self.stats[1])
+        (n1, mean1, s1), (n2, mean2, s2) = self.stats
+        if self.ftype == "norm":
+            return _fidelity_norm(mean1, np.sqrt(s1/n1), mean2, np.sqrt(s2/n2))
+        else:
+            return _fidelity_poisson(mean1, s1, mean2, s2)
+
+    def FI(self, dx):
+        """
+        The CFI with the known small drift dx of the parameter.
+        """
+        return 8*(1-self.fidelity())/dx**2
+
+    def checkpoint(self, filename="checkpoint"):
+        """
+        Save the accumulated statistics to the file "filename.npz", from which the 
+        calculation can be resumed.
+        """
+        np.savez(filename, stats=self.stats)
+
+    def resume(self, filename="checkpoint"):
+        """
+        Restore the state saved by `checkpoint()`.
+        """
+        data = np.load(filename if filename.endswith(".npz") else filename + ".npz")
+        self.stats = data["stats"]
+        return self
+
+
+def _merge_stats(stats, y, ftype):
+    # combine the statistics (number, mean, sum of squared deviations or maximum) 
+    # of the data fed in so far with those of a new chunk
+    n, mean, s = stats
+    n_y, mean_y = len(y), np.mean(y)
+    n_tot = n + n_y
+    delta = mean_y - mean
+    mean_tot = mean + delta*n_y/n_tot
+    if ftype == "norm":
+        s_tot = s + np.sum((y - mean_y)**2) + delta**2*n*n_y/n_tot
+    else:
+        s_tot = max(s, np.max(y)) if n > 0 else np.max(y)
+    return np.array([n_tot, mean_tot, s_tot])
+
+
+def _fidelity_norm(mu1, std1, mu2, std2):
+    # Bhattacharyya coefficient of two normal distributions
+    var = std1**2 + std2**2
+    return np.sqrt(2*std1*std2/var)*np.exp(-(mu1 - mu2)**2/(4*var))
+
+
+def _fidelity_poisson(mean1, max1, mean2, max2):
+    # Bhattacharyya coefficient of two poisson distributions truncated at the 
+    # largest observed values and renormalized
+    from scipy.stats import poisson
+
+    p1_pois = poisson.pmf(np.arange(int(max1)+1), mean1)
+    p2_pois = poisson.pmf(np.arange(int(max2)+1), mean2)
+    p1_pois, p2_pois = p1_pois/np.sum(p1_pois), p2_pois/np.sum(p2_pois)
+    num = min(len(p1_pois), len(p2_pois))
+    return np.sum(np.sqrt(p1_pois[:num]*p2_pois[:num]))
+
+
+def _fidelity_hist(h1, h2):
+    # Bhattacharyya coefficient of two histograms on the same bins
+    h1 = np.asarray(h1, dtype=np.float64)
+    h2 = np.asarray(h2, dtype=np.float64)
+    if h1.shape != h2.shape:
+        raise ValueError("Please make sure the two histograms have the same bins!")
+    return np.sum(np.sqrt(h1/np.sum(h1)*h2/np.sum(h2)))
+
+
+def _LD_input(rho, drho):
+    if np.ndim(rho) == 3:
+        rho = np.asarray(rho, dtype=np.complex128)
+        drho = np.asarray(drho, dtype=np.complex128)
+        if drho.ndim != 4 or len(drho) != len(rho):
+            raise ValueError(
+                "Please make sure the shape of drho is (N, P, d, d) for a stack of density matrices!"
+            )
+        return rho, drho, True
+
+    if type(drho) != list:
+        raise TypeError("Please make sure drho is a list!")
+    rho = np.asarray(rho, dtype=np.complex128)[None]
+    drho = np.asarray(drho, dtype=np.complex128)[None]
+    return rho, drho, False
+
+
+def _eig_batch(rho, drho):
+    """
+    Eigenvalues, eigenvectors and the derivatives in the eigenbasis for a stack 
+    of density matrices (N, d, d) and their derivatives (N, P, d, d).
+    """
+    val, vec = np.linalg.eigh(rho)
+    vec_dag = np.swapaxes(vec.conj(), -1, -2)
+    drho_eig = vec_dag[:, None] @ drho @ vec[:, None]
+    return val, vec, drho_eig
+
+
+def _LD_eig(val, drho_eig, LDtype, eps):
+    """
+    Logarithmic derivatives in the eigenbasis from the output of _eig_batch.
+    """
+    if LDtype == "SLD":
+        val_sum = val[:, None, :, None] + val[:, None, None, :]
+        idx = val_sum > eps
+        LD_eig = np.where(idx, 2 * drho_eig / np.where(idx, val_sum, 1.0), 0.0)
+        # L = 2*drho is exact for pure states
+        pure = np.abs(1 - np.sum(val**2, axis=-1)) < eps
+        LD_eig[pure] = 2 * drho_eig[pure]
+    elif LDtype == "RLD" or LDtype == "LLD":
+        if LDtype == "RLD":
+            val_div = val[:, None, :, None]
+        else:
+            val_div = val[:, None, None, :]
+        idx = np.broadcast_to(np.abs(val_div) > eps, drho_eig.shape)
+        if np.any(np.abs(drho_eig[~idx]) > eps):
+            raise ValueError(
+                "The {} does not exist. It only exist when the support of drho is contained in the support of rho.".format(LDtype)
+            )
+        LD_eig = np.where(idx, drho_eig / np.where(idx, val_div, 1.0), 0.0)
+    else:
+        raise ValueError("{!r} is not a valid value for LDtype, supported values are 'SLD', 'RLD' and 'LLD'.".format(LDtype))
+    return LD_eig
+
+
+def _LD_output(LD_eig, vec, rep, batch):
+    if rep == "original":
+        LD = vec[:, None] @ LD_eig @ np.swapaxes(vec.conj(), -1, -2)[:, None]
+    elif rep == "eigen":
+        LD = LD_eig
+    else:
+        raise ValueError("{!r} is not a valid value for rep, supported values are 'original' and 'eigen'.".format(rep))
+
+    if batch:
+        return LD
+    elif len(LD[0]) == 1:
+        return LD[0][0]
+    else:
+        return list(LD[0])
+
+
 def SLD(rho, drho, rep="original", eps=1e-8):
     r"""
     Calculation of the symmetric logarithmic derivative (SLD) for a density matrix.
@@ -207,13 +496,14 @@ def SLD(rho, drho, rep="original", eps=1e-8):
 
     Parameters
     ----------
-    > **rho:** `matrix`
-        -- Density matrix.
+    > **rho:** `matrix or array`
+        -- Density matrix, or a stack of density matrices with the shape (N, d, d).
 
-    > **drho:** `list`
+    > **drho:** `list or array`
         -- Derivatives of the density matrix on the unknown parameters to be 
         estimated. For example, drho[0] is the derivative vector on the first 
-        parameter.
+        parameter. For a stack of density matrices, it is an array with the shape 
+        (N, P, d, d).
 
     > **rep:** `string`
         -- The basis for the SLDs. Options are:  
@@ -230,60 +520,14 @@ def SLD(rho, drho, rep="original", eps=1e-8):
     **SLD(s):** `matrix or list`
         --For single parameter estimation (the length of drho is equal to one), the
         output is a matrix and for multiparameter estimation (the length of drho 
-        is more than one), it returns a list.
+        is more than one), it returns a list. For a stack of density matrices, 
+        it returns an array with the shape (N, P, d, d).
     """
 
-    if type(drho) != list:
-        raise TypeError("Please make sure drho is a list!")
-
-    para_num = len(drho)
-    dim = len(rho)
-    SLD = [[] for i in range(0, para_num)]
-
-    purity = np.trace(rho @ rho)
-
-    if np.abs(1 - purity) < eps:
-        SLD_org = [[] for i in range(0, para_num)]
-        for para_i in range(0, para_num):
-            SLD_org[para_i] = 2 * drho[para_i]
-
-            if rep == "original":
-                SLD[para_i] = SLD_org[para_i]
-            elif rep == "eigen":
-                val, vec = np.linalg.eig(rho)
-                val = np.real(val)
-                SLD[para_i] = vec.conj().transpose() @ SLD_org[para_i] @ vec
-            else:
-                raise ValueError("{!r} is not a valid value for rep, supported values are 'original' and 'eigen'.".format(rep))
-        if para_num == 1:
-            return SLD[0]
-        else:
-            return SLD
-    else:
-        val, vec = np.linalg.eig(rho)
-        val = np.real(val)
-        for para_i in range(0, para_num):
-            SLD_eig = np.array(
-                [[0.0 + 0.0 * 1.0j for i in range(0, dim)] for i in range(0, dim)]
-            )
-            for fi in range(0, dim):
-                for fj in range(0, dim):
-                    if val[fi] + val[fj] > eps:
-                        SLD_eig[fi][fj] = 2 * (vec[:, fi].conj().transpose() @ drho[para_i] @ vec[:, fj]) / (val[fi] + val[fj])
-                        
-            SLD_eig[SLD_eig == np.inf] = 0.0
-
-            if rep == "original":
-                SLD[para_i] = vec @ SLD_eig @ vec.conj().transpose()
-            elif rep == "eigen":
-                SLD[para_i] = SLD_eig
-            else:
-                raise ValueError("{!r} is not a valid value for rep, supported values are 'original' and 'eigen'.".format(rep))
-
-        if para_num == 1:
-            return SLD[0]
-        else:
-            return SLD
+    rho, drho, batch = _LD_input(rho, drho)
+    val, vec, drho_eig = _eig_batch(rho, drho)
+    SLD_eig = _LD_eig(val, drho_eig, "SLD", eps)
+    return _LD_output(SLD_eig, vec, rep, batch)
 
 
 def RLD(rho, drho, rep="original", eps=1e-8):
@@ -300,13 +544,14 @@ def RLD(rho, drho, rep="original", eps=1e-8):
 
     Parameters
     ----------
-    > **rho:** `matrix`
-        -- Density matrix.
+    > **rho:** `matrix or array`
+        -- Density matrix, or a stack of density matrices with the shape (N, d, d).
 
-    > **drho:** `list`
+    > **drho:** `list or array`
         -- Derivatives of the density matrix on the unknown parameters to be 
         estimated. For example, drho[0] is the derivative vector on the first 
-        parameter.
+        parameter. For a stack of density matrices, it is an array with the shape 
+        (N, P, d, d).
 
     > **rep:** `string`
         -- The basis for the RLD(s). Options are:  
@@ -323,43 +568,14 @@ def RLD(rho, drho, rep="original", eps=1e-8):
     **RLD(s):** `matrix or list`
         -- For single parameter estimation (the length of drho is equal to one), the output 
         is a matrix and for multiparameter estimation (the length of drho is more than one), 
-        it returns a list.
+        it returns a list. For a stack of density matrices, it returns an array with the 
+        shape (N, P, d, d).
     """
-    
-    if type(drho) != list:
-        raise TypeError("Please make sure drho is a list!")
 
-    para_num = len(drho)
-    dim = len(rho)
-    RLD = [[] for i in range(0, para_num)]
-
-    val, vec = np.linalg.eig(rho)
-    val = np.real(val)
-    for para_i in range(0, para_num):
-        RLD_eig = np.array(
-            [[0.0 + 0.0 * 1.0j for i in range(0, dim)] for i in range(0, dim)]
-        )
-        for fi in range(0, dim):
-            for fj in range(0, dim):
-                term_tp = vec[:, fi].conj().transpose() @ drho[para_i] @ vec[:, fj]
-                if np.abs(val[fi]) > eps:
-                    RLD_eig[fi][fj] = (term_tp/val[fi])
-                else:
-                    if np.abs(term_tp) < eps:
-                        raise ValueError("The RLD does not exist. It only exist when the support of drho is contained in the support of rho.",
-            )
-        RLD_eig[RLD_eig == np.inf] = 0.0
-
-        if rep == "original":
-            RLD[para_i] = vec @ RLD_eig @ vec.conj().transpose()
-        elif rep == "eigen":
-            RLD[para_i] = RLD_eig
-        else:
-            raise ValueError("{!r} is not a valid value for rep, supported values are 'original' and 'eigen'.".format(rep))
-    if para_num == 1:
-        return RLD[0]
-    else:
-        return RLD
+    rho, drho, batch = _LD_input(rho, drho)
+    val, vec, drho_eig = _eig_batch(rho, drho)
+    RLD_eig = _LD_eig(val, drho_eig, "RLD", eps)
+    return _LD_output(RLD_eig, vec, rep, batch)
 
 
 def LLD(rho, drho, rep="original", eps=1e-8):
@@ -376,13 +592,14 @@ def LLD(rho, drho, rep="original", eps=1e-8):
 
     Parameters
     ----------
-    > **rho:** `matrix`
-        -- Density matrix.
+    > **rho:** `matrix or array`
+        -- Density matrix, or a stack of density matrices with the shape (N, d, d).
 
-    > **drho:** `list`
+    > **drho:** `list or array`
         -- Derivatives of the density matrix on the unknown parameters to be 
         estimated. For example, drho[0] is the derivative vector on the first 
-        parameter.
+        parameter. For a stack of density matrices, it is an array with the shape 
+        (N, P, d, d).
 
     > **rep:** `string`
         -- The basis for the LLD(s). Options are:  
@@ -399,44 +616,43 @@ def LLD(rho, drho, rep="original", eps=1e-8):
     **LLD(s):** `matrix or list`
         -- For single parameter estimation (the length of drho is equal to one), the output 
         is a matrix and for multiparameter estimation (the length of drho is more than one), 
-        it returns a list.
+        it returns a list. For a stack of density matrices, it returns an array with the 
+        shape (N, P, d, d).
     """
 
-    if type(drho) != list:
-        raise TypeError("Please make sure drho is a list!")
+    rho, drho, batch = _LD_input(rho, drho)
+    val, vec, drho_eig = _eig_batch(rho, drho)
+    LLD_eig = _LD_eig(val, drho_eig, "LLD", eps)
+    return _LD_output(LLD_eig, vec, rep, batch)
 
-    para_num = len(drho)
-    dim = len(rho)
-    LLD = [[] for i in range(0, para_num)]
-
-    val, vec = np.linalg.eig(rho)
-    val = np.real(val)
-    for para_i in range(0, para_num):
-        LLD_eig = np.array(
-            [[0.0 + 0.0 * 1.0j for i in range(0, dim)] for i in range(0, dim)]
-        )
-        for fi in range(0, dim):
-            for fj in range(0, dim):
-                term_tp = vec[:, fi].conj().transpose() @ drho[para_i] @ vec[:, fj]
-                if np.abs(val[fj]) > eps:
-                    LLD_eig[fi][fj] = term_tp/val[fj]
-                else: 
-                    if np.abs(term_tp) < eps:
-                        raise ValueError("The LLD does not exist. It only exist when the support of drho is contained in the support of rho.",
-            )
-        LLD_eig[LLD_eig == np.inf] = 0.0
 
-        if rep == "original":
-            LLD[para_i] = vec @ LLD_eig @ vec.conj().transpose()
-        elif rep == "eigen":
-            LLD[para_i] = LLD_eig
-        else:
-            raise ValueError("{!r} is not a valid value for rep, supported values are 'original' and 'eigen'.".format(rep))
+def _QFIM_eig(val, drho_eig, LDtype, eps):
+    """
+    QFIMs from the output of _eig_batch. The SLD based QFIMs are computed directly 
+    in the eigenbases, F_ab = sum_ij 2Re(<i|drho_a|j><j|drho_b|i>)/(lambda_i+lambda_j),
+    without constructing the SLD operators.
+    """
+    if LDtype != "SLD":
+        LD_eig = _LD_eig(val, drho_eig, LDtype, eps)
+        return np.einsum("ni,naij,nbij->nab", val, LD_eig, LD_eig.conj(), optimize=True)
 
-    if para_num == 1:
-        return LLD[0]
-    else:
-        return LLD
+    val_sum = val[:, :, None] + val[:, None, :]
+    idx = val_sum > eps
+    weight = np.where(idx, 2.0 / np.where(idx, val_sum, 1.0), 0.0)
+    return np.real(np.einsum("nij,naij,nbji->nab", weight, drho_eig, drho_eig, optimize=True))
+
+
+def _QFIM_SLD_rank1(rho, drho):
+    """
+    SLD based QFIM of a rank-one density matrix. The state vector is read off the 
+    column of rho with the largest diagonal entry, so only the products drho|psi> 
+    are needed.
+    """
+    k = np.argmax(np.real(np.diag(rho)))
+    psi = rho[:, k] / np.sqrt(np.real(rho[k, k]))
+    drho_psi = drho @ psi
+    drho_00 = np.real(drho_psi @ psi.conj())
+    return 4 * np.real(drho_psi.conj() @ drho_psi.T) - 3 * np.outer(drho_00, drho_00)
 
 
 def QFIM(rho, drho, LDtype="SLD", exportLD=False, eps=1e-8):
@@ -493,6 +709,17 @@ def QFIM(rho, drho, LDtype="SLD", exportLD=False, eps=1e-8):
 
     para_num = len(drho)
 
+    if LDtype == "SLD" and exportLD == False:
+        rho = np.asarray(rho, dtype=np.complex128)
+        drho = np.asarray(drho, dtype=np.complex128)
+        # Tr(rho^2) = 1 for pure states
+        if np.abs(1 - np.real(np.vdot(rho, rho))) < eps:
+            QFIM_res = _QFIM_SLD_rank1(rho, drho)
+        else:
+            val, vec, drho_eig = _eig_batch(rho[None], drho[None])
+            QFIM_res = _QFIM_eig(val, drho_eig, "SLD", eps)[0]
+        return QFIM_res[0][0] if para_num == 1 else QFIM_res
+
     # single parameter estimation
     if para_num == 1:
         if LDtype == "SLD":
@@ -541,6 +768,93 @@ def QFIM(rho, drho, LDtype="SLD", exportLD=False, eps=1e-8):
         return QFIM_res, LD_tp
 
 
+def QFIM_batch(rho, drho, LDtype="SLD", eps=1e-8):
+    r"""
+    Calculation of the quantum Fisher information matrix (QFIM) for a stack of 
+    density matrices, for example, the states on the grid of a Bayesian bound. 
+    All the density matrices are diagonalized with one batched Hermitian 
+    eigendecomposition and the QFIMs are evaluated in their eigenbases.
+
+    Parameters
+    ----------
+    > **rho:** `array`
+        -- Density matrices with the shape (N, d, d).
+
+    > **drho:** `array`
+        -- Derivatives of the density matrices on the unknown parameters to be 
+        estimated with the shape (N, P, d, d). For example, drho[n][0] is the 
+        derivative of the nth density matrix on the first parameter.
+
+    > **LDtype:** `string`
+        -- Types of QFI (QFIM) can be set as the objective function. Options are:  
+        "SLD" (default) -- QFI (QFIM) based on symmetric logarithmic derivative (SLD).  
+        "RLD" -- QFI (QFIM) based on right logarithmic derivative (RLD).  
+        "LLD" -- QFI (QFIM) based on left logarithmic derivative (LLD).
+
+    > **eps:** `float`
+        -- Machine epsilon.
+
+    Returns
+    ----------
+    **QFIM:** `array` 
+        -- The QFIMs of all the density matrices with the shape (N, P, P). It is 
+        complex for the RLD and LLD based QFIMs.
+    """
+
+    rho = np.asarray(rho, dtype=np.complex128)
+    drho = np.asarray(drho, dtype=np.complex128)
+    if rho.ndim != 3 or drho.ndim != 4:
+        raise ValueError(
+            "Please make sure the shape of rho is (N, d, d) and the shape of drho is (N, P, d, d)!"
+        )
+
+    val, vec, drho_eig = _eig_batch(rho, drho)
+    return _QFIM_eig(val, drho_eig, LDtype, eps)
+
+
+def QFIM_pure(psi, dpsi):
+    r"""
+    Calculation of the quantum Fisher information (QFI) and quantum Fisher 
+    information matrix (QFIM) for a pure state $|\psi\rangle$. The entry of 
+    QFIM $\mathcal{F}$ is
+    \begin{align}
+    \mathcal{F}_{ab}=4\mathrm{Re}\left(\langle\partial_a\psi|\partial_b\psi\rangle
+    -\langle\partial_a\psi|\psi\rangle\langle\psi|\partial_b\psi\rangle\right),
+    \end{align}
+
+    which only involves the state vector and its derivatives.
+
+    Parameters
+    ----------
+    > **psi:** `array`
+        -- State vector.
+
+    > **dpsi:** `list`
+        -- Derivatives of the state vector on the unknown parameters to be 
+        estimated. For example, dpsi[0] is the derivative vector on the first 
+        parameter.
+
+    Returns
+    ----------
+    **QFI or QFIM:** `float or matrix` 
+        -- For single parameter estimation (the length of dpsi is equal to one), 
+        the output is QFI and for multiparameter estimation (the length of dpsi 
+        is more than one), it returns QFIM.
+    """
+
+    if type(dpsi) != list:
+        raise TypeError("Please make sure dpsi is a list!")
+
+    psi = np.asarray(psi, dtype=np.complex128).reshape(-1)
+    dpsi = np.asarray(dpsi, dtype=np.complex128).reshape(len(dpsi), -1)
+    overlap = dpsi.conj() @ psi
+    QFIM_res = 4 * np.real(dpsi.conj() @ dpsi.T - np.outer(overlap, overlap.conj()))
+    if len(dpsi) == 1:
+        return QFIM_res[0][0]
+    else:
+        return QFIM_res
+
+
 def QFIM_Kraus(rho0, K, dK, LDtype="SLD", exportLD=False, eps=1e-8):
     """
     Calculation of the quantum Fisher information (QFI) and quantum Fisher 
@@ -622,61 +936,67 @@ def QFIM_Bloch(r, dr, eps=1e-8):
     if type(dr) != list:
         raise TypeError("Please make sure dr is a list")
 
-    para_num = len(dr)
-    QFIM_res = np.zeros([para_num, para_num])
+    QFIM_res = QFIM_Bloch_batch([r], [dr], eps=eps)[0]
+    if len(dr) == 1:
+        return QFIM_res[0][0]
+    else:
+        return QFIM_res
+
 
-    dim = int(np.sqrt(len(r) + 1))
-    Lambda = suN_generator(dim)
+def QFIM_Bloch_batch(r, dr, eps=1e-8):
+    r"""
+    Calculation of the SLD based quantum Fisher information matrix (QFIM) in Bloch 
+    representation for a stack of Bloch vectors, for example, a trajectory from the 
+    state tomography. For qudits, the QFIM is $\partial_a\textbf{r}^{\mathrm{T}}
+    \left(\frac{d}{2(d-1)}G-\textbf{r}\textbf{r}^{\mathrm{T}}\right)^{-1}
+    \partial_b\textbf{r}$ with $G_{ij}=\frac{1}{2}\mathrm{Tr}(\rho\{\lambda_i, \lambda_j\})
+    =\frac{2}{d}\delta_{ij}+\sqrt{\frac{2(d-1)}{d}}\sum_k d_{ijk}r_k$, which is obtained 
+    as a sparse contraction of the symmetric structure constants $d_{ijk}$ of SU($d$)
+    with the Bloch vectors.
 
-    if dim == 2:
-        #### single-qubit system ####
-        r_norm = np.linalg.norm(r) ** 2
-        if np.abs(r_norm - 1.0) < eps:
-            for para_i in range(0, para_num):
-                for para_j in range(para_i, para_num):
-                    QFIM_res[para_i][para_j] = np.real(np.inner(dr[para_i], dr[para_j]))
-                    QFIM_res[para_j][para_i] = QFIM_res[para_i][para_j]
-        else:
-            for para_i in range(0, para_num):
-                for para_j in range(para_i, para_num):
-                    QFIM_res[para_i][para_j] = np.real(
-                        np.inner(dr[para_i], dr[para_j])
-                        + np.inner(r, dr[para_i])
-                        * np.inner(r, dr[para_j])
-                        / (1 - r_norm)
-                    )
-                    QFIM_res[para_j][para_i] = QFIM_res[para_i][para_j]
-    else:
-        rho = np.identity(dim, dtype=np.complex128) / dim
-        for di in range(dim**2 - 1):
-            rho += np.sqrt(dim * (dim - 1) / 2) * r[di] * Lambda[di] / dim
-
-        G = np.zeros((dim**2 - 1, dim**2 - 1), dtype=np.complex128)
-        for row_i in range(dim**2 - 1):
-            for col_j in range(row_i, dim**2 - 1):
-                anti_commu = Lambda[row_i] @ Lambda[col_j] + Lambda[col_j] @ Lambda[row_i]
-                G[row_i][col_j] = 0.5 * np.trace(rho @ anti_commu)
-                G[col_j][row_i] = G[row_i][col_j]
-
-        mat_tp = G * dim / (2 * (dim - 1)) - np.dot(
-            np.array(r).reshape(len(r), 1), np.array(r).reshape(1, len(r))
+    Parameters
+    ----------
+    > **r:** `array`
+        -- Bloch vectors with the shape (N, d^2-1).
+
+    > **dr:** `array`
+        -- Derivatives of the Bloch vectors on the unknown parameters to be 
+        estimated with the shape (N, P, d^2-1). For example, dr[n][0] is the 
+        derivative of the nth Bloch vector on the first parameter.
+
+    > **eps:** `float`
+        -- Machine epsilon.
+
+    Returns
+    ----------
+    **QFIM:** `array` 
+        -- The QFIMs of all the Bloch vectors with the shape (N, P, P).
+    """
+
+    r = np.real(np.asarray(r))
+    dr = np.real(np.asarray(dr))
+    if r.ndim != 2 or dr.ndim != 3:
+        raise ValueError(
+            "Please make sure the shape of r is (N, d^2-1) and the shape of dr is (N, P, d^2-1)!"
         )
-        mat_inv = inv(mat_tp)
-
-        for para_m in range(0, para_num):
-            for para_n in range(para_m, para_num):
-                QFIM_res[para_m][para_n] = np.real(
-                    np.dot(
-                        np.array(dr[para_n]).reshape(1, len(r)),
-                        np.dot(mat_inv, np.array(dr[para_m]).reshape(len(r), 1)),
-                    )[0][0]
-                )
-                QFIM_res[para_n][para_m] = QFIM_res[para_m][para_n]
 
-    if para_num == 1:
-        return QFIM_res[0][0]
+    num = r.shape[-1]
+    dim = int(np.sqrt(num + 1))
+    QFIM_res = dr @ np.swapaxes(dr, -1, -2)
+    if dim == 2:
+        #### single-qubit system ####
+        r_norm = np.sum(r**2, axis=-1)
+        mixed = np.abs(r_norm - 1.0) >= eps
+        r_dr = np.einsum("ni,nai->na", r, dr)
+        QFIM_res[mixed] += r_dr[mixed, :, None] * r_dr[mixed, None, :] / (1 - r_norm[mixed, None, None])
     else:
-        return QFIM_res
+        _, d_abc = suN_structure(dim)
+        # G of all the Bloch vectors, shape (N, K, K)
+        G = np.moveaxis(np.reshape(d_abc @ r.T, (num, num, -1)), -1, 0)
+        G = G * np.sqrt(2 * (dim - 1) / dim) + 2.0 / dim * np.identity(num)
+        mat_tp = G * dim / (2 * (dim - 1)) - r[:, :, None] * r[:, None, :]
+        QFIM_res = dr @ np.linalg.solve(mat_tp, np.swapaxes(dr, -1, -2))
+    return QFIM_res
 
 
 def QFIM_Gauss(R, dR, D, dD):
@@ -713,29 +1033,80 @@ def QFIM_Gauss(R, dR, D, dD):
         is more than one), it returns QFIM.
     """
 
-    para_num = len(dR)
-    m = int(len(R) / 2)
-    QFIM_res = np.zeros([para_num, para_num])
-
-    C = np.array(
-        [
-            [D[i][j] - R[i] * R[j] for j in range(2 * m)]
-            for i in range(2 * m)
-        ]
-    )
-    dC = [
-        np.array(
-            [
-                [
-                    dD[k][i][j] - dR[k][i] * R[j] - R[i] * dR[k][j]
-                    for j in range(2 * m)
-                ]
-                for i in range(2 * m)
-            ]
-        )
-        for k in range(para_num)
-    ]
+    QFIM_res = QFIM_Gauss_batch([R], [dR], [D], [dD])[0]
+    if len(dR) == 1:
+        return QFIM_res[0][0]
+    else:
+        return QFIM_res
+
+
+def QFIM_Gauss_batch(R, dR, D, dD):
+    r"""
+    Calculation of the SLD based quantum Fisher information matrix (QFIM) for a 
+    sequence of gaussian states. The symplectic decomposition of every covariance 
+    matrix is calculated once, and the expansion in the basis of the $2\times 2$ 
+    blocks is contracted for all the states, parameters and modes at once.
+
+    Parameters
+    ----------
+    > **R:** `array` 
+        -- First-order moments with the shape (N, 2m), where m is the number of 
+        the modes.
+
+    > **dR:** `array`
+        -- Derivatives of the first-order moments on the unknown parameters to be 
+        estimated with the shape (N, P, 2m). For example, dR[n][0] is the derivative 
+        of the nth first-order moment on the first parameter.
+
+    > **D:** `array`
+        -- Second-order moments with the shape (N, 2m, 2m).
+
+    > **dD:** `array`
+        -- Derivatives of the second-order moments on the unknown parameters to be 
+        estimated with the shape (N, P, 2m, 2m).
+
+    Returns
+    ----------
+    **QFIM:** `array` 
+        -- The QFIMs of all the gaussian states with the shape (N, P, P).
+    """
 
+    R = np.asarray(R, dtype=np.float64)
+    dR = np.asarray(dR, dtype=np.float64)
+    D = np.asarray(D, dtype=np.float64)
+    dD = np.asarray(dD, dtype=np.float64)
+    num, para_num, m = len(R), dR.shape[1], R.shape[-1] // 2
+
+    C = D - R[:, :, None] * R[:, None, :]
+    dC = dD - dR[:, :, :, None] * R[:, None, None, :] - R[:, None, :, None] * dR[:, :, None, :]
+
+    S_inv, c = zip(*[_Gauss_symplectic(C_n) for C_n in C])
+    S_inv, c = np.array(S_inv), np.array(c)
+
+    sx = np.array([[0.0, 1.0], [1.0, 0.0]])
+    sy = np.array([[0.0, -1.0j], [1.0j, 0.0]])
+    sz = np.array([[1.0, 0.0], [0.0, -1.0]])
+    a_Gauss = np.array([1j * sy, sz, np.eye(2), sx])
+
+    # the coefficients Tr[S^{-1} dC S^{-T} A^T] in the basis A_{ljk} = e_{jk} x a_l / sqrt(2)
+    # of the 2x2 blocks, shape (N, P, 4, m, m)
+    Y = S_inv[:, None] @ dC @ np.swapaxes(S_inv, -1, -2)[:, None]
+    gs = np.einsum("nijpkq,lpq->niljk", Y.reshape(num, para_num, m, 2, m, 2), a_Gauss) / np.sqrt(2)
+    sign = np.array([-1.0, 1.0, -1.0, 1.0])
+    denom = 4 * c[:, None, :, None] * c[:, None, None, :] + sign[None, :, None, None]
+    coef = gs / denom[:, None]
+    Mat = np.einsum("niljk,lpq->nijpkq", coef, a_Gauss).reshape(num, para_num, 2 * m, 2 * m) / np.sqrt(2)
+    G = np.real(np.swapaxes(S_inv, -1, -2)[:, None] @ Mat @ S_inv[:, None])
+
+    QFIM_res = np.einsum("niab,njba->nij", G, dC)
+    QFIM_res += dR @ np.linalg.solve(C, np.swapaxes(dR, -1, -2))
+    return np.real(QFIM_res)
+
+
+def _Gauss_symplectic(C):
+    # inverse of the symplectic matrix S in the Williamson decomposition of the 
+    # covariance matrix C and the symplectic eigenvalues c
+    m = len(C) // 2
     C_sqrt = sqrtm(C)
     J = np.kron([[0, 1], [-1, 0]], np.eye(m))
     B = C_sqrt @ J @ C_sqrt
@@ -745,44 +1116,6 @@ def QFIM_Gauss(R, dR, D, dD):
     vals = eigvals(B)
     c = vals[::2].imag
     Diag = np.diagflat(c**-0.5)
-    S = inv(J @ C_sqrt @ Q @ P @ np.kron([[0, 1], [-1, 0]], -Diag)).T @ P.T
-
-    sx = np.array([[0.0, 1.0], [1.0, 0.0]])
-    sy = np.array([[0.0, -1.0j], [1.0j, 0.0]])
-    sz = np.array([[1.0, 0.0], [0.0, -1.0]])
-    a_Gauss = [1j * sy, sz, np.eye(2), sx]
-
-    es = [
-        [np.eye(1, m**2, m * i + j).reshape(m, m) for j in range(m)] for i in range(m)
-    ]
-
-    As = [[np.kron(s, a_Gauss[i]) / np.sqrt(2) for s in es] for i in range(4)]
-    gs = [
-        [[[np.trace(inv(S) @ dC @ inv(S.T) @ aa.T) for aa in a] for a in A] for A in As]
-        for dC in dC
-    ]
-    G = [np.zeros((2 * m, 2 * m)).astype(np.longdouble) for _ in range(para_num)]
-
-    for i in range(para_num):
-        for j in range(m):
-            for k in range(m):
-                for l in range(4):
-                    G[i] += np.real(
-                        gs[i][l][j][k]
-                        / (4 * c[j] * c[k] + (-1) ** (l + 1))
-                        * inv(S.T)
-                        @ As[l][j][k]
-                        @ inv(S)
-                    )
-
-    QFIM_res += np.real(
-        [
-            [np.trace(G[i] @ dC[j]) + dR[i] @ inv(C) @ dR[j] for j in range(para_num)]
-            for i in range(para_num)
-        ]
-    )
-
-    if para_num == 1:
-        return QFIM_res[0][0]
-    else:
-        return QFIM_res
+    # S = inv(K).T @ P.T, so that inv(S) = P @ K.T with the permutation P
+    K = J @ C_sqrt @ Q @ P @ np.kron([[0, 1], [-1, 0]], -Diag)
+    return P @ K.T, c
@@ -1,32 +1,50 @@
 from quanestimation.AsymptoticBound.CramerRao import (
     CFIM,
+    CFIM_batch,
     QFIM,
+    QFIM_batch,
+    QFIM_pure,
     QFIM_Bloch,
+    QFIM_Bloch_batch,
     QFIM_Gauss,
+    QFIM_Gauss_batch,
     QFIM_Kraus,
     FIM,
+    FIM_batch,
     FI_Expt,
+    StreamingFI,
     LLD,
     RLD,
     SLD,
 )
 from quanestimation.AsymptoticBound.AnalogCramerRao import (
     HCRB,
+    HCRBSolver,
     NHB,
+    NHBSolver,
 )
 
 __all__ = [
     "CramerRao",
     "CFIM",
+    "CFIM_batch",
     "QFIM",
+    "QFIM_batch",
+    "QFIM_pure",
     "QFIM_Bloch",
+    "QFIM_Bloch_batch",
     "QFIM_Gauss",
+    "QFIM_Gauss_batch",
     "QFIM_Kraus",
     "FIM",
+    "FIM_batch",
     "FI_Expt",
+    "StreamingFI",
     "LLD",
     "RLD",
     "SLD",
     "HCRB",
+    "HCRBSolver",
     "NHB",
+    "NHBSolver",
 ]
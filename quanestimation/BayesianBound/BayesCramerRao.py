@@ -1,12 +1,10 @@
 import numpy as np
-from scipy import interpolate
-from scipy.integrate import simpson, solve_bvp
 from itertools import product
-from quanestimation.AsymptoticBound.CramerRao import CFIM, QFIM
-from quanestimation.Common.Common import SIC, extract_ele
+from quanestimation.Common.Common import VectorPOVM
+from quanestimation.BayesianBound.ParameterGrid import _grid_input
 
 
-def BCFIM(x, p, rho, drho, M=[], eps=1e-8):
+def BCFIM(x, p=None, rho=None, drho=None, M=[], eps=1e-8, n_jobs=1):
     r"""
     Calculation of the Bayesian classical Fisher information (BCFI) and the 
     Bayesian classical Fisher information matrix (BCFIM) of the form
@@ -18,8 +16,9 @@ def BCFIM(x, p, rho, drho, M=[], eps=1e-8):
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `multidimensional array`
         -- The prior distribution.
@@ -31,13 +30,17 @@ def BCFIM(x, p, rho, drho, M=[], eps=1e-8):
         -- Derivatives of the parameterized density matrix (rho) with respect to the unknown
         parameters to be estimated.
 
-    > **M:** `list of matrices`
+    > **M:** `list of matrices or VectorPOVM`
         -- A set of positive operator-valued measure (POVM). The default measurement 
         is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
 
     > **eps:** `float`
         -- Machine epsilon.
 
+    > **n_jobs:** `int`
+        -- The number of threads among which the grid points are shared. Setting it 
+        to -1 uses all the CPU cores.
+
     Returns
     ----------
     **BCFI or BCFIM:** `float or matrix`
@@ -51,68 +54,21 @@ def BCFIM(x, p, rho, drho, M=[], eps=1e-8):
         solutions.html).
     """
 
-    para_num = len(x)
-    if para_num == 1:
+    grid = _grid_input(x, p, rho, drho=drho)
+    if type(M) != list and not isinstance(M, VectorPOVM):
+        raise TypeError("Please make sure M is a list!")
+
+    F_all = grid.CFIM(M, eps=eps, n_jobs=n_jobs)
+    BCFIM_res = grid.integrate(grid.p.reshape(-1, 1, 1) * F_all)
+    if grid.para_num == 1:
         #### single parameter scenario ####
-        if M == []:
-            M = SIC(len(rho[0]))
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-
-        p_num = len(p)
-        if type(drho[0]) == list:
-            drho = [drho[i][0] for i in range(p_num)]
-        p_num = len(p)
-        F_tp = np.zeros(p_num)
-        for m in range(p_num):
-            F_tp[m] = CFIM(rho[m], [drho[m]], M=M, eps=eps)
-
-        arr = [p[i] * F_tp[i] for i in range(p_num)]
-        return simpson(arr, x[0])
+        return BCFIM_res[0][0]
     else:
         #### multiparameter scenario ####
-        p_shape = np.shape(p)
-        p_ext = extract_ele(p, para_num)
-        rho_ext = extract_ele(rho, para_num)
-        drho_ext = extract_ele(drho, para_num)
-
-        p_list, rho_list, drho_list = [], [], []
-        for p_ele, rho_ele, drho_ele in zip(p_ext, rho_ext, drho_ext):
-            p_list.append(p_ele)
-            rho_list.append(rho_ele)
-            drho_list.append(drho_ele)
-
-        dim = len(rho_list[0])
-        if M == []:
-            M = SIC(dim)
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-
-        F_list = [
-            [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-            for k in range(para_num)
-        ]
-        for i in range(len(p_list)):
-            F_tp = CFIM(rho_list[i], drho_list[i], M=M, eps=eps)
-            for pj in range(para_num):
-                for pk in range(para_num):
-                    F_list[pj][pk][i] = F_tp[pj][pk]
-
-        BCFIM_res = np.zeros([para_num, para_num])
-        for para_i in range(0, para_num):
-            for para_j in range(para_i, para_num):
-                F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                arr = p * F_ij
-                for si in reversed(range(para_num)):
-                    arr = simpson(arr, x[si])
-                BCFIM_res[para_i][para_j] = arr
-                BCFIM_res[para_j][para_i] = arr
         return BCFIM_res
 
 
-def BQFIM(x, p, rho, drho, LDtype="SLD", eps=1e-8):
+def BQFIM(x, p=None, rho=None, drho=None, LDtype="SLD", eps=1e-8, n_jobs=1):
     r"""
     Calculation of the Bayesian quantum Fisher information (BQFI) and the 
     Bayesian quantum Fisher information matrix (BQFIM) of the form
@@ -124,8 +80,9 @@ def BQFIM(x, p, rho, drho, LDtype="SLD", eps=1e-8):
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `multidimensional array`
         -- The prior distribution.
@@ -146,6 +103,10 @@ def BQFIM(x, p, rho, drho, LDtype="SLD", eps=1e-8):
     > **eps:** `float`
         -- Machine epsilon.
 
+    > **n_jobs:** `int`
+        -- The number of threads among which the grid points are shared. Setting it 
+        to -1 uses all the CPU cores.
+
     Returns
     ----------
     **BQFI or BQFIM:** `float or matrix`
@@ -154,54 +115,19 @@ def BQFIM(x, p, rho, drho, LDtype="SLD", eps=1e-8):
         it returns BQFIM.
     """
 
-    para_num = len(x)
-    if para_num == 1:
+    grid = _grid_input(x, p, rho, drho=drho)
+
+    F_all = grid.QFIM(LDtype=LDtype, eps=eps, n_jobs=n_jobs)
+    BQFIM_res = np.real(grid.integrate(grid.p.reshape(-1, 1, 1) * F_all))
+    if grid.para_num == 1:
         #### single parameter scenario ####
-        p_num = len(p)
-        if type(drho[0]) == list:
-            drho = [drho[i][0] for i in range(p_num)]
-
-        F_tp = np.zeros(p_num)
-        for m in range(p_num):
-            F_tp[m] = QFIM(rho[m], [drho[m]], LDtype=LDtype, eps=eps)
-        arr = [p[i] * F_tp[i] for i in range(p_num)]
-        return simpson(arr, x[0])
+        return BQFIM_res[0][0]
     else:
         #### multiparameter scenario ####
-        p_shape = np.shape(p)
-        p_ext = extract_ele(p, para_num)
-        rho_ext = extract_ele(rho, para_num)
-        drho_ext = extract_ele(drho, para_num)
-
-        p_list, rho_list, drho_list = [], [], []
-        for p_ele, rho_ele, drho_ele in zip(p_ext, rho_ext, drho_ext):
-            p_list.append(p_ele)
-            rho_list.append(rho_ele)
-            drho_list.append(drho_ele)
-
-        F_list = [
-            [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-            for k in range(para_num)
-        ]
-        for i in range(len(p_list)):
-            F_tp = QFIM(rho_list[i], drho_list[i], LDtype=LDtype, eps=eps)
-            for pj in range(para_num):
-                for pk in range(para_num):
-                    F_list[pj][pk][i] = F_tp[pj][pk]
-
-        BQFIM_res = np.zeros([para_num, para_num])
-        for para_i in range(0, para_num):
-            for para_j in range(para_i, para_num):
-                F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                arr = p * F_ij
-                for si in reversed(range(para_num)):
-                    arr = simpson(arr, x[si])
-                BQFIM_res[para_i][para_j] = arr
-                BQFIM_res[para_j][para_i] = arr
         return BQFIM_res
 
 
-def BCRB(x, p, dp, rho, drho, M=[], b=[], db=[], btype=1, eps=1e-8):
+def BCRB(x, p=None, dp=None, rho=None, drho=None, M=[], b=[], db=[], btype=1, eps=1e-8, n_jobs=1):
     r"""
     Calculation of the Bayesian Cramer-Rao bound (BCRB). The covariance matrix 
     with a prior distribution $p(\textbf{x})$ is defined as
@@ -247,8 +173,9 @@ def BCRB(x, p, dp, rho, drho, M=[], b=[], db=[], btype=1, eps=1e-8):
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `multidimensional array`
         -- The prior distribution.
@@ -260,7 +187,7 @@ def BCRB(x, p, dp, rho, drho, M=[], b=[], db=[], btype=1, eps=1e-8):
         -- Derivatives of the parameterized density matrix (rho) with respect to the unknown
         parameters to be estimated.
 
-    > **M:** `list of matrices`
+    > **M:** `list of matrices or VectorPOVM`
         -- A set of positive operator-valued measure (POVM). The default measurement 
         is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
 
@@ -280,6 +207,10 @@ def BCRB(x, p, dp, rho, drho, M=[], b=[], db=[], btype=1, eps=1e-8):
     > **eps:** `float`
         -- Machine epsilon.
 
+    > **n_jobs:** `int`
+        -- The number of threads among which the grid points are shared. Setting it 
+        to -1 uses all the CPU cores.
+
     Returns
     ----------
     **BCRB:** `float or matrix`
@@ -293,208 +224,15 @@ def BCRB(x, p, dp, rho, drho, M=[], b=[], db=[], btype=1, eps=1e-8):
         solutions.html).
     """
 
-    para_num = len(x)
-    if para_num == 1:
-        #### single parameter scenario ####
-        p_num = len(p)
-        if not b:
-            b = np.zeros(p_num)
-            db = np.zeros(p_num)
-        elif not db:
-            db = np.zeros(p_num)
-
-        if M == []:
-            M = SIC(len(rho[0]))
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-
-        if type(drho[0]) == list:
-            drho = [drho[i][0] for i in range(p_num)]
-        if type(b[0]) == list or type(b[0]) == np.ndarray:
-            b = b[0]
-        if type(db[0]) == list or type(db[0]) == np.ndarray:
-            db = db[0]
+    grid = _grid_input(x, p, rho, drho=drho, dp=dp)
+    if type(M) != list and not isinstance(M, VectorPOVM):
+        raise TypeError("Please make sure M is a list!")
 
-        F_tp = np.zeros(p_num)
-        for m in range(p_num):
-            F_tp[m] = CFIM(rho[m], [drho[m]], M=M, eps=eps)
+    F_all = grid.CFIM(M, eps=eps, n_jobs=n_jobs)
+    return _BCRB_grid(grid, F_all, b, db, btype)
 
-        if btype == 1:
-            arr = [
-                p[i] * ((1 + db[i]) ** 2 / F_tp[i] + b[i] ** 2) for i in range(p_num)
-            ]
-            F = simpson(arr, x[0])
-            return F
-        elif btype == 2:
-            arr = [p[i] * F_tp[i] for i in range(p_num)]
-            F1 = simpson(arr, x[0])
-            arr2 = [p[j] * (1 + db[j]) for j in range(p_num)]
-            B = simpson(arr2, x[0])
-            arr3 = [p[k] * b[k] ** 2 for k in range(p_num)]
-            bb = simpson(arr3, x[0])
-            F = B**2 / F1 + bb
-            return F
-        elif btype == 3:
-            I_tp = [np.real(dp[i] * dp[i] / p[i] ** 2) for i in range(p_num)]
-            arr = [p[j]*(dp[j]*b[j]/p[j]+(1 + db[j]))**2 / (I_tp[j] + F_tp[j]) for j in range(p_num)]
-            F = simpson(arr, x[0])
-            return F
-        else:
-            raise NameError("NameError: btype should be choosen in {1, 2, 3}.")
-    else:
-        #### multiparameter scenario ####
-        if not b:
-            b, db = [], []
-            for i in range(para_num):
-                b.append(np.zeros(len(x[i])))
-                db.append(np.zeros(len(x[i])))
-        elif not db:
-            db = []
-            for i in range(para_num):
-                db.append(np.zeros(len(x[i])))
 
-        p_shape = np.shape(p)
-        p_ext = extract_ele(p, para_num)
-        dp_ext = extract_ele(dp, para_num)
-        rho_ext = extract_ele(rho, para_num)
-        drho_ext = extract_ele(drho, para_num)
-        b_pro = product(*b)
-        db_pro = product(*db)
-
-        p_list, rho_list, drho_list = [], [], []
-        for p_ele, rho_ele, drho_ele in zip(p_ext, rho_ext, drho_ext):
-            p_list.append(p_ele)
-            rho_list.append(rho_ele)
-            drho_list.append(drho_ele)
-        dp_list = [dpi for dpi in dp_ext]
-
-        b_list, db_list = [], []
-        for b_ele, db_ele in zip(b_pro, db_pro):
-            b_list.append([b_ele[i] for i in range(para_num)])
-            db_list.append([db_ele[j] for j in range(para_num)])
-
-        dim = len(rho_list[0])
-        if M == []:
-            M = SIC(dim)
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-        if btype == 1:
-            F_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            for i in range(len(p_list)):
-                F_tp = CFIM(rho_list[i], drho_list[i], M=M, eps=eps)
-                F_inv = np.linalg.pinv(F_tp)
-                B = np.diag([(1.0 + db_list[i][j]) for j in range(para_num)])
-                term1 = np.dot(B, np.dot(F_inv, B))
-                term2 = np.dot(
-                    np.array(b_list[i]).reshape(para_num, 1),
-                    np.array(b_list[i]).reshape(1, para_num),
-                )
-                for pj in range(para_num):
-                    for pk in range(para_num):
-                        F_list[pj][pk][i] = term1[pj][pk] + term2[pj][pk]
-
-            res = np.zeros([para_num, para_num])
-            for para_i in range(0, para_num):
-                for para_j in range(para_i, para_num):
-                    F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                    arr = p * F_ij
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    res[para_i][para_j] = arr
-                    res[para_j][para_i] = arr
-            return res
-        elif btype == 2:
-            F_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            B_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            bb_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            for i in range(len(p_list)):
-                F_tp = CFIM(rho_list[i], drho_list[i], M=M, eps=eps)
-                B_tp = np.diag([(1.0 + db_list[i][j]) for j in range(para_num)])
-                bb_tp = np.dot(
-                    np.array(b_list[i]).reshape(para_num, 1),
-                    np.array(b_list[i]).reshape(1, para_num),
-                )
-                for pj in range(para_num):
-                    for pk in range(para_num):
-                        F_list[pj][pk][i] = F_tp[pj][pk]
-                        B_list[pj][pk][i] = B_tp[pj][pk]
-                        bb_list[pj][pk][i] = bb_tp[pj][pk]
-
-            F_res = np.zeros([para_num, para_num])
-            for para_i in range(0, para_num):
-                for para_j in range(para_i, para_num):
-                    F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                    arr = p * F_ij
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    F_res[para_i][para_j] = arr
-                    F_res[para_j][para_i] = arr
-            B_res = np.zeros([para_num, para_num])
-            bb_res = np.zeros([para_num, para_num])
-            for para_m in range(para_num):
-                for para_n in range(para_num):
-                    B_mn = np.array(B_list[para_m][para_n]).reshape(p_shape)
-                    bb_mn = np.array(bb_list[para_m][para_n]).reshape(p_shape)
-                    arr2 = p * B_mn
-                    arr3 = p * bb_mn
-                    for sj in reversed(range(para_num)):
-                        arr2 = simpson(arr2, x[sj])
-                        arr3 = simpson(arr3, x[sj])
-                    B_res[para_m][para_n] = arr2
-                    bb_res[para_m][para_n] = arr3
-            res = np.dot(B_res, np.dot(np.linalg.pinv(F_res), B_res)) + bb_res
-            return res
-        elif btype == 3:
-            F_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            for i in range(len(p_list)):
-                F_tp = CFIM(rho_list[i], drho_list[i], M=M, eps=eps)
-                I_tp = np.zeros((para_num, para_num))
-                G_tp = np.zeros((para_num, para_num))
-                for pm in range(para_num):
-                    for pn in range(para_num):
-                        if pm == pn:
-                            G_tp[pm][pn] = dp_list[i][pn]*b_list[i][pm]/p_list[i]+(1.0 + db_list[i][pm])
-                        else:
-                            G_tp[pm][pn] = dp_list[i][pn]*b_list[i][pm]/p_list[i]
-                        I_tp[pm][pn] = dp_list[i][pm] * dp_list[i][pn] / p_list[i] ** 2
-
-                F_tot = np.dot(G_tp, np.dot(np.linalg.pinv(F_tp + I_tp), G_tp.T))
-                for pj in range(para_num):
-                    for pk in range(para_num):
-                        F_list[pj][pk][i] = F_tot[pj][pk]
-
-            res = np.zeros([para_num, para_num])
-            for para_i in range(0, para_num):
-                for para_j in range(para_i, para_num):
-                    F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                    arr = p * F_ij
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    res[para_i][para_j] = arr
-                    res[para_j][para_i] = arr
-            return res
-        else:
-            raise NameError("NameError: btype should be choosen in {1, 2, 3}.")
-
-
-def BQCRB(x, p, dp, rho, drho, b=[], db=[], btype=1, LDtype="SLD", eps=1e-8):
+def BQCRB(x, p=None, dp=None, rho=None, drho=None, b=[], db=[], btype=1, LDtype="SLD", eps=1e-8, n_jobs=1):
     r"""
     Calculation of the Bayesian quantum Cramer-Rao bound (BQCRB). The covariance matrix 
     with a prior distribution $p(\textbf{x})$ is defined as
@@ -540,8 +278,9 @@ def BQCRB(x, p, dp, rho, drho, b=[], db=[], btype=1, LDtype="SLD", eps=1e-8):
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `multidimensional array`
         -- The prior distribution.
@@ -575,6 +314,10 @@ def BQCRB(x, p, dp, rho, drho, b=[], db=[], btype=1, LDtype="SLD", eps=1e-8):
     > **eps:** `float`
         -- Machine epsilon.
 
+    > **n_jobs:** `int`
+        -- The number of threads among which the grid points are shared. Setting it 
+        to -1 uses all the CPU cores.
+
     Returns
     ----------
     **BQCRB:** `float or matrix`
@@ -583,28 +326,33 @@ def BQCRB(x, p, dp, rho, drho, b=[], db=[], btype=1, LDtype="SLD", eps=1e-8):
         more than one), it returns a matrix.
     """
 
-    para_num = len(x)
+    grid = _grid_input(x, p, rho, drho=drho, dp=dp)
+
+    F_all = grid.QFIM(LDtype=LDtype, eps=eps, n_jobs=n_jobs)
+    return _BCRB_grid(grid, F_all, b, db, btype)
+
+
+def _BCRB_grid(grid, F_all, b, db, btype):
+    from scipy.integrate import simpson
+
+    x, p = grid.x, grid.p
+    para_num = grid.para_num
+    p_num = grid.num
 
     if para_num == 1:
         #### single parameter scenario ####
-        p_num = len(p)
-
         if not b:
             b = np.zeros(p_num)
             db = np.zeros(p_num)
         elif not db:
             db = np.zeros(p_num)
 
-        if type(drho[0]) == list:
-            drho = [drho[i][0] for i in range(p_num)]
         if type(b[0]) == list or type(b[0]) == np.ndarray:
             b = b[0]
         if type(db[0]) == list or type(db[0]) == np.ndarray:
             db = db[0]
 
-        F_tp = np.zeros(p_num)
-        for m in range(p_num):
-            F_tp[m] = QFIM(rho[m], [drho[m]], LDtype=LDtype, eps=eps)
+        F_tp = np.real(F_all[:, 0, 0])
 
         if btype == 1:
             arr = [
@@ -613,15 +361,16 @@ def BQCRB(x, p, dp, rho, drho, b=[], db=[], btype=1, LDtype="SLD", eps=1e-8):
             F = simpson(arr, x[0])
             return F
         elif btype == 2:
-            arr2 = [p[i] * F_tp[i] for i in range(p_num)]
-            F2 = simpson(arr2, x[0])
+            arr = [p[i] * F_tp[i] for i in range(p_num)]
+            F1 = simpson(arr, x[0])
             arr2 = [p[j] * (1 + db[j]) for j in range(p_num)]
             B = simpson(arr2, x[0])
             arr3 = [p[k] * b[k] ** 2 for k in range(p_num)]
             bb = simpson(arr3, x[0])
-            F = B**2 / F2 + bb
+            F = B**2 / F1 + bb
             return F
         elif btype == 3:
+            dp = grid.dp[:, 0]
             I_tp = [np.real(dp[i] * dp[i] / p[i] ** 2) for i in range(p_num)]
             arr = [p[j]*(dp[j]*b[j]/p[j]+(1 + db[j]))**2 / (I_tp[j] + F_tp[j]) for j in range(p_num)]
             F = simpson(arr, x[0])
@@ -640,141 +389,33 @@ def BQCRB(x, p, dp, rho, drho, b=[], db=[], btype=1, LDtype="SLD", eps=1e-8):
             for i in range(para_num):
                 db.append(np.zeros(len(x[i])))
 
-        p_shape = np.shape(p)
-        p_ext = extract_ele(p, para_num)
-        dp_ext = extract_ele(dp, para_num)
-        rho_ext = extract_ele(rho, para_num)
-        drho_ext = extract_ele(drho, para_num)
-        b_pro = product(*b)
-        db_pro = product(*db)
-
-        p_list, rho_list, drho_list = [], [], []
-        for p_ele, rho_ele, drho_ele in zip(p_ext, rho_ext, drho_ext):
-            p_list.append(p_ele)
-            rho_list.append(rho_ele)
-            drho_list.append(drho_ele)
-        dp_list = [dpi for dpi in dp_ext]
-
-        b_list, db_list = [], []
-        for b_ele, db_ele in zip(b_pro, db_pro):
-            b_list.append([b_ele[i] for i in range(para_num)])
-            db_list.append([db_ele[j] for j in range(para_num)])
+        p_list = p.reshape(-1)
+        b_list = np.array(list(product(*b)), dtype=np.float64)
+        db_list = np.array(list(product(*db)), dtype=np.float64)
+        bb_list = b_list[:, :, None] * b_list[:, None, :]
 
         if btype == 1:
-            F_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            for i in range(len(p_list)):
-                F_tp = QFIM(rho_list[i], drho_list[i], LDtype=LDtype, eps=eps)
-                F_inv = np.linalg.pinv(F_tp)
-                B = np.diag([(1.0 + db_list[i][j]) for j in range(para_num)])
-                term1 = np.dot(B, np.dot(F_inv, B))
-                term2 = np.dot(
-                    np.array(b_list[i]).reshape(para_num, 1),
-                    np.array(b_list[i]).reshape(1, para_num),
-                )
-                for pj in range(para_num):
-                    for pk in range(para_num):
-                        F_list[pj][pk][i] = term1[pj][pk] + term2[pj][pk]
-
-            res = np.zeros([para_num, para_num])
-            for para_i in range(0, para_num):
-                for para_j in range(para_i, para_num):
-                    F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                    arr = p * F_ij
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    res[para_i][para_j] = arr
-                    res[para_j][para_i] = arr
-            return res
+            B = 1.0 + db_list
+            term1 = B[:, :, None] * np.linalg.pinv(F_all) * B[:, None, :]
+            return np.real(grid.integrate(p_list[:, None, None] * (term1 + bb_list)))
         elif btype == 2:
-            F_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            B_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            bb_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            for i in range(len(p_list)):
-                F_tp = QFIM(rho_list[i], drho_list[i], LDtype=LDtype, eps=eps)
-                B_tp = np.diag([(1.0 + db_list[i][j]) for j in range(para_num)])
-                bb_tp = np.dot(
-                    np.array(b_list[i]).reshape(para_num, 1),
-                    np.array(b_list[i]).reshape(1, para_num),
-                )
-                for pj in range(para_num):
-                    for pk in range(para_num):
-                        F_list[pj][pk][i] = F_tp[pj][pk]
-                        B_list[pj][pk][i] = B_tp[pj][pk]
-                        bb_list[pj][pk][i] = bb_tp[pj][pk]
-
-            F_res = np.zeros([para_num, para_num])
-            for para_i in range(0, para_num):
-                for para_j in range(para_i, para_num):
-                    F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                    arr = p * F_ij
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    F_res[para_i][para_j] = arr
-                    F_res[para_j][para_i] = arr
-            B_res = np.zeros([para_num, para_num])
-            bb_res = np.zeros([para_num, para_num])
-            for para_m in range(para_num):
-                for para_n in range(para_num):
-                    B_mn = np.array(B_list[para_m][para_n]).reshape(p_shape)
-                    bb_mn = np.array(bb_list[para_m][para_n]).reshape(p_shape)
-                    arr2 = p * B_mn
-                    arr3 = p * bb_mn
-                    for sj in reversed(range(para_num)):
-                        arr2 = simpson(arr2, x[sj])
-                        arr3 = simpson(arr3, x[sj])
-                    B_res[para_m][para_n] = arr2
-                    bb_res[para_m][para_n] = arr3
+            F_res = np.real(grid.integrate(p_list[:, None, None] * F_all))
+            B_res = np.diag(grid.integrate(p_list[:, None] * (1.0 + db_list)))
+            bb_res = grid.integrate(p_list[:, None, None] * bb_list)
             res = np.dot(B_res, np.dot(np.linalg.pinv(F_res), B_res)) + bb_res
             return res
         elif btype == 3:
-            F_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-            for i in range(len(p_list)):
-                F_tp = QFIM(rho_list[i], drho_list[i], LDtype=LDtype, eps=eps)
-                I_tp = np.zeros((para_num, para_num))
-                G_tp = np.zeros((para_num, para_num))
-                for pm in range(para_num):
-                    for pn in range(para_num):
-                        if pm == pn:
-                            G_tp[pm][pn] = dp_list[i][pn]*b_list[i][pm]/p_list[i]+(1.0 + db_list[i][pm])
-                        else:
-                            G_tp[pm][pn] = dp_list[i][pn]*b_list[i][pm]/p_list[i]
-                        I_tp[pm][pn] = dp_list[i][pm] * dp_list[i][pn] / p_list[i] ** 2
-
-                F_tot = np.dot(G_tp, np.dot(np.linalg.pinv(F_tp + I_tp), G_tp.T))
-                for pj in range(para_num):
-                    for pk in range(para_num):
-                        F_list[pj][pk][i] = F_tot[pj][pk]
-
-            res = np.zeros([para_num, para_num])
-            for para_i in range(0, para_num):
-                for para_j in range(para_i, para_num):
-                    F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                    arr = p * F_ij
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    res[para_i][para_j] = arr
-                    res[para_j][para_i] = arr
-            return res
+            dp_list = np.real(grid.dp)
+            G = dp_list[:, None, :] * b_list[:, :, None] / p_list[:, None, None]
+            G = G + np.identity(para_num) * (1.0 + db_list)[:, :, None]
+            I_tp = dp_list[:, :, None] * dp_list[:, None, :] / p_list[:, None, None] ** 2
+            F_tot = G @ np.linalg.pinv(F_all + I_tp) @ np.swapaxes(G, -1, -2)
+            return np.real(grid.integrate(p_list[:, None, None] * F_tot))
         else:
             raise NameError("NameError: btype should be choosen in {1, 2, 3}.")
 
 
-def VTB(x, p, dp, rho, drho, M=[], eps=1e-8):
+def VTB(x, p=None, dp=None, rho=None, drho=None, M=[], eps=1e-8, n_jobs=1):
     r"""
     Calculation of the Bayesian version of Cramer-Rao bound introduced by
     Van Trees (VTB). The covariance matrix with a prior distribution $p(\textbf{x})$ 
@@ -802,8 +443,9 @@ def VTB(x, p, dp, rho, drho, M=[], eps=1e-8):
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `multidimensional array`
         -- The prior distribution.
@@ -820,13 +462,17 @@ def VTB(x, p, dp, rho, drho, M=[], eps=1e-8):
         -- Derivatives of the parameterized density matrix (rho) with respect to the 
         unknown parameters to be estimated.
 
-    > **M:** `list of matrices`
+    > **M:** `list of matrices or VectorPOVM`
         -- A set of positive operator-valued measure (POVM). The default measurement 
         is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
 
     > **eps:** `float`
         -- Machine epsilon.
 
+    > **n_jobs:** `int`
+        -- The number of threads among which the grid points are shared. Setting it 
+        to -1 uses all the CPU cores.
+
     Returns
     ----------
     **VTB:** `float or matrix`
@@ -840,89 +486,15 @@ def VTB(x, p, dp, rho, drho, M=[], eps=1e-8):
         solutions.html).
     """
 
-    para_num = len(x)
-    p_num = len(p)
+    grid = _grid_input(x, p, rho, drho=drho, dp=dp)
+    if type(M) != list and not isinstance(M, VectorPOVM):
+        raise TypeError("Please make sure M is a list!")
 
-    if para_num == 1:
-        #### single parameter scenario ####
-        if M == []:
-            M = SIC(len(rho[0]))
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-
-        if type(drho[0]) == list:
-            drho = [drho[i][0] for i in range(p_num)]
-        if type(dp[0]) == list or type(dp[0]) == np.ndarray:
-            dp = [dp[i][0] for i in range(p_num)]
+    F_all = grid.CFIM(M, eps=eps, n_jobs=n_jobs)
+    return _VTB_grid(grid, F_all)
 
-        F_tp = np.zeros(p_num)
-        for m in range(p_num):
-            F_tp[m] = CFIM(rho[m], [drho[m]], M=M, eps=eps)
 
-
-        arr1 = [np.real(dp[i] * dp[i] / p[i]) for i in range(p_num)]
-        I = simpson(arr1, x[0])
-        arr2 = [np.real(F_tp[j] * p[j]) for j in range(p_num)]
-        F = simpson(arr2, x[0])
-        return 1.0 / (I + F)
-    else:
-        #### multiparameter scenario ####
-        p_shape = np.shape(p)
-        p_ext = extract_ele(p, para_num)
-        dp_ext = extract_ele(dp, para_num)
-        rho_ext = extract_ele(rho, para_num)
-        drho_ext = extract_ele(drho, para_num)
-
-        p_list, rho_list, drho_list = [], [], []
-        for p_ele, rho_ele, drho_ele in zip(p_ext, rho_ext, drho_ext):
-            p_list.append(p_ele)
-            rho_list.append(rho_ele)
-            drho_list.append(drho_ele)
-        dp_list = [dpi for dpi in dp_ext]
-
-        dim = len(rho_list[0])
-        if M == []:
-            M = SIC(dim)
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-        
-        F_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-        I_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-        for i in range(len(p_list)):
-            F_tp = CFIM(rho_list[i], drho_list[i], M=M, eps=eps)
-            for pj in range(para_num):
-                for pk in range(para_num):
-                    F_list[pj][pk][i] = F_tp[pj][pk]
-                    I_list[pj][pk][i] = (
-                            dp_list[i][pj] * dp_list[i][pk] / p_list[i] ** 2
-                        )
-
-        F_res = np.zeros([para_num, para_num])
-        I_res = np.zeros([para_num, para_num])
-        for para_i in range(0, para_num):
-            for para_j in range(para_i, para_num):
-                F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                I_ij = np.array(I_list[para_i][para_j]).reshape(p_shape)
-                arr1 = p * F_ij
-                arr2 = p * I_ij
-                for si in reversed(range(para_num)):
-                    arr1 = simpson(arr1, x[si])
-                    arr2 = simpson(arr2, x[si])
-                F_res[para_i][para_j] = arr1
-                F_res[para_j][para_i] = arr1
-                I_res[para_i][para_j] = arr2
-                I_res[para_j][para_i] = arr2
-        return np.linalg.pinv(F_res + I_res)
-
-def QVTB(x, p, dp, rho, drho, LDtype="SLD", eps=1e-8):
+def QVTB(x, p=None, dp=None, rho=None, drho=None, LDtype="SLD", eps=1e-8, n_jobs=1):
     r"""
     Calculation of the Bayesian version of quantum Cramer-Rao bound introduced 
     by Van Trees (QVTB). The covariance matrix with a prior distribution p(\textbf{x}) 
@@ -949,8 +521,9 @@ def QVTB(x, p, dp, rho, drho, LDtype="SLD", eps=1e-8):
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** multidimensional array
         -- The prior distribution.
@@ -976,6 +549,10 @@ def QVTB(x, p, dp, rho, drho, LDtype="SLD", eps=1e-8):
     > **eps:** `float`
         -- Machine epsilon.
 
+    > **n_jobs:** `int`
+        -- The number of threads among which the grid points are shared. Setting it 
+        to -1 uses all the CPU cores.
+
     Returns
     ----------
     **QVTB:** `float or matrix`
@@ -983,18 +560,23 @@ def QVTB(x, p, dp, rho, drho, LDtype="SLD", eps=1e-8):
         output is a float and for multiparameter estimation (the length of x is 
         more than one), it returns a matrix.
     """
-    para_num = len(x)
-    p_num = len(p)
 
-    if para_num == 1:
-        if type(drho[0]) == list:
-            drho = [drho[i][0] for i in range(p_num)]
-        if type(dp[0]) == list or type(dp[0]) == np.ndarray:
-            dp = [dp[i][0] for i in range(p_num)]
+    grid = _grid_input(x, p, rho, drho=drho, dp=dp)
+
+    F_all = grid.QFIM(LDtype=LDtype, eps=eps, n_jobs=n_jobs)
+    return _VTB_grid(grid, F_all)
+
 
-        F_tp = np.zeros(p_num)
-        for m in range(p_num):
-            F_tp[m] = QFIM(rho[m], [drho[m]], LDtype=LDtype, eps=eps)
+def _VTB_grid(grid, F_all):
+    from scipy.integrate import simpson
+
+    x, p = grid.x, grid.p
+    p_num = grid.num
+
+    if grid.para_num == 1:
+        #### single parameter scenario ####
+        dp = grid.dp[:, 0]
+        F_tp = np.real(F_all[:, 0, 0])
 
         arr1 = [np.real(dp[i] * dp[i] / p[i]) for i in range(p_num)]
         I = simpson(arr1, x[0])
@@ -1003,55 +585,18 @@ def QVTB(x, p, dp, rho, drho, LDtype="SLD", eps=1e-8):
         return 1.0 / (I + F)
     else:
         #### multiparameter scenario ####
-        p_shape = np.shape(p)
-        p_ext = extract_ele(p, para_num)
-        dp_ext = extract_ele(dp, para_num)
-        rho_ext = extract_ele(rho, para_num)
-        drho_ext = extract_ele(drho, para_num)
-
-        p_list, rho_list, drho_list = [], [], []
-        for p_ele, rho_ele, drho_ele in zip(p_ext, rho_ext, drho_ext):
-            p_list.append(p_ele)
-            rho_list.append(rho_ele)
-            drho_list.append(drho_ele)
-        dp_list = [dpi for dpi in dp_ext]
-
-        F_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-        I_list = [
-                [[0.0 for i in range(len(p_list))] for j in range(para_num)]
-                for k in range(para_num)
-            ]
-        for i in range(len(p_list)):
-            F_tp = QFIM(rho_list[i], drho_list[i], LDtype=LDtype, eps=eps)
-            for pj in range(para_num):
-                for pk in range(para_num):
-                    F_list[pj][pk][i] = F_tp[pj][pk]
-                    I_list[pj][pk][i] = (
-                            dp_list[i][pj] * dp_list[i][pk] / p_list[i] ** 2
-                        )
-
-        F_res = np.zeros([para_num, para_num])
-        I_res = np.zeros([para_num, para_num])
-        for para_i in range(0, para_num):
-            for para_j in range(para_i, para_num):
-                F_ij = np.array(F_list[para_i][para_j]).reshape(p_shape)
-                I_ij = np.array(I_list[para_i][para_j]).reshape(p_shape)
-                arr1 = p * F_ij
-                arr2 = p * I_ij
-                for si in reversed(range(para_num)):
-                    arr1 = simpson(arr1, x[si])
-                    arr2 = simpson(arr2, x[si])
-                F_res[para_i][para_j] = arr1
-                F_res[para_j][para_i] = arr1
-                I_res[para_i][para_j] = arr2
-                I_res[para_j][para_i] = arr2
+        p_list = p.reshape(-1)
+        dp_list = np.real(grid.dp)
+        I_tp = dp_list[:, :, None] * dp_list[:, None, :] / p_list[:, None, None] ** 2
+
+        F_res = np.real(grid.integrate(p_list[:, None, None] * F_all))
+        I_res = grid.integrate(p_list[:, None, None] * I_tp)
         return np.linalg.pinv(F_res + I_res)
 
 
 def OBB_func(x, y, t, J, F):
+    from scipy import interpolate
+
     interp_J = interpolate.interp1d(t, (J))
     interp_F = interpolate.interp1d(t, (F))
     J_tp, F_tp = interp_J(x), interp_F(x)
@@ -1062,7 +607,7 @@ def boundary_condition(ya, yb):
     return np.array([ya[1] + 1.0, yb[1] + 1.0])
 
 
-def OBB(x, p, dp, rho, drho, d2rho, LDtype="SLD", eps=1e-8):
+def OBB(x, p=None, dp=None, rho=None, drho=None, d2rho=None, LDtype="SLD", eps=1e-8):
     r"""
     Calculation of the optimal biased bound based on the first type of the BQCRB 
     in the case of single parameter estimation. The expression of OBB with a 
@@ -1077,8 +622,9 @@ def OBB(x, p, dp, rho, drho, d2rho, LDtype="SLD", eps=1e-8):
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `array`
         -- The prior distribution.
@@ -1115,29 +661,23 @@ def OBB(x, p, dp, rho, drho, d2rho, LDtype="SLD", eps=1e-8):
         output is a float and for multiparameter estimation (the length of x is 
         more than one), it returns a matrix.
     """
+    from scipy.integrate import simpson, solve_bvp
 
     #### single parameter scenario ####
-    p_num = len(p)
-
-    if type(drho[0]) == list:
-        drho = [drho[i][0] for i in range(p_num)]
-    if type(d2rho[0]) == list:
-        d2rho = [d2rho[i][0] for i in range(p_num)]
-    if type(dp[0]) == list or type(dp[0]) == np.ndarray:
-        dp = [dp[i][0] for i in range(p_num)]
-    if type(x[0]) != float or type(x[0]) != int:
-        x = x[0]
-
-    F, J = np.zeros(p_num), np.zeros(p_num)
-    bias, dbias = np.zeros(p_num), np.zeros(p_num)
-    for m in range(p_num):
-        f, LD = QFIM(rho[m], [drho[m]], LDtype=LDtype, exportLD=True, eps=eps)
-        F[m] = f
-        term1 = np.dot(d2rho[m], LD)
-        term2 = np.dot(d2rho[m], LD.conj().T)
-        term3 = np.dot(np.dot(LD, LD), drho[m])
-        dF = np.real(np.trace(term1 + term2 - term3))
-        J[m] = dp[m] / p[m] - dF / f
+    grid = _grid_input(x, p, rho, drho=drho, dp=dp)
+    x, p = grid.x[0], grid.p
+    p_num = grid.num
+    dp = grid.dp[:, 0]
+    drho = grid.drho[:, 0]
+    d2rho = np.reshape(np.asarray(d2rho, dtype=np.complex128), (p_num, grid.dim, grid.dim))
+
+    F = np.real(grid.QFIM(LDtype=LDtype, eps=eps)[:, 0, 0])
+    LD = grid.LD(LDtype=LDtype, eps=eps)[:, 0]
+    term1 = d2rho @ LD
+    term2 = d2rho @ np.swapaxes(LD.conj(), -1, -2)
+    term3 = LD @ LD @ drho
+    dF = np.real(np.trace(term1 + term2 - term3, axis1=-2, axis2=-1))
+    J = dp / p - dF / F
 
     y_guess = np.zeros((2, x.size))
     fun = lambda m, n: OBB_func(m, n, x, J, F)
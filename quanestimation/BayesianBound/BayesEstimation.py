@@ -1,11 +1,12 @@
 import numpy as np
-from scipy.integrate import simpson
-from quanestimation.Common.Common import extract_ele
-from quanestimation.Common.Common import SIC
-from itertools import product
+from quanestimation.Common.Common import VectorPOVM
+from quanestimation.BayesianBound.ParameterGrid import _grid_input
 
+# upper bound of the number of entries in a chunk of accumulated log-likelihoods
+_CHUNK_SIZE = 2**20
 
-def Bayes(x, p, rho, y, M=[], estimator="mean", savefile=False):
+
+def Bayes(x, p=None, rho=None, y=None, M=[], estimator="mean", savefile=False, trace=True):
     """
     Bayesian estimation. The prior distribution is updated via the posterior  
     distribution obtained by the Bayes’ rule and the estimated value of parameters
@@ -14,8 +15,9 @@ def Bayes(x, p, rho, y, M=[], estimator="mean", savefile=False):
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `multidimensional array`
         -- The prior distribution.
@@ -26,7 +28,7 @@ def Bayes(x, p, rho, y, M=[], estimator="mean", savefile=False):
     > **y:** `array`
         -- The experimental results obtained in practice.
 
-    > **M:** `list of matrices`
+    > **M:** `list of matrices or VectorPOVM`
         -- A set of positive operator-valued measure (POVM). The default measurement 
         is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
 
@@ -42,6 +44,16 @@ def Bayes(x, p, rho, y, M=[], estimator="mean", savefile=False):
         `False` the posterior distribution in the final iteration and the estimated values
         in all iterations will be saved in "pout.npy" and "xout.npy". 
 
+    > **trace:** `bool`
+        -- Whether or not to update the posterior distribution result by result. If 
+        set `False`, the results are reduced to the numbers of times each result 
+        occurred and only the final posterior distribution and estimated value are 
+        computed (and saved), which costs the same for any length of y.
+
+    The probabilities of all the measurement results on the grid are computed once 
+    and the results are accumulated as log-likelihoods, which avoids the underflow 
+    of the posterior distribution for long records.
+
     Returns
     ----------
     **pout and xout:** `array and float`
@@ -53,200 +65,64 @@ def Bayes(x, p, rho, y, M=[], estimator="mean", savefile=False):
         solutions.html).
     """
 
-    para_num = len(x)
-    max_episode = len(y)
-    if para_num == 1:
-        #### single parameter scenario ####
-        if M == []:
-            M = SIC(len(rho[0]))
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-        if savefile == False:
-            x_out = []
-            if estimator == "mean":
-                for mi in range(max_episode):
-                    res_exp = int(y[mi])
-                    pyx = np.zeros(len(x[0]))
-                    for xi in range(len(x[0])):
-                        p_tp = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
-                        pyx[xi] = p_tp
-                    arr = [pyx[m] * p[m] for m in range(len(x[0]))]
-                    py = simpson(arr, x[0])
-                    p_update = pyx * p / py
-                    p = p_update
-                    mean = simpson([p[m]*x[0][m] for m in range(len(x[0]))], x[0])
-                    x_out.append(mean)
-            elif estimator == "MAP":
-                for mi in range(max_episode):
-                    res_exp = int(y[mi])
-                    pyx = np.zeros(len(x[0]))
-                    for xi in range(len(x[0])):
-                        p_tp = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
-                        pyx[xi] = p_tp
-                    arr = [pyx[m] * p[m] for m in range(len(x[0]))]
-                    py = simpson(arr, x[0])
-                    p_update = pyx * p / py
-                    p = p_update
-                    indx = np.where(p == max(p))[0][0]
-                    x_out.append(x[0][indx])
-            else:
-                raise ValueError(
-                "{!r} is not a valid value for estimator, supported values are 'mean' and 'MAP'.".format(estimator))
-            np.save("pout", p)
-            np.save("xout", x_out)
-            return p, x_out[-1]
+    grid = _grid_input(x, p, rho)
+    if type(M) != list and not isinstance(M, VectorPOVM):
+        raise TypeError("Please make sure M is a list!")
+    if estimator != "mean" and estimator != "MAP":
+        raise ValueError(
+            "{!r} is not a valid value for estimator, supported values are 'mean' and 'MAP'.".format(estimator))
+
+    if np.size(y) == 0:
+        raise ValueError("Please make sure y contains at least one result!")
+
+    log_table = _log_likelihood(grid, M)
+    with np.errstate(divide="ignore"):
+        logp0 = np.log(grid.p.reshape(-1))
+
+    if trace:
+        log_steps = _log_likelihood_steps(log_table, y)
+    else:
+        counts = _counts(y, len(log_table))
+        log_steps = [_log_likelihood_counts(log_table, counts)[None]]
+
+    p_out, x_out = [], []
+    for logL in log_steps:
+        logpost = logp0 + logL
+        if estimator == "mean" or savefile:
+            post = _normalize(grid, logpost)
+            if savefile:
+                p_out.append(post)
+        if estimator == "mean":
+            x_out.append(_mean(grid, post))
         else:
-            p_out, x_out = [], []
-            if estimator == "mean":
-                for mi in range(max_episode):
-                    res_exp = int(y[mi])
-                    pyx = np.zeros(len(x[0]))
-                    for xi in range(len(x[0])):
-                        p_tp = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
-                        pyx[xi] = p_tp
-                    arr = [pyx[m] * p[m] for m in range(len(x[0]))]
-                    py = simpson(arr, x[0])
-                    p_update = pyx * p / py
-                    p = p_update
-                    mean = simpson([p[m]*x[0][m] for m in range(len(x[0]))], x[0])
-                    p_out.append(p)
-                    x_out.append(mean)
-            elif estimator == "MAP":
-                for mi in range(max_episode):
-                    res_exp = int(y[mi])
-                    pyx = np.zeros(len(x[0]))
-                    for xi in range(len(x[0])):
-                        p_tp = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
-                        pyx[xi] = p_tp
-                    arr = [pyx[m] * p[m] for m in range(len(x[0]))]
-                    py = simpson(arr, x[0])
-                    p_update = pyx * p / py
-                    p = p_update
-                    indx = np.where(p == max(p))[0][0]
-                    p_out.append(p)
-                    x_out.append(x[0][indx])
-            else:
-                raise ValueError(
-                "{!r} is not a valid value for estimator, supported values are 'mean' and 'MAP'.".format(estimator))
-            np.save("pout", p_out)
-            np.save("xout", x_out)
-            return p, x_out[-1]
+            x_out.append(grid.x_list[np.argmax(logpost, axis=1)])
+    p = _normalize(grid, logpost[-1:])[0].reshape(grid.shape)
+
+    x_out = np.concatenate(x_out)
+    if savefile == False:
+        np.save("pout", p)
+    else:
+        np.save("pout", np.concatenate(p_out).reshape((-1,) + grid.shape))
+    if grid.para_num == 1:
+        #### single parameter scenario ####
+        np.save("xout", x_out[:, 0])
+        return p, x_out[-1][0]
     else:
         #### multiparameter scenario ####
-        p_shape = np.shape(p)
-        p_ext = extract_ele(p, para_num)
-        rho_ext = extract_ele(rho, para_num)
-
-        p_list, rho_list = [], []
-        for p_ele, rho_ele in zip(p_ext, rho_ext):
-            p_list.append(p_ele)
-            rho_list.append(rho_ele)
-
-        dim = len(rho_list[0])
-        if M == []:
-            M = SIC(dim)
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-
-        if savefile == False:
-            x_out = []
-            if estimator == "mean":
-                for mi in range(max_episode):
-                    res_exp = int(y[mi])
-                    pyx_list = np.zeros(len(p_list))
-                    for xi in range(len(p_list)):
-                        p_tp = np.real(np.trace(np.dot(rho_list[xi], M[res_exp])))
-                        pyx_list[xi] = p_tp
-                    pyx = pyx_list.reshape(p_shape)
-                    arr = p * pyx
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    py = arr
-                    p_update = p * pyx / py
-                    p = p_update
-                    
-                    mean = integ(x, p)
-                    x_out.append(mean)
-            elif estimator == "MAP":
-                for mi in range(max_episode):
-                    res_exp = int(y[mi])
-                    pyx_list = np.zeros(len(p_list))
-                    for xi in range(len(p_list)):
-                        p_tp = np.real(np.trace(np.dot(rho_list[xi], M[res_exp])))
-                        pyx_list[xi] = p_tp
-                    pyx = pyx_list.reshape(p_shape)
-                    arr = p * pyx
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    py = arr
-                    p_update = p * pyx / py
-                    p = p_update
-
-                    indx = np.where(np.array(p) == np.max(np.array(p)))
-                    x_out.append([x[i][indx[i][0]] for i in range(para_num)])
-            else:
-                raise ValueError(
-                "{!r} is not a valid value for estimator, supported values are 'mean' and 'MAP'.".format(estimator))
-            np.save("pout", p)
-            np.save("xout", x_out)
-            return p, x_out[-1]
-        else:
-            p_out, x_out = [], []
-            if estimator == "mean":
-                for mi in range(max_episode):
-                    res_exp = int(y[mi])
-                    pyx_list = np.zeros(len(p_list))
-                    for xi in range(len(p_list)):
-                        p_tp = np.real(np.trace(np.dot(rho_list[xi], M[res_exp])))
-                        pyx_list[xi] = p_tp
-                    pyx = pyx_list.reshape(p_shape)
-                    arr = p * pyx
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    py = arr
-                    p_update = p * pyx / py
-                    p = p_update
-
-                    mean = integ(x, p)
-                    p_out.append(p)
-                    x_out.append(mean)
-            elif estimator == "MAP":
-                for mi in range(max_episode):
-                    res_exp = int(y[mi])
-                    pyx_list = np.zeros(len(p_list))
-                    for xi in range(len(p_list)):
-                        p_tp = np.real(np.trace(np.dot(rho_list[xi], M[res_exp])))
-                        pyx_list[xi] = p_tp
-                    pyx = pyx_list.reshape(p_shape)
-                    arr = p * pyx
-                    for si in reversed(range(para_num)):
-                        arr = simpson(arr, x[si])
-                    py = arr
-                    p_update = p * pyx / py
-                    p = p_update
-
-                    indx = np.where(np.array(p) == np.max(np.array(p)))
-                    p_out.append(p)
-                    x_out.append([x[i][indx[i][0]] for i in range(para_num)])
-            else:
-                raise ValueError(
-                "{!r} is not a valid value for estimator, supported values are 'mean' and 'MAP'.".format(estimator))
-            np.save("pout", p_out)
-            np.save("xout", x_out)
-            return p, x_out[-1]
-
-
-def MLE(x, rho, y, M=[], savefile=False):
+        np.save("xout", x_out)
+        return p, list(x_out[-1])
+
+
+def MLE(x, rho=None, y=None, M=[], savefile=False, trace=True):
     """
     Bayesian estimation. The estimated value of parameters obtained via the 
     maximum likelihood estimation (MLE).
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **rho:** `multidimensional list`
         -- Parameterized density matrix.
@@ -254,7 +130,7 @@ def MLE(x, rho, y, M=[], savefile=False):
     > **y:** `array`
         -- The experimental results obtained in practice.
 
-    > **M:** `list of matrices`
+    > **M:** `list of matrices or VectorPOVM`
         -- A set of positive operator-valued measure (POVM). The default measurement 
         is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
 
@@ -265,10 +141,22 @@ def MLE(x, rho, y, M=[], savefile=False):
         `False` the likelihood function in the final iteration and the estimated values
         in all iterations will be saved in "Lout.npy" and "xout.npy". 
 
+    > **trace:** `bool`
+        -- Whether or not to update the likelihood function result by result. If 
+        set `False`, the results are reduced to the numbers of times each result 
+        occurred and only the final likelihood function and estimated value are 
+        computed (and saved), which costs the same for any length of y.
+
+    The estimated values are obtained from the accumulated log-likelihoods, hence 
+    they are not affected by the underflow of the likelihood function for long 
+    records. For the same reason, the returned and saved likelihood functions are 
+    normalized such that their maxima are 1.
+
     Returns
     ----------
     **Lout and xout:** `array and float`
-        -- The likelihood function and the estimated values in the final iteration.
+        -- The likelihood function (normalized to the maximum 1) and the estimated 
+        values in the final iteration.
 
     **Note:** 
         SIC-POVM is calculated by the Weyl-Heisenberg covariant SIC-POVM fiducial state 
@@ -276,122 +164,345 @@ def MLE(x, rho, y, M=[], savefile=False):
         solutions.html).
     """
 
-    para_num = len(x)
-    max_episode = len(y)
-    if para_num == 1:
+    grid = _grid_input(x, None, rho)
+    if type(M) != list and not isinstance(M, VectorPOVM):
+        raise TypeError("Please make sure M is a list!")
+    if np.size(y) == 0:
+        raise ValueError("Please make sure y contains at least one result!")
+
+    log_table = _log_likelihood(grid, M)
+
+    if trace:
+        log_steps = _log_likelihood_steps(log_table, y)
+    else:
+        counts = _counts(y, len(log_table))
+        log_steps = [_log_likelihood_counts(log_table, counts)[None]]
+
+    L_out, x_out = [], []
+    for logL in log_steps:
+        x_out.append(grid.x_list[np.argmax(logL, axis=1)])
+        if savefile:
+            L_out.append(np.exp(logL - np.max(logL, axis=1, keepdims=True)))
+    L = np.exp(logL[-1] - np.max(logL[-1])).reshape(grid.shape)
+
+    x_out = np.concatenate(x_out)
+    if savefile == False:
+        np.save("Lout", L)
+    else:
+        np.save("Lout", np.concatenate(L_out).reshape((-1,) + grid.shape))
+    if grid.para_num == 1:
         #### single parameter scenario ####
-        if M == []:
-            M = SIC(len(rho[0]))
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-
-        if savefile == False:
-            x_out = []
-            L_out = np.ones(len(x[0]))
-            for mi in range(max_episode):
-                res_exp = int(y[mi])
-                for xi in range(len(x[0])):
-                    p_tp = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
-                    L_out[xi] = L_out[xi] * p_tp
-                indx = np.where(L_out == max(L_out))[0][0]
-                x_out.append(x[0][indx])
-            np.save("Lout", L_out)
-            np.save("xout", x_out)
-
-            return L_out, x_out[-1]
-        else:
-            L_out, x_out = [], []
-            L_tp = np.ones(len(x[0]))
-            for mi in range(max_episode):
-                res_exp = int(y[mi])
-                for xi in range(len(x[0])):
-                    p_tp = np.real(np.trace(np.dot(rho[xi], M[res_exp])))
-                    L_tp[xi] = L_tp[xi] * p_tp
-                indx = np.where(L_tp == max(L_tp))[0][0]
-                L_out.append(L_tp)
-                x_out.append(x[0][indx])
-
-            np.save("Lout", L_out)
-            np.save("xout", x_out)
-            return L_tp, x_out[-1]
+        np.save("xout", x_out[:, 0])
+        return L, x_out[-1][0]
     else:
         #### multiparameter scenario ####
-        p_shape = []
-        for i in range(para_num):
-            p_shape.append(len(x[i]))
-        rho_ext = extract_ele(rho, para_num)
-
-        rho_list = []
-        for rho_ele in rho_ext:
-            rho_list.append(rho_ele)
-
-        dim = len(rho_list[0])
-        if M == []:
-            M = SIC(dim)
+        np.save("xout", x_out)
+        return L, list(x_out[-1])
+
+
+def Bayes_batch(x, p=None, rho=None, y=None, M=[], estimator="mean", trace=True):
+    """
+    Bayesian estimation for many independent experiments with the same parameterized 
+    density matrix and POVM. The probabilities of all the measurement results on the 
+    grid are computed once and shared by all the records.
+
+    Parameters
+    ----------
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
+
+    > **p:** `multidimensional array`
+        -- The prior distribution.
+
+    > **rho:** `multidimensional list`
+        -- Parameterized density matrix.
+
+    > **y:** `array`
+        -- The experimental results with the shape (R, T), where each row is the 
+        record of one experiment.
+
+    > **M:** `list of matrices or VectorPOVM`
+        -- A set of positive operator-valued measure (POVM). The default measurement 
+        is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
+
+    > **estimator:** `string`
+        -- Estimators for the bayesian estimation. Options are:  
+        "mean" -- The expectation value of the distribution.  
+        "MAP" -- Maximum a posteriori probability.
+
+    > **trace:** `bool`
+        -- Whether or not to return the estimated values after every result. If set 
+        `False`, only the final posterior distributions are computed, for which each 
+        record is reduced to the numbers of times each result occurred.
+
+    Returns
+    ----------
+    **pout and xout:** `arrays`
+        -- The final posterior distributions with the shape (R, ...) and the estimated 
+        values with the shape (R, T) (or (R, T, P) for multiparameter estimation). If 
+        `trace=False`, xout only contains the final estimated values.
+    """
+
+    grid = _grid_input(x, p, rho)
+    if type(M) != list and not isinstance(M, VectorPOVM):
+        raise TypeError("Please make sure M is a list!")
+    if estimator != "mean" and estimator != "MAP":
+        raise ValueError(
+            "{!r} is not a valid value for estimator, supported values are 'mean' and 'MAP'.".format(estimator))
+    y = np.asarray(y).astype(int)
+    if y.ndim != 2:
+        raise ValueError("Please make sure the shape of y is (R, T)!")
+    if y.size == 0:
+        raise ValueError("Please make sure y contains at least one result!")
+
+    log_table = _log_likelihood(grid, M)
+    with np.errstate(divide="ignore"):
+        logp0 = np.log(grid.p.reshape(-1))
+
+    def estimate(logpost):
+        if estimator == "mean":
+            return _mean(grid, _normalize(grid, logpost))
+        else:
+            return grid.x_list[np.argmax(logpost, axis=1)]
+
+    R = len(y)
+    if trace:
+        x_out = []
+        for logL in _log_likelihood_steps(log_table, y):
+            logpost = logp0 + logL
+            x_out.append(estimate(logpost.reshape(-1, grid.num)).reshape(R, -1, grid.para_num))
+        x_out = np.concatenate(x_out, axis=1)
+        logpost = logpost[:, -1]
+    else:
+        logpost = logp0 + _log_likelihood_counts(log_table, _counts(y, len(log_table)))
+        x_out = estimate(logpost)
+    p_out = _normalize(grid, logpost).reshape((R,) + grid.shape)
+
+    if grid.para_num == 1:
+        return p_out, x_out[..., 0]
+    else:
+        return p_out, x_out
+
+
+class StreamingEstimator:
+    r"""
+    Online Bayesian estimation and maximum likelihood estimation (MLE). The results 
+    are fed in one at a time or in chunks via `update()`, and the posterior 
+    distribution (the normalized likelihood function for MLE) is kept in memory as 
+    the accumulated log-likelihoods, so the current estimates can be queried at any 
+    time without running from the start of the record. Nothing is written to 
+    disk unless `checkpoint()` is called.
+
+    Attributes
+    ----------
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
+
+    > **p:** `multidimensional array`
+        -- The prior distribution. If it is not given (`None`), the estimator 
+        tracks the likelihood function, i.e., it performs the MLE.
+
+    > **rho:** `multidimensional list`
+        -- Parameterized density matrix.
+
+    > **M:** `list of matrices or VectorPOVM`
+        -- A set of positive operator-valued measure (POVM). The default measurement 
+        is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
+    """
+
+    def __init__(self, x, p=None, rho=None, M=[]):
+
+        if type(M) != list and not isinstance(M, VectorPOVM):
+            raise TypeError("Please make sure M is a list!")
+        self.grid = _grid_input(x, p, rho)
+        self.log_table = _log_likelihood(self.grid, M)
+        if self.grid.p is None:
+            self.logp0 = np.zeros(self.grid.num)
         else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-
-        if savefile == False:
-            x_out = []
-            L_list = np.ones(len(rho_list))
-            for mi in range(max_episode):
-                res_exp = int(y[mi])
-                for xi in range(len(rho_list)):
-                    p_tp = np.real(np.trace(np.dot(rho_list[xi], M[res_exp])))
-                    L_list[xi] = L_list[xi] * p_tp
-                L_out = L_list.reshape(p_shape)
-                indx = np.where(L_out == np.max(L_out))
-                x_out.append([x[i][indx[i][0]] for i in range(para_num)])
-            np.save("Lout", L_out)
-            np.save("xout", x_out)
-
-            return L_out, x_out[-1]
+            with np.errstate(divide="ignore"):
+                self.logp0 = np.log(self.grid.p.reshape(-1))
+        self.reset()
+
+    def reset(self):
+        """
+        Discard all the results fed in so far.
+        """
+        self.logL = np.zeros(self.grid.num)
+        self.count = 0
+
+    def update(self, y):
+        """
+        Update the posterior distribution with one result or a chunk of results.
+
+        Parameters
+        ----------
+        > **y:** `int or array`
+            -- The experimental result(s).
+        """
+        y = np.atleast_1d(np.asarray(y)).astype(int)
+        if len(y) == 0:
+            return self
+        if len(y) < len(self.log_table):
+            # only the rows of the results are added, which costs O(N) per result, 
+            # and the rows of the impossible results contain -inf
+            self.logL = self.logL + np.sum(self.log_table[y], axis=0)
         else:
-            L_out, x_out = [], []
-            L_list = np.ones(len(rho_list))
-            for mi in range(max_episode):
-                res_exp = int(y[mi])
-                for xi in range(len(rho_list)):
-                    p_tp = np.real(np.trace(np.dot(rho_list[xi], M[res_exp])))
-                    L_list[xi] = L_list[xi] * p_tp
-                L_tp = L_list.reshape(p_shape)
-                indx = np.where(L_tp == np.max(L_tp))
-                L_out.append(L_tp)
-                x_out.append([x[i][indx[i][0]] for i in range(para_num)])
-
-            np.save("Lout", L_out)
-            np.save("xout", x_out)
-            return L_tp, x_out[-1]
-
-def integ(x, p):
-    para_num = len(x)
-    mean = [0.0 for i in range(para_num)]
-    for i in range(para_num):
-        p_tp = p
-        if i == para_num-1:
-            for si in range(para_num-1):
-                p_tp = np.trapz(p_tp, x[si],axis=0)
-        
-        elif i == 0:
-            for si in reversed(range(1,para_num)):
-                p_tp = np.trapz(p_tp, x[si])
+            counts = _counts(y, len(self.log_table))
+            self.logL = self.logL + _log_likelihood_counts(self.log_table, counts)
+        self.count += len(y)
+        return self
+
+    @property
+    def posterior(self):
+        """
+        The current posterior distribution (the normalized likelihood function 
+        for MLE) on the grid.
+        """
+        return _normalize(self.grid, (self.logp0 + self.logL)[None])[0].reshape(self.grid.shape)
+
+    def mean(self):
+        """
+        The expectation value of the current posterior distribution.
+        """
+        post = _normalize(self.grid, (self.logp0 + self.logL)[None])
+        return self._output(_mean(self.grid, post)[0])
+
+    def MAP(self):
+        """
+        The maximum a posteriori probability estimate, which is the MLE when the 
+        prior distribution is not given.
+        """
+        return self._output(self.grid.x_list[np.argmax(self.logp0 + self.logL)])
+
+    def variance(self):
+        """
+        The variance (covariance matrix for multiparameter estimation) of the 
+        current posterior distribution.
+        """
+        post = _normalize(self.grid, (self.logp0 + self.logL)[None])
+        dx = self.grid.x_list - _mean(self.grid, post)[0]
+        cov = _integ(self.grid, post[0][:, None, None] * dx[:, :, None] * dx[:, None, :])
+        if self.grid.para_num == 1:
+            return cov[0][0]
+        else:
+            return cov
+
+    def checkpoint(self, filename="checkpoint"):
+        """
+        Save the accumulated log-likelihoods and the number of results to the 
+        file "filename.npz", from which the estimation can be resumed.
+        """
+        np.savez(filename, logL=self.logL, count=self.count)
+
+    def resume(self, filename="checkpoint"):
+        """
+        Restore the state saved by `checkpoint()`.
+        """
+        data = np.load(filename if filename.endswith(".npz") else filename + ".npz")
+        if data["logL"].shape != (self.grid.num,):
+            raise ValueError(
+                "The size of the grid in the checkpoint ({}) does not match the size of the grid ({}).".format(data["logL"].size, self.grid.num)
+            )
+        self.logL = data["logL"]
+        self.count = int(data["count"])
+        return self
+
+    def _output(self, value):
+        if self.grid.para_num == 1:
+            return value[0]
         else:
-            p_tp = np.trapz(p_tp, x[-1])
-            for si in range(para_num-1):
-                p_tp = np.trapz(p_tp, x[si], axis=0)
-        mean[i] = np.trapz(x[i]*p_tp, x[i])
-    return mean
+            return list(value)
+
+
+def _log_likelihood(grid, M):
+    """
+    Table of log p(y|x) with the shape (Y, N).
+    """
+    with np.errstate(divide="ignore"):
+        return np.ascontiguousarray(np.log(np.clip(grid.likelihood(M), 0.0, None)).T)
+
 
-def BayesCost(x, p, xest, rho, M, W=[], eps=1e-8):
+def _log_likelihood_steps(log_table, y):
+    """
+    Accumulated log-likelihoods after every result in y with the shape (T,) or 
+    (R, T), yielded in chunks of shape (C, N) or (R, C, N) to bound the memory 
+    for long records.
+    """
+    y = np.asarray(y).astype(int)
+    num = log_table.shape[1]
+    chunk = max(1, _CHUNK_SIZE // (num * np.prod(y.shape[:-1], dtype=int)))
+    logL = np.zeros(y.shape[:-1] + (1, num))
+    for start in range(0, y.shape[-1], chunk):
+        logL_chunk = logL + np.cumsum(log_table[y[..., start:start + chunk]], axis=-2)
+        logL = logL_chunk[..., -1:, :]
+        yield logL_chunk
+
+
+def _counts(y, result_num):
+    """
+    Numbers of times each result occurred in y with the shape (T,) or (R, T).
+    """
+    y = np.asarray(y).astype(int)
+    if y.ndim == 1:
+        return np.bincount(y, minlength=result_num)
+    offset = result_num * np.arange(len(y))[:, None]
+    counts = np.bincount((y + offset).ravel(), minlength=result_num * len(y))
+    return counts.reshape(len(y), result_num)
+
+
+def _log_likelihood_counts(log_table, counts):
+    """
+    Log-likelihoods (..., N) from the numbers of times (..., Y) each result 
+    occurred.
+    """
+    finite = np.isfinite(log_table)
+    logL = counts @ np.where(finite, log_table, 0.0)
+    impossible = (counts > 0).astype(float) @ (~finite).astype(float)
+    return np.where(impossible > 0, -np.inf, logL)
+
+
+def _normalize(grid, logpost):
+    """
+    Posterior distributions (C, N) from the unnormalized log-posteriors.
+    """
+    post = np.exp(logpost - np.max(logpost, axis=1, keepdims=True))
+    return post / grid.integrate(post.T)[:, None]
+
+
+def _integ(grid, arr):
+    """
+    Integral over the grid of an array with the shape (N, ...) for the moments of 
+    the posterior distributions. The multiparameter integrals use the trapezoidal 
+    rule.
+    """
+    from scipy.integrate import trapezoid
+
+    if grid.para_num == 1:
+        return grid.integrate(arr)
+    arr = np.reshape(arr, grid.shape + np.shape(arr)[1:])
+    for si in reversed(range(grid.para_num)):
+        arr = trapezoid(arr, x=grid.x[si], axis=si)
+    return arr
+
+
+def _mean(grid, post):
+    """
+    Expectation values (C, P) of the parameters for the distributions post (C, N).
+    """
+    return _integ(grid, grid.x_list[:, :, None] * post.T[:, None, :]).T
+
+
+def BayesCost(x, p=None, xest=None, rho=None, M=[], W=[], eps=1e-8):
     """
     Calculation of the average Bayesian cost with a quadratic cost function.
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `multidimensional array`
         -- The prior distribution.
@@ -416,67 +527,31 @@ def BayesCost(x, p, xest, rho, M, W=[], eps=1e-8):
     **The average Bayesian cost:** `float`
         -- The average Bayesian cost.
     """
-    para_num = len(x)
-    if para_num == 1:
-        # single-parameter scenario
-        if M == []:
-            M = SIC(len(rho[0]))
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-        p_num = len(x[0])
-        value = [p[i]*sum([np.trace(np.dot(rho[i], M[mi]))*(x[0][i]-xest[mi][0])**2 for mi in range(len(M))]) for i in range(p_num)]
-        C = simpson(value, x[0])
-        return np.real(C)
-    else:
-        # multi-parameter scenario
-        p_shape = np.shape(p)
-        p_ext = extract_ele(p, para_num)
-        rho_ext = extract_ele(rho, para_num)
-
-        p_list, rho_list = [], []
-        for p_ele, rho_ele in zip(p_ext, rho_ext):
-            p_list.append(p_ele)
-            rho_list.append(rho_ele)
-
-        x_pro = product(*x)
-        x_list = []
-        for x_ele in x_pro:
-            x_list.append([x_ele[i] for i in range(para_num)])
-            
-        dim = len(rho_list[0])
-        p_num = len(p_list)
-        
-        if W == []:
-            W = np.identity(para_num)
-            
-        if M == []:
-            M = SIC(dim)
-        else:
-            if type(M) != list:
-                raise TypeError("Please make sure M is a list!")
-
-        value = [0.0 for i in range(p_num)]
-        for i in range(p_num):
-            x_tp = np.array(x_list[i])
-            xCx = 0.0
-            for mi in range(len(M)):
-                xCx += np.trace(np.dot(rho_list[i], M[mi]))*np.dot((x_tp-xest[mi]).reshape(1, -1), np.dot(W, (x_tp-xest[mi]).reshape(-1, 1)))[0][0]
-            value[i] = p_list[i]*xCx
-        C = np.array(value).reshape(p_shape)
-        for si in reversed(range(para_num)):
-            C = simpson(C, x[si])
-        return np.real(C)
+    grid = _grid_input(x, p, rho)
+    para_num = grid.para_num
+    if type(M) != list and not isinstance(M, VectorPOVM):
+        raise TypeError("Please make sure M is a list!")
+    if para_num == 1 or len(W) == 0:
+        W = np.identity(para_num)
+
+    # probabilities of the results on the grid points, shape (N, Y)
+    L = grid.likelihood(M)
+    xest = np.reshape(np.asarray(xest, dtype=np.float64), (L.shape[1], para_num))
+    x_diff = grid.x_list[:, None, :] - xest[None, :, :]
+    cost = np.einsum("ny,nyi,ij,nyj->n", L, x_diff, W, x_diff, optimize=True)
+    C = grid.integrate(grid.p.reshape(-1) * cost)
+    return np.real(C)
     
     
-def BCB(x, p, rho, W=[], eps=1e-8):
+def BCB(x, p=None, rho=None, W=[], eps=1e-8):
     """
     Calculation of the Bayesian cost bound with a quadratic cost function.
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `multidimensional array`
         -- The prior distribution.
@@ -495,92 +570,26 @@ def BCB(x, p, rho, W=[], eps=1e-8):
     **BCB:** `float`
         -- The value of the minimum Bayesian cost.
     """
-    para_num = len(x)
-    if para_num == 1:
-        # single-parameter scenario
-        dim = len(rho[0])
-        p_num = len(x[0])
-        value = [p[i]*x[0][i]**2 for i in range(p_num)]
-        delta2_x = simpson(value, x[0])
-        rho_avg = np.zeros((dim, dim), dtype=np.complex128)
-        rho_pri = np.zeros((dim, dim), dtype=np.complex128)
-        for di in range(dim):
-            for dj in range(dim):
-                rho_avg_arr = [p[m]*rho[m][di][dj] for m in range(p_num)]
-                rho_pri_arr = [p[n]*x[0][n]*rho[n][di][dj] for n in range(p_num)]
-                rho_avg[di][dj] = simpson(rho_avg_arr, x[0])
-                rho_pri[di][dj] = simpson(rho_pri_arr, x[0])
-        Lambda = Lambda_avg(rho_avg, [rho_pri], eps=eps)
-        minBC = delta2_x-np.real(np.trace(np.dot(np.dot(rho_avg, Lambda[0]), Lambda[0])))
-        return minBC
-    else:
-        # multi-parameter scenario
-        p_shape = np.shape(p)
-        p_ext = extract_ele(p, para_num)
-        rho_ext = extract_ele(rho, para_num)
-
-        p_list, rho_list = [], []
-        for p_ele, rho_ele in zip(p_ext, rho_ext):
-            p_list.append(p_ele)
-            rho_list.append(rho_ele)
-
-        dim = len(rho_list[0])
-        p_num = len(p_list)
-
-        x_pro = product(*x)
-        x_list = []
-        for x_ele in x_pro:
-            x_list.append([x_ele[i] for i in range(para_num)])
-        
-        if W == []:
-            W = np.identity(para_num)
-        
-        value = [0.0 for i in range(p_num)]
-        for i in range(p_num):
-            x_tp = np.array(x_list[i])
-            xCx = np.dot(x_tp.reshape(1, -1), np.dot(W, x_tp.reshape(-1, 1)))[0][0]
-            value[i] = p_list[i]*xCx
-        delta2_x = np.array(value).reshape(p_shape)
-        for si in reversed(range(para_num)):
-            delta2_x = simpson(delta2_x, x[si])
-        rho_avg = np.zeros((dim, dim), dtype=np.complex128)
-        rho_pri = [np.zeros((dim, dim), dtype=np.complex128) for i in range(para_num)]
-        for di in range(dim):
-            for dj in range(dim):
-                rho_avg_arr = [p_list[m]*rho_list[m][di][dj] for m in range(p_num)]
-                rho_avg_tp = np.array(rho_avg_arr).reshape(p_shape)
-                for si in reversed(range(para_num)):
-                    rho_avg_tp = simpson(rho_avg_tp, x[si])
-                rho_avg[di][dj] = rho_avg_tp
-
-                for para_i in range(para_num):
-                    rho_pri_arr = [p_list[n]*x_list[n][para_i]*rho_list[n][di][dj] for n in range(p_num)]
-                    rho_pri_tp = np.array(rho_pri_arr).reshape(p_shape)
-                    for si in reversed(range(para_num)):
-                        rho_pri_tp = simpson(rho_pri_tp, x[si])
-
-                    rho_pri[para_i][di][dj] = rho_pri_tp
-        Lambda = Lambda_avg(rho_avg, rho_pri, eps=eps)
-        Mat = np.zeros((para_num, para_num), dtype=np.complex128)
-        for para_m in range(para_num):
-            for para_n in range(para_num):
-                Mat += W[para_m][para_n]*np.dot(Lambda[para_m], Lambda[para_n])
-                
-        minBC = delta2_x-np.real(np.trace(np.dot(rho_avg, Mat)))
-        return minBC
+    grid = _grid_input(x, p, rho)
+    para_num = grid.para_num
+    if para_num == 1 or len(W) == 0:
+        W = np.identity(para_num)
+
+    # Simpson weights times the prior, the integrals are contractions with them
+    wp = grid.weights * grid.p.reshape(-1)
+    x_list, rho_list = grid.x_list, grid.rho
+    delta2_x = np.einsum("n,ni,ij,nj->", wp, x_list, W, x_list)
+    rho_avg = np.einsum("n,nab->ab", wp, rho_list)
+    rho_pri = np.einsum("n,ni,nab->iab", wp, x_list, rho_list)
+    Lambda = Lambda_avg(rho_avg, rho_pri, eps=eps)
+    Mat = np.einsum("mn,mab,nbc->ac", W, Lambda, Lambda)
+    minBC = delta2_x-np.real(np.trace(np.dot(rho_avg, Mat)))
+    return minBC
         
 def Lambda_avg(rho_avg, rho_pri, eps=1e-8):
-    para_num = len(rho_pri)
-    dim = len(rho_avg)
-    Lambda = [[] for i in range(0, para_num)]
-    val, vec = np.linalg.eig(rho_avg)
-    val = np.real(val)
-    for para_i in range(0, para_num):
-        Lambda_eig = np.array([[0.0 + 0.0 * 1.0j for i in range(0, dim)] for i in range(0, dim)])
-        for fi in range(0, dim):
-            for fj in range(0, dim):
-                if np.abs(val[fi] + val[fj]) > eps:
-                    Lambda_eig[fi][fj] = (2* np.dot(vec[:, fi].conj().transpose(),np.dot(rho_pri[para_i], vec[:, fj]))/ (val[fi] + val[fj]))
-        Lambda_eig[Lambda_eig == np.inf] = 0.0
-        Lambda[para_i] = np.dot(vec, np.dot(Lambda_eig, vec.conj().transpose()))
-    return Lambda
+    val, vec = np.linalg.eigh(rho_avg)
+    rho_pri_eig = vec.conj().T @ np.asarray(rho_pri) @ vec
+    val_sum = val[:, None] + val[None, :]
+    idx = np.abs(val_sum) > eps
+    Lambda_eig = np.where(idx, 2 * rho_pri_eig / np.where(idx, val_sum, 1.0), 0.0)
+    return vec @ Lambda_eig @ vec.conj().T
@@ -0,0 +1,210 @@
+import os
+import numbers
+import numpy as np
+from itertools import product
+from concurrent.futures import ThreadPoolExecutor
+from quanestimation.AsymptoticBound.CramerRao import (
+    CFIM_batch,
+    _eig_batch,
+    _LD_eig,
+    _QFIM_eig,
+)
+from quanestimation.Common.Common import VectorPOVM, _povm_prob
+
+
+class ParameterGrid:
+    r"""
+    The parameterized states on the grid of the unknown parameters. The density
+    matrices and their derivatives are stored as contiguous arrays, and the
+    eigendecompositions, logarithmic derivatives, CFIMs, QFIMs and the probabilities
+    of the measurement results are computed on the first request and cached, so
+    that several Bayesian bounds and estimations on the same grid share them. A
+    ParameterGrid can be passed as `x` to BCFIM, BQFIM, BCRB, BQCRB, VTB, QVTB, OBB,
+    QZZB, Bayes, MLE, BayesCost and BCB, in which case the prior distribution, its
+    derivatives, the density matrices and their derivatives are taken from it.
+
+    The computations on the grid points are independent. With `n_jobs` larger than 1
+    the grid is split into contiguous shards which are handled in a thread pool. The
+    shards are views of the stored arrays, so no copy of the states is made, and
+    NumPy releases the GIL in the batched linear algebra.
+
+    Attributes
+    ----------
+    > **x:** `list`
+        -- The regimes of the parameters for the integral.
+
+    > **p:** `multidimensional array`
+        -- The prior distribution.
+
+    > **rho:** `multidimensional list`
+        -- Parameterized density matrix. It is stored as an array with the shape
+        (N, d, d), where N is the number of grid points.
+
+    > **drho:** `multidimensional list`
+        -- Derivatives of the parameterized density matrix (rho) with respect to the
+        unknown parameters to be estimated. It is stored as an array with the shape
+        (N, P, d, d), where P is the number of the parameters.
+
+    > **dp:** `list`
+        -- Derivatives of the prior distribution with respect to the unknown parameters
+        to be estimated. It is stored as an array with the shape (N, P).
+    """
+
+    def __init__(self, x, p, rho, drho=None, dp=None):
+
+        self.x = [np.asarray(xi) for xi in x]
+        self.para_num = len(x)
+        self.shape = tuple(len(xi) for xi in x)
+        self.p = None if p is None else np.reshape(np.asarray(p), self.shape)
+
+        rho = np.asarray(rho, dtype=np.complex128)
+        self.dim = rho.shape[-1]
+        self.rho = np.reshape(rho, (-1, self.dim, self.dim))
+        self.num = len(self.rho)
+        if self.num != int(np.prod(self.shape)):
+            raise ValueError(
+                "The number of density matrices ({}) does not match the size of the grid ({}).".format(self.num, int(np.prod(self.shape)))
+            )
+
+        if drho is None:
+            self.drho = None
+        else:
+            self.drho = np.reshape(np.asarray(drho, dtype=np.complex128), (self.num, -1, self.dim, self.dim))
+
+        if dp is None:
+            self.dp = None
+        else:
+            self.dp = np.reshape(np.asarray(dp), (self.num, -1))
+
+        self._x_list = None
+        self._weights = None
+        self._eig = None
+        self._LD = {}
+        self._CFIM = {}
+        self._QFIM = {}
+        self._likelihood = {}
+
+    @property
+    def x_list(self):
+        """
+        The grid points with the shape (N, P).
+        """
+        if self._x_list is None:
+            self._x_list = np.array(list(product(*self.x)), dtype=np.float64).reshape(self.num, self.para_num)
+        return self._x_list
+
+    @property
+    def weights(self):
+        """
+        Simpson weights of the grid points with the shape (N,), such that the integral
+        over the grid of an array with the shape (N, ...) is its contraction with them.
+        """
+        from scipy.integrate import simpson
+
+        if self._weights is None:
+            w = np.ones(1)
+            for xi in self.x:
+                w = np.outer(w, simpson(np.identity(len(xi)), x=xi, axis=0)).reshape(-1)
+            self._weights = w
+        return self._weights
+
+    def eig(self, n_jobs=1):
+        """
+        Eigenvalues, eigenvectors and the derivatives of the density matrices in the
+        eigenbases on all the grid points.
+        """
+        if self._eig is None:
+            self._require_drho()
+            self._eig = _sharded(_eig_batch, n_jobs, self.rho, self.drho)
+        return self._eig
+
+    def LD(self, LDtype="SLD", eps=1e-8, n_jobs=1):
+        """
+        Logarithmic derivatives on all the grid points with the shape (N, P, d, d).
+        """
+        key = (LDtype, eps)
+        if key not in self._LD:
+            def LD_func(val, vec, drho_eig):
+                LD_eig = _LD_eig(val, drho_eig, LDtype, eps)
+                return vec[:, None] @ LD_eig @ np.swapaxes(vec.conj(), -1, -2)[:, None]
+            self._LD[key] = _sharded(LD_func, n_jobs, *self.eig(n_jobs=n_jobs))
+        return self._LD[key]
+
+    def CFIM(self, M=[], eps=1e-8, n_jobs=1):
+        """
+        CFIMs on all the grid points with the shape (N, P, P). The default measurement
+        is a set of rank-one symmetric informationally complete POVM (SIC-POVM).
+        """
+        key = (self._M_key(M), eps)
+        if key not in self._CFIM:
+            self._require_drho()
+            CFIM_func = lambda rho, drho: CFIM_batch(rho, drho, M=M, eps=eps)
+            self._CFIM[key] = _sharded(CFIM_func, n_jobs, self.rho, self.drho)
+        return self._CFIM[key]
+
+    def QFIM(self, LDtype="SLD", eps=1e-8, n_jobs=1):
+        """
+        QFIMs on all the grid points with the shape (N, P, P). It is complex for the
+        RLD and LLD based QFIMs.
+        """
+        key = (LDtype, eps)
+        if key not in self._QFIM:
+            val, vec, drho_eig = self.eig(n_jobs=n_jobs)
+            QFIM_func = lambda val, drho_eig: _QFIM_eig(val, drho_eig, LDtype, eps)
+            self._QFIM[key] = _sharded(QFIM_func, n_jobs, val, drho_eig)
+        return self._QFIM[key]
+
+    def likelihood(self, M=[]):
+        r"""
+        Probabilities $\mathrm{Tr}(\rho\Pi_y)$ of all the measurement results on all
+        the grid points with the shape (N, Y).
+        """
+        key = self._M_key(M)
+        if key not in self._likelihood:
+            self._likelihood[key] = _povm_prob(self.rho, M)
+        return self._likelihood[key]
+
+    def integrate(self, arr):
+        """
+        Integral over the grid of an array with the shape (N, ...).
+        """
+        return np.tensordot(self.weights, arr, axes=(0, 0))
+
+    def _M_key(self, M):
+        if isinstance(M, VectorPOVM):
+            return M.vectors.shape, M.vectors.tobytes(), M.weights.tobytes()
+        if len(M) == 0:
+            return None
+        M = np.asarray(M, dtype=np.complex128)
+        return M.shape, M.tobytes()
+
+    def _require_drho(self):
+        if self.drho is None:
+            raise ValueError("The derivatives of the density matrices (drho) are not given in the ParameterGrid.")
+
+
+def _grid_input(x, p, rho, drho=None, dp=None):
+    if isinstance(x, ParameterGrid):
+        return x
+    return ParameterGrid(x, p, rho, drho=drho, dp=dp)
+
+
+def _sharded(func, n_jobs, *arrays):
+    # apply func to contiguous shards of the arrays along the grid axis in a thread
+    # pool and concatenate the results, which are arrays or tuples of arrays
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if not isinstance(n_jobs, numbers.Integral) or n_jobs < 1:
+        raise ValueError("{!r} is not a valid value for n_jobs, supported values are positive integers and -1.".format(n_jobs))
+    num = len(arrays[0])
+    n_jobs = min(n_jobs, num)
+    if n_jobs == 1:
+        return func(*arrays)
+
+    bounds = np.linspace(0, num, n_jobs + 1).astype(int)
+    shards = [[arr[bounds[i]:bounds[i + 1]] for arr in arrays] for i in range(n_jobs)]
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        res = list(executor.map(lambda shard: func(*shard), shards))
+    if isinstance(res[0], tuple):
+        return tuple(np.concatenate(res_i) for res_i in zip(*res))
+    return np.concatenate(res)
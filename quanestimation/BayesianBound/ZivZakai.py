@@ -1,6 +1,6 @@
 import numpy as np
 from scipy.linalg import sqrtm
-from scipy.integrate import simpson
+from quanestimation.BayesianBound.ParameterGrid import ParameterGrid
 
 
 def trace_norm(A, eps):
@@ -29,7 +29,7 @@ def helstrom_vec(psi, phi, n=1):
     return np.real((1 - np.sqrt(1 - fidelity_vec(psi, phi) ** n)) / 2)
 
 
-def QZZB(x, p, rho, eps=1e-8):
+def QZZB(x, p=None, rho=None, eps=1e-8):
     r"""
     Calculation of the quantum Ziv-Zakai bound (QZZB). The expression of QZZB with a 
     prior distribution p(x) in a finite regime $[\alpha,\beta]$ is
@@ -46,8 +46,9 @@ def QZZB(x, p, rho, eps=1e-8):
 
     Parameters
     ----------
-    > **x:** `list`
-        -- The regimes of the parameters for the integral.
+    > **x:** `list or ParameterGrid`
+        -- The regimes of the parameters for the integral. If it is a ParameterGrid, 
+        the other inputs on the grid are taken from it and need not be given.
 
     > **p:** `multidimensional array`
         -- The prior distribution.
@@ -63,7 +64,10 @@ def QZZB(x, p, rho, eps=1e-8):
     **QZZB:** `float`
         -- Quantum Ziv-Zakai bound (QZZB).
     """
+    from scipy.integrate import simpson
 
+    if isinstance(x, ParameterGrid):
+        x, p, rho = x.x, x.p, x.rho
     if type(x[0]) == list or type(x[0]) == np.ndarray:
         x = x[0]
     p_num = len(p)
@@ -12,9 +12,14 @@ from quanestimation.BayesianBound.ZivZakai import (
 )
 from quanestimation.BayesianBound.BayesEstimation import (
     Bayes,
+    Bayes_batch,
     MLE,
     BCB,
-    BayesCost
+    BayesCost,
+    StreamingEstimator,
+)
+from quanestimation.BayesianBound.ParameterGrid import (
+    ParameterGrid,
 )
 
 __all__ = [
@@ -27,7 +32,10 @@ __all__ = [
     "VTB",
     "QZZB",
     "Bayes",
+    "Bayes_batch",
     "MLE",
     "BCB",
     "BayesCost",
+    "StreamingEstimator",
+    "ParameterGrid",
 ]
@@ -1,20 +1,76 @@
 import numpy as np
 import os
 import copy
-from scipy.sparse import csc_matrix, csr_matrix
-from sympy import Matrix, GramSchmidt
+from functools import lru_cache
+from scipy.sparse import csc_matrix, csr_matrix, coo_matrix, kron, identity, vstack
 from itertools import product
-import juliacall
 
 def load_julia():
     """
     Load Julia.
     """
 
+    import juliacall
+
     jl = juliacall.newmodule("QuanEstimation")
     jl.Main.seval("using QuanEstimation, PythonCall")
     return jl.Main.QuanEstimation
 
+
+@lru_cache(maxsize=None)
+def _julia_init():
+    # boot Julia and load QuanEstimation.jl, only once per process
+    from quanestimation.Common._julia_project import project
+
+    project.ensure_init()
+    return load_julia()
+
+
+class _JuliaProxy:
+    """
+    Proxy of a Julia module. Julia is booted and QuanEstimation.jl is loaded on the 
+    first attribute access, so that importing quanestimation does not start Julia 
+    and the NumPy-only functions never pay for it. With `main=True` it stands for 
+    the Julia Main module, otherwise for the QuanEstimation module.
+    """
+
+    def __init__(self, main=False):
+        self._main = main
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            module = _julia_init()
+            if self._main:
+                import juliacall
+
+                module = juliacall.Main
+            self._module = module
+        return self._module
+
+    def __getattr__(self, name):
+        if name.startswith("__") or name in ("_main", "_module"):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __repr__(self):
+        if self._module is None:
+            return "<Julia module {} (not loaded)>".format("Main" if self._main else "QuanEstimation")
+        return repr(self._module)
+
+
+def _unstack(A, ndim=3, dtype=np.complex128):
+    """
+    A stacked array (for example the matrices with the shape (N, d, d)) as a list of 
+    views of its entries, which is accepted wherever a list of matrices is. The array 
+    is converted to `dtype` once, so that the entries are not copied again one by one. 
+    Other inputs are returned unchanged.
+    """
+    if isinstance(A, np.ndarray) and A.ndim == ndim:
+        return list(np.asarray(A, dtype=dtype))
+    return A
+
+
 def mat_vec_convert(A):
     if A.shape[1] == 1:
         dim = int(np.sqrt(len(A)))
@@ -23,31 +79,87 @@ def mat_vec_convert(A):
         return A.reshape([len(A) ** 2, 1])
 
 
-def suN_unsorted(n):
-    U, V, W = [], [], []
+def suN_generator(n):
+    r"""
+    Generation of the SU($N$) generators with $N$ the dimension of the system.
+
+    Parameters
+    ----------
+    > **n:** `int` 
+        -- The dimension of the system.
+
+    Returns
+    ----------
+    SU($N$) generators.
+    """
+
+    return list(np.array(suN_basis(n)))
+
+
+@lru_cache(maxsize=16)
+def _suN_stack(n):
+    # the generalized Gell-Mann matrices in the order of suN_generator: for i = 1,...,n-1
+    # the symmetric and antisymmetric matrices of the entries (i, j) with j < i, then
+    # the diagonal matrix diag(1,...,1,-i,0,...,0) normalized to Tr(W^2) = 2
+    Lambda = np.zeros((n**2 - 1, n, n), dtype=np.complex128)
+    k = 0
     for i in range(1, n):
-        for j in range(0, i):
-            U_tp = csc_matrix(([1.0, 1.0], ([i, j], [j, i])), shape=(n, n)).toarray()
-            V_tp = csc_matrix(([1.0j, -1.0j], ([i, j], [j, i])), shape=(n, n)).toarray()
-            U.append(U_tp)
-            V.append(V_tp)
+        for j in range(i):
+            Lambda[k, i, j] = Lambda[k, j, i] = 1.0
+            Lambda[k + 1, i, j], Lambda[k + 1, j, i] = 1.0j, -1.0j
+            k += 2
+        coeff = np.sqrt(2.0 / (i * (i + 1)))
+        Lambda[k, np.arange(i), np.arange(i)] = coeff
+        Lambda[k, i, i] = -i * coeff
+        k += 1
+    Lambda.flags.writeable = False
+    return Lambda
+
+
+def suN_basis(n, sparse=False):
+    r"""
+    Generation of the SU($N$) generators (the generalized Gell-Mann matrices 
+    $\lambda_a$ with $\mathrm{Tr}(\lambda_a\lambda_b)=2\delta_{ab}$) as a stacked array, 
+    in the order of suN_generator. The generators are constructed analytically and 
+    cached.
 
-    diag = []
-    for i in range(n - 1):
-        mat_tp = csc_matrix(([1, -1], ([i, i + 1], [i, i + 1])), shape=(n, n)).toarray()
-        diag_tp = np.diagonal(mat_tp)
-        diag.append(Matrix(diag_tp))
-    W_gs = GramSchmidt(diag, True)
-    for k in range(len(W_gs)):
-        W_tp = np.fromiter(W_gs[k], dtype=complex)
-        W.append(np.sqrt(2) * np.diag(W_tp))
+    Parameters
+    ----------
+    > **n:** `int` 
+        -- The dimension of the system.
 
-    return U, V, W
+    > **sparse:** `bool`
+        -- Whether to return the generators as a sparse matrix in the COO format, 
+        whose rows are the flattened generators.
 
+    Returns
+    ----------
+    **Lambda:** `array or coo_matrix`
+        -- A read-only array with the shape $(N^2-1, N, N)$, or a sparse matrix with 
+        the shape $(N^2-1, N^2)$ if `sparse=True`.
+    """
 
-def suN_generator(n):
+    Lambda = _suN_stack(n)
+    if sparse:
+        return coo_matrix(Lambda.reshape(n**2 - 1, n**2))
+    return Lambda
+
+
+@lru_cache(maxsize=16)
+def suN_structure(n):
     r"""
-    Generation of the SU($N$) generators with $N$ the dimension of the system.
+    Structure constants of the SU($N$) generators $\lambda_a$ given by suN_basis,
+    defined by
+    \begin{align}
+    [\lambda_a, \lambda_b]=2i\sum_c f_{abc}\lambda_c,~~
+    \{\lambda_a, \lambda_b\}=\frac{4}{N}\delta_{ab}\openone+2\sum_c d_{abc}\lambda_c.
+    \end{align}
+
+    They are obtained from $\mathrm{Tr}(\lambda_a\lambda_b\lambda_c)=2(d_{abc}+if_{abc})$ 
+    with sparse products of the generators and cached. Since most of them vanish, 
+    they are returned as sparse matrices whose row $aK+b$ ($K=N^2-1$) and column 
+    $c$ is the constant with the indices $a, b, c$, so that a contraction such as 
+    $\sum_c d_{abc}r_c$ is `(d @ r).reshape(K, K)`.
 
     Parameters
     ----------
@@ -56,42 +168,30 @@ def suN_generator(n):
 
     Returns
     ----------
-    SU($N$) generators.
+    **f, d:** `csr_matrix`
+        -- The antisymmetric and symmetric structure constants with the shape 
+        $(K^2, K)$.
     """
 
-    symm, anti_symm, diag = suN_unsorted(n)
-    if n == 2:
-        return [symm[0], anti_symm[0], diag[0]]
-    else:
-        Lambda = [0.0 for i in range(len(symm + anti_symm + diag))]
-
-        Lambda[0], Lambda[1], Lambda[2] = symm[0], anti_symm[0], diag[0]
-
-        repeat_times = 2
-        m1, n1, k1 = 0, 3, 1
-        while True:
-            m1 += n1
-            j, l = 0, 0
-            for i in range(repeat_times):
-                Lambda[m1 + j] = symm[k1]
-                Lambda[m1 + j + 1] = anti_symm[k1]
-                j += 2
-                k1 += 1
-
-            repeat_times += 1
-            n1 = n1 + 2
-            if k1 == len(symm):
-                break
-
-        m2, n2, k2 = 2, 5, 1
-        while True:
-            m2 += n2
-            Lambda[m2] = diag[k2]
-            n2 = n2 + 2
-            k2 = k2 + 1
-            if k2 == len(diag):
-                break
-        return Lambda
+    K = n**2 - 1
+    Lambda = _suN_stack(n)
+    L = csr_matrix(Lambda.reshape(K, n**2))
+    # Tr(XY) is the product of the row-major vectors of X and Y^T, and Y^T = Y^* here
+    L_T = L.conj().T.tocsc()
+    Id = identity(n, format="csr")
+    T = []
+    for a in range(K):
+        # the rows are the vectors of lambda_a @ lambda_b, vec(AB) = (A x I)vec(B)
+        prod = (kron(csr_matrix(Lambda[a]), Id) @ L.T).T
+        T.append(prod @ L_T)
+    T = vstack(T, format="csr")
+    T.data[np.abs(T.data) < 1e-14] = 0.0
+
+    f = T.imag / 2
+    d = T.real / 2
+    f.eliminate_zeros()
+    d.eliminate_zeros()
+    return f, d
 
 
 def gramschmidt(A):
@@ -199,21 +299,179 @@ def SIC(dim):
     **Note:** 
         SIC-POVM is calculated by the Weyl-Heisenberg covariant SIC-POVM fiducial state 
         which can be downloaded from [here](http://www.physics.umb.edu/Research/QBism/
-        solutions.html).
+        solutions.html). The $d^4$ elements of the dense POVM are built from the cached 
+        vectors of SIC_vectors, which is much cheaper in memory for large dimensions.
     """
 
-    if dim <= 151:
-        file_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "sic_fiducial_vectors/d%d.txt" % (dim),
-        )
-        data = np.loadtxt(file_path)
-        fiducial = data[:, 0] + data[:, 1] * 1.0j
-        fiducial = np.array(fiducial).reshape(len(fiducial), 1)
-        M = sic_povm(fiducial)
-        return M
-    else:
-        raise ValueError("The dimension of the space should be less or equal to 151.")
+    vectors = SIC_vectors(dim)
+    M = np.einsum("mi,mj->mij", vectors, vectors.conj()) / dim
+    return list(M)
+
+
+@lru_cache(maxsize=16)
+def SIC_vectors(dim):
+    r"""
+    Generation of the normalized vectors $|\phi_m\rangle$ of a rank-one symmetric 
+    informationally complete positive operator-valued measure (SIC-POVM), whose elements
+    are $|\phi_m\rangle\langle\phi_m|/d$. The vectors are obtained by applying the $d^2$ 
+    Weyl-Heisenberg displacement operators to the fiducial state, in the order of 
+    the elements given by SIC. The results are cached and read-only.
+
+    Parameters
+    ----------
+    > **dim:** `int` 
+        -- The dimension of the system.
+
+    Returns
+    ----------
+    **vectors:** `array`
+        -- The vectors of the SIC-POVM with the shape $(d^2, d)$.
+    """
+
+    if dim < 2 or dim > 151:
+        raise ValueError("The dimension of the space should be in the range from 2 to 151.")
+
+    fiducial = _sic_fiducials()[dim * (dim - 1) // 2 - 1 : dim * (dim + 1) // 2 - 1]
+    fiducial = fiducial / np.linalg.norm(fiducial)
+
+    # the displacement operator (-e^{i\pi/d})^{ab}X^aZ^b with the shift operator X and 
+    # the clock operator Z, the phases are reduced modulo 2\pi before the exponentiation
+    k = np.arange(dim)
+    Z_psi = np.exp(2.0j * np.pi * (np.outer(k, k) % dim) / dim) * fiducial
+    D_psi = np.stack([np.roll(Z_psi, a, axis=1) for a in k])
+    phase = np.exp(1.0j * np.pi * ((np.outer(k, k) * (dim + 1)) % (2 * dim)) / dim)
+    vectors = (phase[:, :, None] * D_psi).reshape(dim**2, dim)
+    vectors.flags.writeable = False
+    return vectors
+
+
+@lru_cache(maxsize=1)
+def _sic_fiducials():
+    # fiducial states of the dimensions from 2 to 151 concatenated in a single array
+    file_path = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)),
+        "sic_fiducial_vectors/fiducials.npy",
+    )
+    return np.load(file_path, mmap_mode="r")
+
+
+def SIC_prob(rho):
+    r"""
+    Probabilities $\mathrm{Tr}(\rho\Pi_{ab})$ of the results of the SIC-POVM given 
+    by SIC. The elements are $\Pi_{ab}=D_{ab}|\psi\rangle\langle\psi|D^\dagger_{ab}/d$ 
+    with the fiducial state $|\psi\rangle$ and the Weyl-Heisenberg displacement 
+    operators $D_{ab}\propto X^aZ^b$, thus
+    \begin{align}
+    \mathrm{Tr}(\rho\Pi_{ab})=\frac{1}{d}\sum_m \omega^{bm}\sum_j \psi^*_j\psi_{j+m}
+    \rho_{j+a,j+a+m}
+    \end{align}
+    
+    with $\omega=e^{2\pi i/d}$. The sums over $j$ and $m$ are evaluated with fast Fourier 
+    transforms, which costs $O(d^2\log d)$ operations for all the $d^2$ results instead 
+    of $O(d^4)$ for the traces with the dense POVM. Since the map is linear, it also 
+    gives the derivatives of the probabilities when the derivatives of the density 
+    matrix are input.
+
+    Parameters
+    ----------
+    > **rho:** `array`
+        -- Density matrix, or a stack of density matrices (or their derivatives) 
+        with the shape (..., d, d).
+
+    Returns
+    ----------
+    **p:** `array`
+        -- The probabilities with the shape (..., d^2), in the order of the 
+        elements given by SIC.
+    """
+
+    rho = np.asarray(rho)
+    dim = rho.shape[-1]
+    psi = SIC_vectors(dim)[0]
+    idx = (np.arange(dim)[None, :] + np.arange(dim)[:, None]) % dim
+    # c[m, j] = psi_j^* psi_{j+m} and r[..., m, i] = rho_{i, i+m}
+    c = np.outer(psi.conj(), psi)[np.arange(dim)[None, :], idx]
+    r = rho[..., np.arange(dim)[None, :], idx]
+    # circular cross-correlation in j, G[..., m, a] = sum_j c[m, j] r[..., m, j+a]
+    G = np.fft.ifft(np.fft.fft(r, axis=-1) * np.fft.fft(c.conj(), axis=-1).conj(), axis=-1)
+    # sum over m with the phases w^{bm}
+    p = np.fft.ifft(G, axis=-2)
+    return np.real(np.swapaxes(p, -1, -2)).reshape(rho.shape[:-2] + (dim**2,))
+
+
+class VectorPOVM:
+    r"""
+    A positive operator-valued measure (POVM) of rank-one elements 
+    $\Pi_m=w_m|v_m\rangle\langle v_m|$, stored as the stacked vectors $|v_m\rangle$ 
+    and the weights $w_m$. It takes $m\times d$ numbers instead of $m\times d^2$ for 
+    the dense POVM, and the probabilities $w_m\langle v_m|\rho|v_m\rangle$ are 
+    calculated without building the elements. A VectorPOVM can be passed as `M` to 
+    CFIM, CFIM_batch, BCFIM, BCRB, VTB, Bayes, Bayes_batch, MLE, StreamingEstimator, 
+    BayesCost and Adaptive.CFIM. Indexing it with an integer gives the dense element.
+
+    Attributes
+    ----------
+    > **vectors:** `array`
+        -- The vectors $|v_m\rangle$ with the shape (m, d).
+
+    > **weights:** `array`
+        -- The weights $w_m$ with the shape (m,). The default weights are one, which
+        corresponds to a projective measurement with orthonormal vectors.
+    """
+
+    def __init__(self, vectors, weights=None):
+
+        self.vectors = np.asarray(vectors, dtype=np.complex128)
+        if self.vectors.ndim != 2:
+            raise ValueError("Please make sure the shape of vectors is (m, d)!")
+        if weights is None:
+            self.weights = np.ones(len(self.vectors))
+        else:
+            self.weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+        if len(self.weights) != len(self.vectors):
+            raise ValueError("The number of weights does not match the number of vectors.")
+
+    @classmethod
+    def SIC(cls, dim):
+        """
+        The SIC-POVM given by SIC in the vector form.
+        """
+        return cls(SIC_vectors(dim), np.ones(dim**2) / dim)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return VectorPOVM(self.vectors[idx], self.weights[idx])
+        vec = self.vectors[idx]
+        return self.weights[idx] * np.outer(vec, vec.conj())
+
+    def prob(self, rho):
+        """
+        Probabilities of all the results for a density matrix, or a stack of density 
+        matrices (or their derivatives) with the shape (..., d, d). The output has the 
+        shape (..., m).
+        """
+        res = np.einsum("mi,...ij,mj->...m", self.vectors.conj(), rho, self.vectors, optimize=True)
+        return self.weights * np.real(res)
+
+    def dense(self):
+        """
+        The dense POVM as a list of matrices.
+        """
+        return [self[i] for i in range(len(self))]
+
+
+def _povm_prob(rho, M):
+    # probabilities of all the results of M for rho with the shape (..., d, d), the 
+    # SIC-POVM is used for an empty M
+    if isinstance(M, VectorPOVM):
+        return M.prob(rho)
+    if len(M) == 0:
+        return SIC_prob(rho)
+    M_T = np.swapaxes(np.asarray(M), -1, -2)
+    return np.real(np.einsum("...ij,yij->...y", rho, M_T))
 
 
 def extract_ele(element, n):
@@ -224,13 +482,15 @@ def extract_ele(element, n):
         yield element
 
 
-def annihilation(n):
+def annihilation(n, sparse=False):
     data = np.sqrt(np.arange(1, n, dtype=complex))
     indices = np.arange(1, n)
     indptr = np.arange(n + 1)
     indptr[-1] = n - 1
-    a = csr_matrix((data, indices, indptr), shape=(n, n)).todense()
-    return a
+    a = csr_matrix((data, indices, indptr), shape=(n, n))
+    if sparse:
+        return a
+    return a.todense()
 
 
 def brgd(n):
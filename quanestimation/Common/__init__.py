@@ -1,9 +1,14 @@
 from quanestimation.Common.Common import (
     mat_vec_convert,
     suN_generator,
+    suN_basis,
+    suN_structure,
     gramschmidt,
     basis,
     SIC,
+    SIC_vectors,
+    SIC_prob,
+    VectorPOVM,
     annihilation,
     BayesInput,
 )
@@ -11,9 +16,14 @@ from quanestimation.Common.Common import (
 __all__ = [
     "mat_vec_convert",
     "suN_generator",
+    "suN_basis",
+    "suN_structure",
     "gramschmidt",
     "basis",
     "SIC",
+    "SIC_vectors",
+    "SIC_prob",
+    "VectorPOVM",
     "annihilation",
     "BayesInput",
 ]
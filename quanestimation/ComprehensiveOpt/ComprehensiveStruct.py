@@ -1,6 +1,5 @@
 import numpy as np
 import h5py
-from scipy.interpolate import interp1d
 import warnings
 import math
 import os
@@ -141,6 +140,7 @@ class ComprehensiveSystem:
             "expm" (default) -- Matrix exponential.  
             "ode" -- Solving the differential equations directly. 
         """
+        from scipy.interpolate import interp1d
 
         self.tspan = tspan
         self.ctrl = ctrl
@@ -501,6 +501,7 @@ class ComprehensiveSystem:
         > **W:** `matrix`
             -- Weight matrix.
         """
+        from scipy.interpolate import interp1d
 
         if self.dynamics_type == "dynamics":
             if W == []:
@@ -1,13 +1,14 @@
 import numpy as np
 import h5py
-from scipy.interpolate import interp1d
 import warnings
 import math
 import os
 import quanestimation.ControlOpt as ctrl
-from quanestimation.Common.Common import SIC
+from quanestimation.Common.Common import SIC, _JuliaProxy, _unstack
 from quanestimation import QJL
-from juliacall import Main as jl, convert as jlconvert
+
+jl = _JuliaProxy(main=True)
+
 class ControlSystem:
     """
     Attributes
@@ -76,15 +77,16 @@ class ControlSystem:
 
         > **H0:** `matrix or list`
             -- Free Hamiltonian. It is a matrix when the free Hamiltonian is time-
-            independent and a list of length equal to `tspan` when it is time-dependent.
+            independent and a list of length equal to `tspan` (or an array with the shape 
+            (T, d, d)) when it is time-dependent.
 
         > **dH:** `list`
             -- Derivatives of the free Hamiltonian on the unknown parameters to be 
             estimated. For example, dH[0] is the derivative vector on the first 
-            parameter.
+            parameter. It can also be an array with the shape (P, d, d).
 
         > **Hc:** `list`
-            -- Control Hamiltonians.
+            -- Control Hamiltonians. It can also be an array with the shape (C, d, d).
 
         > **decay:** `list`
             -- Decay operators and the corresponding decay rates. Its input rule is 
@@ -102,7 +104,9 @@ class ControlSystem:
             "expm" (default) -- Matrix exponential.  
             "ode" -- Solving the differential equations directly.  
         """
+        from scipy.interpolate import interp1d
 
+        H0, dH, Hc = _unstack(H0), _unstack(dH), _unstack(Hc)
         self.tspan = tspan
         self.rho0 = np.array(rho0, dtype=np.complex128)
 
@@ -112,20 +116,20 @@ class ControlSystem:
             self.dyn_method = "Ode"
 
         if type(H0) == np.ndarray:
-            self.freeHamiltonian = np.array(H0, dtype=np.complex128)
+            self.freeHamiltonian = np.asarray(H0, dtype=np.complex128)
         else:
-            self.freeHamiltonian = [np.array(x, dtype=np.complex128) for x in H0[:-1]]
+            self.freeHamiltonian = [np.asarray(x, dtype=np.complex128) for x in H0[:-1]]
 
         if Hc == []:
             Hc = [np.zeros((len(self.rho0), len(self.rho0)))]
-        self.control_Hamiltonian = [np.array(x, dtype=np.complex128) for x in Hc]
+        self.control_Hamiltonian = [np.asarray(x, dtype=np.complex128) for x in Hc]
 
         if type(dH) != list:
             raise TypeError("The derivative of Hamiltonian should be a list!")
 
         if dH == []:
             dH = [np.zeros((len(self.rho0), len(self.rho0)))]
-        self.Hamiltonian_derivative = [np.array(x, dtype=np.complex128) for x in dH]
+        self.Hamiltonian_derivative = [np.asarray(x, dtype=np.complex128) for x in dH]
         if len(dH) == 1:
             self.para_type = "single_para"
         else:
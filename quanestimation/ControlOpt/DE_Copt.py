@@ -1,4 +1,3 @@
-import juliacall
 from quanestimation import QJL
 import quanestimation.ControlOpt.ControlStruct as Control
 
@@ -1,12 +1,11 @@
 import numpy as np
 import h5py
-from scipy.interpolate import interp1d
 import os
 import math
 import warnings
 from quanestimation import QJL
 import quanestimation.MeasurementOpt as Measure
-from quanestimation.Common.Common import gramschmidt, sic_povm
+from quanestimation.Common.Common import gramschmidt, SIC, _unstack
 
 
 class MeasurementSystem:
@@ -100,15 +99,16 @@ class MeasurementSystem:
 
         > **H0:** `matrix or list`
             -- Free Hamiltonian. It is a matrix when the free Hamiltonian is time-
-            independent and a list of length equal to `tspan` when it is time-dependent.
+            independent and a list of length equal to `tspan` (or an array with the shape 
+            (T, d, d)) when it is time-dependent.
 
         > **dH:** `list`
             -- Derivatives of the free Hamiltonian on the unknown parameters to be 
             estimated. For example, dH[0] is the derivative vector on the first 
-            parameter.
+            parameter. It can also be an array with the shape (P, d, d).
 
         > **Hc:** `list`
-            -- Control Hamiltonians.
+            -- Control Hamiltonians. It can also be an array with the shape (C, d, d).
 
         > **ctrl:** `list of arrays`
             -- Control coefficients.
@@ -124,7 +124,10 @@ class MeasurementSystem:
             "expm" (default) -- Matrix exponential.  
             "ode" -- Solving the differential equations directly.
         """
+        from scipy.interpolate import interp1d
 
+        H0, dH, Hc = _unstack(H0), _unstack(dH), _unstack(Hc)
+        ctrl = _unstack(ctrl, ndim=2, dtype=np.float64)
         self.tspan = tspan
         self.rho0 = np.array(rho0, dtype=np.complex128)
 
@@ -167,14 +170,7 @@ class MeasurementSystem:
                 self.M_num = self.minput[2]
                 ## optimize the combination of a set of SIC-POVM
                 if self.minput[1] == []:
-                    file_path = os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)),
-                        "sic_fiducial_vectors/d%d.txt" % (len(self.rho0)),
-                    )
-                    data = np.loadtxt(file_path)
-                    fiducial = data[:, 0] + data[:, 1] * 1.0j
-                    fiducial = np.array(fiducial).reshape(len(fiducial), 1)
-                    self.povm_basis = sic_povm(fiducial)
+                    self.povm_basis = SIC(len(self.rho0))
                 else:
                     ## optimize the combination of a set of given POVMs
                     if type(self.minput[1]) != list:
@@ -288,9 +284,9 @@ class MeasurementSystem:
 
         if Hc == [] or ctrl == []:
             if type(H0) == np.ndarray:
-                self.freeHamiltonian = np.array(H0, dtype=np.complex128)
+                self.freeHamiltonian = np.asarray(H0, dtype=np.complex128)
             else:
-                self.freeHamiltonian = [np.array(x, dtype=np.complex128) for x in H0]
+                self.freeHamiltonian = [np.asarray(x, dtype=np.complex128) for x in H0]
         else:
             ctrl_num = len(ctrl)
             Hc_num = len(Hc)
@@ -311,12 +307,12 @@ class MeasurementSystem:
 
             if len(ctrl[0]) == 1:
                 if type(H0) == np.ndarray:
-                    H0 = np.array(H0, dtype=np.complex128)
-                    Hc = [np.array(x, dtype=np.complex128) for x in Hc]
+                    H0 = np.asarray(H0, dtype=np.complex128)
+                    Hc = [np.asarray(x, dtype=np.complex128) for x in Hc]
                     Htot = H0 + sum([Hc[i] * ctrl[i][0] for i in range(ctrl_num)])
                     self.freeHamiltonian = np.array(Htot, dtype=np.complex128)
                 else:
-                    H0 = [np.array(x, dtype=np.complex128) for x in H0]
+                    H0 = [np.asarray(x, dtype=np.complex128) for x in H0]
                     Htot = []
                     for i in range(len(H0)):
                         Htot.append(
@@ -341,8 +337,8 @@ class MeasurementSystem:
                 else: pass
 
                 if type(H0) == np.ndarray:
-                    H0 = np.array(H0, dtype=np.complex128)
-                    Hc = [np.array(x, dtype=np.complex128) for x in Hc]
+                    H0 = np.asarray(H0, dtype=np.complex128)
+                    Hc = [np.asarray(x, dtype=np.complex128) for x in Hc]
                     ctrl = [np.array(ctrl[i]).repeat(number) for i in range(len(Hc))]
                     Htot = []
                     for i in range(len(ctrl[0])):
@@ -352,8 +348,8 @@ class MeasurementSystem:
                         np.array(x, dtype=np.complex128) for x in Htot
                     ]
                 else:
-                    H0 = [np.array(x, dtype=np.complex128) for x in H0]
-                    Hc = [np.array(x, dtype=np.complex128) for x in Hc]
+                    H0 = [np.asarray(x, dtype=np.complex128) for x in H0]
+                    Hc = [np.asarray(x, dtype=np.complex128) for x in Hc]
                     ctrl = [np.array(ctrl[i]).repeat(number) for i in range(len(Hc))]
                     Htot = []
                     for i in range(len(ctrl[0])):
@@ -368,7 +364,7 @@ class MeasurementSystem:
 
         if dH == []:
             dH = [np.zeros((len(self.rho0), len(self.rho0)))]
-        self.Hamiltonian_derivative = [np.array(x, dtype=np.complex128) for x in dH]
+        self.Hamiltonian_derivative = [np.asarray(x, dtype=np.complex128) for x in dH]
 
         if decay == []:
             decay_opt = [np.zeros((len(self.rho0), len(self.rho0)))]
@@ -462,14 +458,7 @@ class MeasurementSystem:
                 self.M_num = self.minput[2]
                 ## optimize the combination of a set of SIC-POVM
                 if self.minput[1] == []:
-                    file_path = os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)),
-                        "sic_fiducial_vectors/d%d.txt" % (len(self.rho0)),
-                    )
-                    data = np.loadtxt(file_path)
-                    fiducial = data[:, 0] + data[:, 1] * 1.0j
-                    fiducial = np.array(fiducial).reshape(len(fiducial), 1)
-                    self.povm_basis = sic_povm(fiducial)
+                    self.povm_basis = SIC(len(self.rho0))
                 else:
                     ## optimize the combination of a set of given POVMs
                     if type(self.minput[1]) != list:
@@ -1,7 +1,16 @@
 import numpy as np
 import warnings
 import math
+import copy
+from itertools import product
+from scipy.linalg import expm
+from scipy.sparse import bmat, csr_matrix, issparse
+from scipy.sparse import identity as sparse_identity
+from scipy.sparse import kron as sparse_kron
+from scipy.sparse.linalg import expm_multiply
 from quanestimation import QJL
+from quanestimation.Common.Common import _unstack
+from quanestimation.BayesianBound.ParameterGrid import _sharded
 
 
 class Lindblad:
@@ -28,13 +37,13 @@ class Lindblad:
 
     > **H0:** `matrix or list`
         -- Free Hamiltonian. It is a matrix when the free Hamiltonian is time-
-        independent and a list with the length equal to `tspan` when it is 
-        time-dependent.
+        independent and a list (or an array with the shape (T, d, d)) with the 
+        length equal to `tspan` when it is time-dependent.
 
     > **dH:** `list`
         -- Derivatives of the free Hamiltonian with respect to the unknown parameters to be 
         estimated. For example, dH[0] is the derivative vector on the first 
-        parameter.
+        parameter. It can also be an array with the shape (P, d, d).
 
     > **decay:** `list`
         -- Decay operators and the corresponding decay rates. Its input rule is 
@@ -43,28 +52,56 @@ class Lindblad:
         corresponding decay rate.
 
     > **Hc:** `list`
-        -- Control Hamiltonians.
+        -- Control Hamiltonians. It can also be an array with the shape (C, d, d).
 
     > **ctrl:** `list of arrays`
-        -- Control coefficients.
+        -- Control coefficients. It can also be an array with the shape (C, K).
+
+    > **backend:** `string`
+        -- The backend of the calculation of the dynamics. Options are:  
+        "julia" (default) -- the dynamics is calculated in QuanEstimation.jl.  
+        "numpy" -- the dynamics is calculated with NumPy and SciPy, which does not 
+        need Julia. The vectorized Liouvillian and its derivatives on the parameters 
+        are built once, and the propagator of every distinct set of control 
+        coefficients is calculated once and cached.  
+        "sparse" -- the Hamiltonians and the decay operators are kept as SciPy sparse 
+        matrices, and the vectorized density matrix and its derivatives are 
+        propagated with the action of the exponential of the sparse Liouvillian 
+        (scipy.sparse.linalg.expm_multiply), so that no dense $d^2\times d^2$ matrix is 
+        formed. It is suitable for large dimensions with sparse operators.
     """
 
-    def __init__(self, tspan, rho0, H0, dH, decay=[], Hc=[], ctrl=[]):
+    def __init__(self, tspan, rho0, H0, dH, decay=[], Hc=[], ctrl=[], backend="julia"):
         
+        if backend not in ("julia", "numpy", "sparse"):
+            raise ValueError(
+                "{!r} is not a valid value for backend, supported values are 'julia', 'numpy' and 'sparse'.".format(backend)
+            )
+        self.backend = backend
+        self._superoperators = None
+        self._propagators = {}
+
+        H0, dH, Hc = _unstack(H0), _unstack(dH), _unstack(Hc)
+        ctrl = _unstack(ctrl, ndim=2, dtype=np.float64)
+
         self.tspan = tspan
         self.rho0 = np.array(rho0, dtype=np.complex128)
 
-        if type(H0) == np.ndarray:
-            self.freeHamiltonian = np.array(H0, dtype=np.complex128)
+        if backend == "sparse":
+            operator = lambda A: csr_matrix(A, dtype=np.complex128)
         else:
-            self.freeHamiltonian = [np.array(x, dtype=np.complex128) for x in H0]
+            operator = lambda A: np.asarray(A, dtype=np.complex128)
 
-        if type(dH[0]) != np.ndarray:
-            raise TypeError("The derivative of Hamiltonian should be a list!")
+        if type(H0) == np.ndarray or issparse(H0):
+            self.freeHamiltonian = operator(H0)
+        else:
+            self.freeHamiltonian = [operator(x) for x in H0]
 
         if not dH:
             dH = [np.zeros((len(self.rho0), len(self.rho0)))]
-        self.Hamiltonian_derivative = [np.array(x, dtype=np.complex128) for x in dH]
+        if type(dH[0]) != np.ndarray and not issparse(dH[0]):
+            raise TypeError("The derivative of Hamiltonian should be a list!")
+        self.Hamiltonian_derivative = [operator(x) for x in dH]
 
         if not decay:
             decay_opt = [np.zeros((len(self.rho0), len(self.rho0)))]
@@ -72,12 +109,12 @@ class Lindblad:
         else:
             decay_opt = [decay[i][0] for i in range(len(decay))]
             self.gamma = [decay[i][1] for i in range(len(decay))]
-        self.decay_opt = [np.array(x, dtype=np.complex128) for x in decay_opt]
+        self.decay_opt = [operator(x) for x in decay_opt]
 
         if not Hc:
             Hc = [np.zeros((len(self.rho0), len(self.rho0)))]
             ctrl = [np.zeros(len(self.tspan) - 1)]
-            self.control_Hamiltonian = [np.array(x, dtype=np.complex128) for x in Hc]
+            self.control_Hamiltonian = [operator(x) for x in Hc]
             self.control_coefficients = ctrl
         elif not ctrl:
             ctrl = [np.zeros(len(self.tspan) - 1) for j in range(len(Hc))]
@@ -100,6 +137,7 @@ class Lindblad:
                     % (ctrlnum, ctrl_length),
                     DeprecationWarning,
                 )
+                ctrl = list(ctrl) + [np.zeros(len(ctrl[0])) for j in range(ctrlnum - ctrl_length)]
 
             number = math.ceil((len(self.tspan) - 1) / len(ctrl[0]))
             if len(self.tspan) - 1 % len(ctrl[0]) != 0:
@@ -108,7 +146,7 @@ class Lindblad:
             self.control_Hamiltonian = Hc
             self.control_coefficients = ctrl
 
-    def expm(self):
+    def expm(self, output="all", stacked=False):
         r"""
         Calculation of the density matrix and its derivatives on the unknown parameters 
         with matrix exponential method (expm). The density matrix at $j$th time interval is obtained by 
@@ -120,8 +158,30 @@ class Lindblad:
         +e^{\Delta t \mathcal{L}}(\partial_{\textbf{x}}\rho_{j-1}).
         \end{align}
 
+
+        Parameters
+        ----------
+        > **output:** `string, int or list`
+            -- The time points at which the density matrix and its derivatives are 
+            returned. Options are:  
+            "all" (default) -- all the time points in `tspan`.  
+            "final" -- only the final time point. In this case the density matrix and 
+            its derivatives are returned directly instead of in lists.  
+            An integer k -- every kth time point, starting from the first one.  
+            A list of times -- the time points in `tspan` nearest to the given times.  
+            The density matrices at the other time points are never converted or stored.
+
+        > **stacked:** `bool`
+            -- Whether or not to return the density matrices and their derivatives as 
+            arrays with the shapes (T, d, d) and (T, P, d, d) instead of lists.
         """
 
+        index, final = self._output_index(output)
+        if self.backend == "numpy":
+            return self._evolve_numpy("expm", index, final, stacked)
+        if self.backend == "sparse":
+            return self._evolve_sparse("expm", index, final, stacked)
+
         rho, drho = QJL.expm_py(
             self.tspan,
             self.rho0,
@@ -132,12 +192,9 @@ class Lindblad:
             self.control_Hamiltonian,
             self.control_coefficients,
         )
-        rho = [np.array(rho_i) for rho_i in rho]
-        drho = [[np.array(drho_ij) for drho_ij in drho_i] for drho_i in drho]
-        
-        return rho, drho
+        return _julia_output(rho, drho, index, final, stacked)
 
-    def ode(self):
+    def ode(self, output="all", stacked=False):
         r"""
         Calculation of the density matrix and its derivatives on the unknown parameters 
         with ordinary differential equations (ODE) solver.
@@ -150,8 +207,34 @@ class Lindblad:
         +e^{\Delta t \mathcal{L}}(\partial_{\textbf{x}}\rho_{j-1}).
         \end{align}
 
+        With the "numpy" and "sparse" backends, the equations of $\rho$ and 
+        $\partial_{\textbf{x}}\rho$ are solved exactly on every time interval with the 
+        exponential of the block generator $\begin{pmatrix}\mathcal{L} & 0\\ \partial_{\textbf{x}}\mathcal{L} 
+        & \mathcal{L}\end{pmatrix}$.
+
+        Parameters
+        ----------
+        > **output:** `string, int or list`
+            -- The time points at which the density matrix and its derivatives are 
+            returned. Options are:  
+            "all" (default) -- all the time points in `tspan`.  
+            "final" -- only the final time point. In this case the density matrix and 
+            its derivatives are returned directly instead of in lists.  
+            An integer k -- every kth time point, starting from the first one.  
+            A list of times -- the time points in `tspan` nearest to the given times.  
+            The density matrices at the other time points are never converted or stored.
+
+        > **stacked:** `bool`
+            -- Whether or not to return the density matrices and their derivatives as 
+            arrays with the shapes (T, d, d) and (T, P, d, d) instead of lists.
         """
 
+        index, final = self._output_index(output)
+        if self.backend == "numpy":
+            return self._evolve_numpy("ode", index, final, stacked)
+        if self.backend == "sparse":
+            return self._evolve_sparse("ode", index, final, stacked)
+
         rho, drho = QJL.ode_py(
             self.tspan,
             self.rho0,
@@ -162,12 +245,9 @@ class Lindblad:
             self.control_Hamiltonian,
             self.control_coefficients,
         )
-        rho = [np.array(rho_i) for rho_i in rho]
-        drho = [[np.array(drho_ij) for drho_ij in drho_i] for drho_i in drho]
-        
-        return rho, drho
+        return _julia_output(rho, drho, index, final, stacked)
         
-    def secondorder_derivative(self, d2H):
+    def secondorder_derivative(self, d2H, stacked=False):
         r"""
         Calculation of the density matrix and its derivatives and the second derivatives
         on $\textbf{x}$. The density matrix at $j$th time interval is obtained by 
@@ -193,6 +273,11 @@ class Lindblad:
         > **d2H:** `list`
             -- Second order derivatives of the free Hamiltonian on the unknown parameters 
             to be estimated.
+
+        > **stacked:** `bool`
+            -- Whether or not to return the density matrices and their first and second 
+            derivatives as arrays with the shapes (T, d, d), (T, P, d, d) and 
+            (T, P, d, d) instead of lists.
         """
 
         d2H = [np.array(x, dtype=np.complex128) for x in d2H]
@@ -207,7 +292,332 @@ class Lindblad:
             self.control_Hamiltonian,
             self.control_coefficients,
         )
-        rho = [np.array(rho_i) for rho_i in rho]
-        drho = [[np.array(drho_ij) for drho_ij in drho_i] for drho_i in drho]
-        #d2rho = 
-        return rho, drho, d2rho
\ No newline at end of file
+        return _julia_output(rho, drho, np.arange(len(rho)), False, stacked, d2rho=d2rho)
+
+    def _liouvillians(self):
+        # vectorized (row-major) superoperators: the free Hamiltonian part (None if it 
+        # is time-dependent), the control parts and the dissipators stacked as 
+        # (C+K, d^2, d^2), and the derivatives on the parameters (P, d^2, d^2). With 
+        # the "sparse" backend they are lists of sparse matrices instead of stacks.
+        if self._superoperators is None and self.backend == "sparse":
+            if issparse(self.freeHamiltonian):
+                LH = _sparse_commu(self.freeHamiltonian)
+            else:
+                LH = None
+            L_ops = [_sparse_commu(csr_matrix(Hc, dtype=np.complex128)) for Hc in self.control_Hamiltonian] + [
+                _sparse_dissip(Gamma) for Gamma in self.decay_opt
+            ]
+            dL = [_sparse_commu(dH) for dH in self.Hamiltonian_derivative]
+            self._superoperators = (LH, L_ops, dL)
+        elif self._superoperators is None:
+            if type(self.freeHamiltonian) == np.ndarray:
+                LH = _liouville_commu(self.freeHamiltonian)
+            else:
+                LH = None
+            L_ops = np.array(
+                [_liouville_commu(np.asarray(Hc, dtype=np.complex128)) for Hc in self.control_Hamiltonian]
+                + [_liouville_dissip(Gamma) for Gamma in self.decay_opt]
+            )
+            dL = np.array([_liouville_commu(dH) for dH in self.Hamiltonian_derivative])
+            self._superoperators = (LH, L_ops, dL)
+        return self._superoperators
+
+    def _step_propagators(self, method):
+        # propagators of the distinct time intervals and the index of the propagator of 
+        # every interval. For "expm" they are e^{dt L}, and for "ode" they also contain 
+        # the exact derivative blocks of the exponential of [[L, 0], [dL, L]].
+        LH, L_ops, dL = self._liouvillians()
+        num = len(self.tspan) - 1
+        dt = self.tspan[1] - self.tspan[0]
+        coeffs = self._step_coefficients()
+
+        if LH is not None:
+            # piecewise constant controls and decay rates share the propagators
+            coeffs, index = np.unique(coeffs, axis=0, return_inverse=True)
+            keys = [(method, dt, c.tobytes()) for c in coeffs]
+            L_step = lambda i: LH + np.tensordot(coeffs[i], L_ops, axes=(0, 0))
+        else:
+            index = np.arange(num)
+            keys = [None] * num
+            L_step = lambda i: _liouville_commu(self.freeHamiltonian[i]) + np.tensordot(coeffs[i], L_ops, axes=(0, 0))
+
+        dL_dt = dt * dL
+        propagators = []
+        for i, key in enumerate(keys):
+            prop = self._propagators.get(key)
+            if prop is None:
+                L = L_step(i)
+                if method == "expm":
+                    prop = expm(dt * L), dL_dt
+                else:
+                    num_sq = len(L)
+                    blocks = [expm(dt * np.block([[L, np.zeros_like(L)], [dL_j, L]])) for dL_j in dL]
+                    prop = blocks[0][:num_sq, :num_sq], np.array([B[num_sq:, :num_sq] for B in blocks])
+                if key is not None:
+                    self._propagators[key] = prop
+            propagators.append(prop)
+        return propagators, np.ravel(index)
+
+    def _step_coefficients(self):
+        # coefficients of the control Hamiltonians and the decay rates on every interval
+        num = len(self.tspan) - 1
+        coeffs = np.zeros((num, len(self.control_coefficients) + len(self.gamma)))
+        for i, ctrl_i in enumerate(self.control_coefficients):
+            coeffs[:, i] = np.repeat(np.asarray(ctrl_i, dtype=np.float64), num // len(ctrl_i))
+        for k, gamma_k in enumerate(self.gamma):
+            gamma_k = np.asarray(gamma_k, dtype=np.float64)
+            coeffs[:, len(self.control_coefficients) + k] = gamma_k[:num] if gamma_k.ndim else gamma_k
+        return coeffs
+
+    def _at_point(self, H0, dH):
+        # a copy of the dynamics with another free Hamiltonian and its derivatives, 
+        # which shares the superoperators of the decay and the controls
+        dynamics = copy.copy(self)
+        H0 = _unstack(np.asarray(H0, dtype=np.complex128))
+        dynamics.freeHamiltonian = H0
+        dynamics.Hamiltonian_derivative = list(np.asarray(dH, dtype=np.complex128))
+        dynamics._propagators = {}
+        dynamics._superoperators = (
+            _liouville_commu(H0) if type(H0) == np.ndarray else None,
+            self._liouvillians()[1],
+            np.array([_liouville_commu(dH_i) for dH_i in dynamics.Hamiltonian_derivative]),
+        )
+        return dynamics
+
+    def _output_index(self, output):
+        # indices of the returned time points and whether only the final one is returned
+        num = len(self.tspan)
+        if type(output) == str:
+            if output == "all":
+                return np.arange(num), False
+            elif output == "final":
+                return np.array([num - 1]), True
+            raise ValueError(
+                "{!r} is not a valid value for output, supported values are 'all', 'final', an integer and a list of times.".format(output)
+            )
+        if isinstance(output, (int, np.integer)):
+            if output < 1:
+                raise ValueError("Please make sure the stride of the output is a positive integer!")
+            return np.arange(0, num, output), False
+        times = np.asarray(output, dtype=np.float64)
+        dt = self.tspan[1] - self.tspan[0]
+        return np.clip(np.rint((times - self.tspan[0]) / dt), 0, num - 1).astype(int), False
+
+    def _evolve_numpy(self, method, index, final, stacked):
+        dim = len(self.rho0)
+        propagators, steps = self._step_propagators(method)
+        para_num = len(self.Hamiltonian_derivative)
+
+        # only the requested time points are kept
+        keep = {j: None for j in index}
+        rho_t = self.rho0.reshape(-1)
+        drho_t = np.zeros((para_num, dim * dim), dtype=np.complex128)
+        if 0 in keep:
+            keep[0] = (rho_t, drho_t)
+        for j, i in enumerate(steps, start=1):
+            E, dE = propagators[i]
+            if method == "expm":
+                # dx rho_j = dt (dx L) rho_j + e^{dt L} dx rho_{j-1}
+                rho_t = E @ rho_t
+                drho_t = dE @ rho_t + drho_t @ E.T
+            else:
+                drho_t = dE @ rho_t + drho_t @ E.T
+                rho_t = E @ rho_t
+            if j in keep:
+                keep[j] = (rho_t, drho_t)
+
+        return _keep_output(keep, index, dim, para_num, final, stacked)
+
+    def _evolve_sparse(self, method, index, final, stacked):
+        dim = len(self.rho0)
+        LH, L_ops, dL = self._liouvillians()
+        para_num = len(dL)
+        num = len(self.tspan) - 1
+        dt = self.tspan[1] - self.tspan[0]
+        coeffs = self._step_coefficients()
+
+        # the generators of the distinct time intervals are built once. For "expm" it 
+        # is dt*L, and for "ode" it is the block generator dt*[[L, 0], [dL, L]] acting 
+        # on the stacked rho and drho.
+        generators = {}
+        keep = {j: None for j in index}
+        state = np.zeros(((para_num + 1) * dim * dim, 1), dtype=np.complex128)
+        state[: dim * dim, 0] = self.rho0.reshape(-1)
+        if 0 in keep:
+            keep[0] = (state[: dim * dim, 0], state[dim * dim :, 0].reshape(para_num, -1))
+        for j in range(1, num + 1):
+            key = coeffs[j - 1].tobytes() if LH is not None else j
+            G = generators.get(key)
+            if G is None:
+                L = LH if LH is not None else _sparse_commu(self.freeHamiltonian[j - 1])
+                for c, L_op in zip(coeffs[j - 1], L_ops):
+                    if c != 0.0:
+                        L = L + c * L_op
+                if method == "ode":
+                    blocks = [[None] * (para_num + 1) for _ in range(para_num + 1)]
+                    blocks[0][0] = L
+                    for i, dL_i in enumerate(dL, start=1):
+                        blocks[i][0], blocks[i][i] = dL_i, L
+                    L = bmat(blocks, format="csr")
+                G = (dt * L).tocsr()
+                if LH is not None:
+                    generators[key] = G
+            if method == "expm":
+                # all the vectors share one call of the action of e^{dt L}, and then 
+                # dx rho_j = dt (dx L) rho_j + e^{dt L} dx rho_{j-1}
+                vecs = expm_multiply(G, state.reshape(para_num + 1, -1).T).T
+                rho_t = vecs[0]
+                drho_t = vecs[1:] + dt * np.array([dL_i @ rho_t for dL_i in dL])
+                state = np.concatenate([rho_t[None], drho_t]).reshape(-1, 1)
+            else:
+                state = expm_multiply(G, state)
+            if j in keep:
+                keep[j] = (state[: dim * dim, 0], state[dim * dim :, 0].reshape(para_num, -1))
+        return _keep_output(keep, index, dim, para_num, final, stacked)
+
+
+def Lindblad_batch(tspan, rho0, H0, dH, decay=[], Hc=[], ctrl=[], x=None, method="expm", n_jobs=1):
+    r"""
+    Calculation of the final density matrices and their derivatives on the unknown 
+    parameters for the Lindblad dynamics on all the points of a parameter grid in one 
+    call. The decay and the controls are shared among the grid points, and only the free 
+    Hamiltonian and its derivatives depend on the point. The dynamics is calculated with 
+    NumPy and SciPy, and the superoperators of the decay and the controls are built once 
+    for all the grid points. The results are stacked in the 
+    order of the grid points of a ParameterGrid, so that they can be passed to BCFIM, 
+    BQFIM, QZZB, Bayes and MLE directly.
+
+    Parameters
+    ----------
+    > **tspan:** `array`
+        -- Time length for the evolution.
+
+    > **rho0:** `matrix`
+        -- Initial state (density matrix).
+
+    > **H0:** `array or function`
+        -- Free Hamiltonians on the grid points. It is an array with the shape (N, d, d) 
+        ((N, T, d, d) for the time-dependent Hamiltonians), or a list of N matrices, 
+        where N is the number of the grid points. It can also be a function of the 
+        parameters, which is evaluated on the grid `x`.
+
+    > **dH:** `array or function`
+        -- Derivatives of the free Hamiltonians with respect to the unknown parameters 
+        on the grid points. It is an array with the shape (N, P, d, d), or a function 
+        of the parameters returning the list of the derivatives, which is evaluated 
+        on the grid `x`.
+
+    > **decay:** `list`
+        -- Decay operators and the corresponding decay rates. Its input rule is 
+        decay=[[$\Gamma_1$, $\gamma_1$], [$\Gamma_2$, $\gamma_2$],...].
+
+    > **Hc:** `list`
+        -- Control Hamiltonians.
+
+    > **ctrl:** `list of arrays`
+        -- Control coefficients.
+
+    > **x:** `list`
+        -- The regimes of the parameters. It is only needed when `H0` or `dH` is a 
+        function.
+
+    > **method:** `string`
+        -- The method for solving the Lindblad dynamics. Options are:  
+        "expm" (default) -- Matrix exponential.  
+        "ode" -- Solving the differential equations directly.
+
+    > **n_jobs:** `int`
+        -- The number of threads among which the grid points are shared. -1 means using 
+        all the processors.
+
+    Returns
+    ----------
+    **rho, drho:** `tuple`
+        -- The final density matrices with the shape (N, d, d) and their derivatives 
+        with the shape (N, P, d, d).
+    """
+
+    if method not in ("expm", "ode"):
+        raise ValueError(
+            "{!r} is not a valid value for method, supported values are 'expm' and 'ode'.".format(method)
+        )
+    if callable(H0) or callable(dH):
+        if x is None:
+            raise ValueError("The regimes of the parameters (x) are needed to evaluate the Hamiltonian on the grid.")
+        x_list = list(product(*x))
+        if callable(H0):
+            H0 = [H0(*x_i) for x_i in x_list]
+        if callable(dH):
+            dH = [dH(*x_i) for x_i in x_list]
+    H0 = np.asarray(H0, dtype=np.complex128)
+    dH = np.asarray(dH, dtype=np.complex128)
+    if len(H0) != len(dH):
+        raise ValueError(
+            "The numbers of the free Hamiltonians ({}) and their derivatives ({}) do not match.".format(len(H0), len(dH))
+        )
+
+    # the decay and the controls are normalized once for all the grid points
+    dynamics = Lindblad(tspan, rho0, H0[0], dH[0], decay=decay, Hc=Hc, ctrl=ctrl, backend="numpy")
+    index, final = dynamics._output_index("final")
+    dynamics._liouvillians()
+
+    def evolve(H0_shard, dH_shard):
+        res = [dynamics._at_point(H0_i, dH_i)._evolve_numpy(method, index, final, True) 
+               for H0_i, dH_i in zip(H0_shard, dH_shard)]
+        return np.array([r[0] for r in res]), np.array([r[1] for r in res])
+    return _sharded(evolve, n_jobs, H0, dH)
+
+
+def _keep_output(keep, index, dim, para_num, final, stacked):
+    # the kept vectorized density matrices and their derivatives at the requested time 
+    # points as matrices
+    rho = np.array([keep[j][0] for j in index]).reshape(-1, dim, dim)
+    drho = np.array([keep[j][1] for j in index]).reshape(-1, para_num, dim, dim)
+    if not stacked:
+        rho, drho = list(rho), [list(drho_j) for drho_j in drho]
+    if final:
+        return rho[0], drho[0]
+    return rho, drho
+
+
+def _julia_output(rho, drho, index, final, stacked, d2rho=None):
+    # convert the density matrices and their derivatives (and second derivatives) at the 
+    # requested time points of the results from Julia. The matrices at the other time 
+    # points are never converted.
+    res = [[np.array(rho[int(j)]) for j in index]]
+    res.append([[np.array(drho_ij) for drho_ij in drho[int(j)]] for j in index])
+    if d2rho is not None:
+        res.append([[np.array(d2rho_ij) for d2rho_ij in d2rho[int(j)]] for j in index])
+    if stacked:
+        res = [np.array(x) for x in res]
+    if final:
+        res = [x[0] for x in res]
+    return tuple(res)
+
+
+def _liouville_commu(H):
+    # superoperator of -i[H, rho] on the row-major vectorized rho
+    identity = np.identity(len(H))
+    return -1.0j * (np.kron(H, identity) - np.kron(identity, H.T))
+
+
+def _liouville_dissip(Gamma):
+    # superoperator of Gamma rho Gamma^dagger - {Gamma^dagger Gamma, rho}/2 on the 
+    # row-major vectorized rho
+    identity = np.identity(len(Gamma))
+    GG = Gamma.conj().T @ Gamma
+    return np.kron(Gamma, Gamma.conj()) - 0.5 * (np.kron(GG, identity) + np.kron(identity, GG.T))
+
+
+def _sparse_commu(H):
+    # sparse superoperator of -i[H, rho] on the row-major vectorized rho
+    identity = sparse_identity(H.shape[0], dtype=np.complex128, format="csr")
+    return (-1.0j * (sparse_kron(H, identity) - sparse_kron(identity, H.T))).tocsr()
+
+
+def _sparse_dissip(Gamma):
+    # sparse superoperator of Gamma rho Gamma^dagger - {Gamma^dagger Gamma, rho}/2 on 
+    # the row-major vectorized rho
+    identity = sparse_identity(Gamma.shape[0], dtype=np.complex128, format="csr")
+    GG = Gamma.conj().T @ Gamma
+    return (sparse_kron(Gamma, Gamma.conj()) - 0.5 * (sparse_kron(GG, identity) + sparse_kron(identity, GG.T))).tocsr()
@@ -1,5 +1,6 @@
 from quanestimation.Parameterization.GeneralDynamics import (
     Lindblad,
+    Lindblad_batch,
 )
 from quanestimation.Parameterization.NonDynamics import (
     Kraus,
@@ -7,6 +8,7 @@ from quanestimation.Parameterization.NonDynamics import (
 
 __all__ = [
     "Lindblad",
+    "Lindblad_batch",
     "secondorder_derivative",
     "Kraus", 
 ]
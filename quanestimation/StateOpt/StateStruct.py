@@ -1,12 +1,11 @@
 import numpy as np
 import h5py
-from scipy.interpolate import interp1d
 import os
 import math
 import warnings
 from quanestimation import QJL
 import quanestimation.StateOpt as stateoptimize
-from quanestimation.Common.Common import SIC
+from quanestimation.Common.Common import SIC, _unstack
 
 
 class StateSystem:
@@ -79,15 +78,16 @@ class StateSystem:
 
         > **H0:** `matrix or list`
             -- Free Hamiltonian. It is a matrix when the free Hamiltonian is time-
-            independent and a list of length equal to `tspan` when it is time-dependent.
+            independent and a list of length equal to `tspan` (or an array with the shape 
+            (T, d, d)) when it is time-dependent.
 
         > **dH:** `list`
             -- Derivatives of the free Hamiltonian on the unknown parameters to be 
             estimated. For example, dH[0] is the derivative vector on the first 
-            parameter.
+            parameter. It can also be an array with the shape (P, d, d).
 
         > **Hc:** `list`
-            -- Control Hamiltonians.
+            -- Control Hamiltonians. It can also be an array with the shape (C, d, d).
 
         > **ctrl:** `list of arrays`
             -- Control coefficients.
@@ -103,7 +103,10 @@ class StateSystem:
             "expm" (default) -- Matrix exponential.  
             "ode" -- Solving the differential equations directly.
         """
+        from scipy.interpolate import interp1d
 
+        H0, dH, Hc = _unstack(H0), _unstack(dH), _unstack(Hc)
+        ctrl = _unstack(ctrl, ndim=2, dtype=np.float64)
         self.tspan = tspan
 
         if dyn_method == "expm":
@@ -113,10 +116,10 @@ class StateSystem:
 
         if Hc == [] or ctrl == []:
             if type(H0) == np.ndarray:
-                self.freeHamiltonian = np.array(H0, dtype=np.complex128)
+                self.freeHamiltonian = np.asarray(H0, dtype=np.complex128)
                 self.dim = len(self.freeHamiltonian)
             else:
-                self.freeHamiltonian = [np.array(x, dtype=np.complex128) for x in H0]
+                self.freeHamiltonian = [np.asarray(x, dtype=np.complex128) for x in H0]
                 self.dim = len(self.freeHamiltonian[0])
         else:
             ctrl_num = len(ctrl)
@@ -141,13 +144,13 @@ class StateSystem:
 
             if len(ctrl[0]) == 1:
                 if type(H0) == np.ndarray:
-                    H0 = np.array(H0, dtype=np.complex128)
-                    Hc = [np.array(x, dtype=np.complex128) for x in Hc]
+                    H0 = np.asarray(H0, dtype=np.complex128)
+                    Hc = [np.asarray(x, dtype=np.complex128) for x in Hc]
                     Htot = H0 + sum([Hc[i] * ctrl[i][0] for i in range(ctrl_num)])
                     self.freeHamiltonian = np.array(Htot, dtype=np.complex128)
                     self.dim = len(self.freeHamiltonian)
                 else:
-                    H0 = [np.array(x, dtype=np.complex128) for x in H0]
+                    H0 = [np.asarray(x, dtype=np.complex128) for x in H0]
                     Htot = []
                     for i in range(len(H0)):
                         Htot.append(
@@ -173,8 +176,8 @@ class StateSystem:
                 else: pass
 
                 if type(H0) == np.ndarray:
-                    H0 = np.array(H0, dtype=np.complex128)
-                    Hc = [np.array(x, dtype=np.complex128) for x in Hc]
+                    H0 = np.asarray(H0, dtype=np.complex128)
+                    Hc = [np.asarray(x, dtype=np.complex128) for x in Hc]
                     ctrl = [np.array(ctrl[i]).repeat(number) for i in range(len(Hc))]
                     Htot = []
                     for i in range(len(ctrl[0])):
@@ -185,8 +188,8 @@ class StateSystem:
                     ]
                     self.dim = len(self.freeHamiltonian)
                 else:
-                    H0 = [np.array(x, dtype=np.complex128) for x in H0]
-                    Hc = [np.array(x, dtype=np.complex128) for x in Hc]
+                    H0 = [np.asarray(x, dtype=np.complex128) for x in H0]
+                    Hc = [np.asarray(x, dtype=np.complex128) for x in Hc]
                     ctrl = [np.array(ctrl[i]).repeat(number) for i in range(len(Hc))]
                     Htot = []
                     for i in range(len(ctrl[0])):
@@ -215,7 +218,7 @@ class StateSystem:
 
         if dH == []:
             dH = [np.zeros((len(self.psi0), len(self.psi0)))]
-        self.Hamiltonian_derivative = [np.array(x, dtype=np.complex128) for x in dH]
+        self.Hamiltonian_derivative = [np.asarray(x, dtype=np.complex128) for x in dH]
 
         if decay == []:
             decay_opt = [np.zeros((len(self.psi0), len(self.psi0)))]
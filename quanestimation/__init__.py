@@ -1,25 +1,31 @@
 """Top-level package for quanestimation."""
 
-from .Common._julia_project import project
-from .Common.Common import load_julia
+from .Common.Common import load_julia, _JuliaProxy
 
-project.ensure_init()
-QJL = load_julia()
+# Julia is booted on the first use of a Julia-backed feature
+QJL = _JuliaProxy()
 
 from quanestimation.AsymptoticBound.CramerRao import (
     CFIM,
+    CFIM_batch,
     QFIM,
+    QFIM_batch,
+    QFIM_pure,
     QFIM_Bloch,
+    QFIM_Bloch_batch,
     QFIM_Gauss,
+    QFIM_Gauss_batch,
     QFIM_Kraus,
     FIM,
+    FIM_batch,
     FI_Expt,
+    StreamingFI,
     LLD,
     RLD,
     SLD,
 )
 from quanestimation.AsymptoticBound.AnalogCramerRao import (
-    HCRB, NHB, 
+    HCRB, HCRBSolver, NHB, NHBSolver, 
 )
 from quanestimation.BayesianBound.BayesCramerRao import (
     BCFIM,
@@ -35,18 +41,28 @@ from quanestimation.BayesianBound.ZivZakai import (
 )
 from quanestimation.BayesianBound.BayesEstimation import (
     Bayes,
+    Bayes_batch,
     MLE,
     BCB,
-    BayesCost
+    BayesCost,
+    StreamingEstimator,
+)
+from quanestimation.BayesianBound.ParameterGrid import (
+    ParameterGrid,
 )
 
 from quanestimation.Common.Common import (
     load_julia,
     mat_vec_convert,
     suN_generator,
+    suN_basis,
+    suN_structure,
     gramschmidt,
     basis,
     SIC,
+    SIC_vectors,
+    SIC_prob,
+    VectorPOVM,
     annihilation,
     BayesInput,
 )
@@ -85,6 +101,7 @@ from quanestimation.ControlOpt.PSO_Copt import (
 
 from quanestimation.Parameterization.GeneralDynamics import (
     Lindblad,
+    Lindblad_batch,
 )
 from quanestimation.Parameterization.NonDynamics import (
     Kraus,
@@ -144,17 +161,26 @@ __all__ = [
     "MeasurementOpt",
     "ComprehensiveOpt",
     "CFIM",
+    "CFIM_batch",
     "QFIM",
+    "QFIM_batch",
+    "QFIM_pure",
     "QFIM_Bloch",
+    "QFIM_Bloch_batch",
     "LLD",
     "RLD",
     "SLD",
     "HCRB",
+    "HCRBSolver",
     "NHB",
+    "NHBSolver",
     "QFIM_Gauss",
+    "QFIM_Gauss_batch",
     "QFIM_Kraus",
     "FIM",
+    "FIM_batch",
     "FI_Expt",
+    "StreamingFI",
     "BCFIM",
     "BQFIM",
     "BCRB",
@@ -164,10 +190,14 @@ __all__ = [
     "VTB",
     "QZZB",
     "Bayes",
+    "Bayes_batch",
     "MLE",
     "BCB",
     "BayesCost",
+    "StreamingEstimator",
+    "ParameterGrid",
     "Lindblad",
+    "Lindblad_batch",
     "Kraus",
     "SpinSqueezing",
     "TargetTime",
@@ -186,9 +216,14 @@ __all__ = [
     "RI_Sopt",
     "mat_vec_convert",
     "suN_generator",
+    "suN_basis",
+    "suN_structure",
     "gramschmidt",
     "basis",
     "SIC",
+    "SIC_vectors",
+    "SIC_prob",
+    "VectorPOVM",
     "annihilation",
     "BayesInput",
     "csv2npy_controls",
@@ -1,2 +1,19 @@
 import os
-os.environ["QuanEstimation_COMPILE"] = "n" # Disable Julia project compilation for testing
\ No newline at end of file
+import importlib.util
+import pytest
+os.environ["QuanEstimation_COMPILE"] = "n" # Disable Julia project compilation for testing
+
+@pytest.fixture
+def julia():
+    """
+    QuanEstimation.jl. The tests using it are skipped when Julia is not available.
+    """
+    for module in ["juliacall", "julia_project"]:
+        if importlib.util.find_spec(module) is None:
+            pytest.skip("{} is not installed".format(module))
+    from quanestimation import QJL
+    try:
+        QJL.expm_py
+    except Exception as e:
+        pytest.skip("Julia is not available: {}".format(e))
+    return QJL
@@ -1,6 +1,6 @@
 import pytest
 import numpy as np
-from quanestimation.AsymptoticBound.AnalogCramerRao import HCRB, NHB 
+from quanestimation.AsymptoticBound.AnalogCramerRao import HCRB, HCRBSolver, NHB, NHBSolver 
 
 def test_HCRB_NHB():
     """
@@ -29,6 +29,52 @@ def test_HCRB_NHB():
     assert np.allclose(result_HCRB, expected_HCRB) == 1
     assert np.allclose(result_NHB, expected_NHB) == 1
 
+def test_HCRBSolver():
+    """
+    Test the reusable solver of the Holevo Cramer-Rao bound (HCRB).
+    This test checks that the solver compiled once gives the HCRB for the qubit states 
+    on a grid of the polar angle.
+    """
+    W = np.array([[1., 0], [0, 0.5]])
+    solver = HCRBSolver(2, 2, W)
+    for theta in [np.pi/6, np.pi/3, np.pi/2]:
+        psi = np.array([[np.cos(theta/2)], [np.sin(theta/2)]])
+        rho = psi @ psi.conj().T
+        drho_theta = np.array([[-np.sin(theta)/2, np.cos(theta)/2], [np.cos(theta)/2, np.sin(theta)/2]])
+        drho_phi = np.array([[0, -1j*np.sin(theta)/2], [1j*np.sin(theta)/2, 0]])
+        drho = [drho_theta, drho_phi]
+        expected = 1. + 0.5/np.sin(theta)**2 + 2*np.sqrt(0.5/np.sin(theta)**2)
+        assert np.allclose(solver.solve(rho, drho), HCRB(rho, drho, W), rtol=1e-3) == 1
+        assert np.allclose(solver.solve(rho, drho), expected, rtol=1e-3) == 1
+
+    with pytest.raises(TypeError):
+        solver.solve(rho, drho_theta)
+
+def test_NHBSolver():
+    """
+    Test the reusable solver of the Nagaoka-Hayashi bound (NHB).
+    This test checks that the solver compiled once gives the NHB for a set of qubit 
+    states, both in this process and in a pool of processes.
+    """
+    W = np.array([[1., 0], [0, 0.5]])
+    rhos, drhos = [], []
+    for theta, eta in [(np.pi/6, 1.), (np.pi/3, 0.8), (np.pi/2, 0.6)]:
+        rho = np.array([[1. + eta*np.cos(theta), eta*np.sin(theta)], [eta*np.sin(theta), 1. - eta*np.cos(theta)]])/2
+        drho_theta = eta*np.array([[-np.sin(theta), np.cos(theta)], [np.cos(theta), np.sin(theta)]])/2
+        drho_phi = eta*np.array([[0, -1j*np.sin(theta)], [1j*np.sin(theta), 0]])/2
+        rhos.append(rho)
+        drhos.append([drho_theta, drho_phi])
+
+    solver = NHBSolver(2, 2, W)
+    expected = [NHB(rho, drho, W) for rho, drho in zip(rhos, drhos)]
+    assert np.allclose(solver.solve_many(rhos, drhos), expected, rtol=1e-3) == 1
+    assert np.allclose(solver.solve_many(rhos, drhos, n_jobs=2), expected, rtol=1e-3) == 1
+    assert np.allclose(solver.solve_many(rhos, drhos, n_jobs=np.int64(2)), expected, rtol=1e-3) == 1
+    assert np.allclose(expected[0], 1. + 0.5/np.sin(np.pi/6)**2 + 2*np.sqrt(0.5/np.sin(np.pi/6)**2), rtol=1e-3) == 1
+
+    with pytest.raises(ValueError):
+        solver.solve_many(rhos, drhos, n_jobs=0)
+
 def test_HCRB_NHB_invalid_input():
     """
     Test the Holevo Cramer-Rao bound (HCRB) and Nagaoka-Hayashi bound (NHB) with invalid input.
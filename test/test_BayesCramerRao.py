@@ -1,4 +1,68 @@
 import numpy as np
+from quanestimation.BayesianBound.BayesCramerRao import BCRB, BQCRB, VTB, QVTB, OBB
+from quanestimation.BayesianBound.ZivZakai import QZZB
 
 def test_BayesCramerRao():
-    None 
\ No newline at end of file
+    """
+    Test the Bayesian bounds for a single-parameter qubit with the Bloch vector
+    eta(x)*(sin(x), 0, cos(x)) and a Gaussian prior. This test checks BCRB and BQCRB
+    for all the types, VTB, QVTB, OBB and QZZB against the reference values of the
+    implementation before the bounds were computed on a ParameterGrid.
+    """
+    x = [np.linspace(-0.5, 1.5, 41)]
+    sx = np.array([[0., 1.], [1., 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    eta = lambda t: 0.9 - 0.2*t**2
+    deta = lambda t: -0.4*t
+    r = lambda t: np.sin(t)*sx + np.cos(t)*sz
+    dr = lambda t: np.cos(t)*sx - np.sin(t)*sz
+    rho = [0.5*(np.identity(2) + eta(t)*r(t)) for t in x[0]]
+    drho = [[0.5*(deta(t)*r(t) + eta(t)*dr(t))] for t in x[0]]
+    d2rho = [[0.5*(-0.4*r(t) + 2*deta(t)*dr(t) - eta(t)*r(t))] for t in x[0]]
+    mu, sigma = 0.5, 0.4
+    p = np.exp(-(x[0]-mu)**2/(2*sigma**2))/(np.sqrt(2*np.pi)*sigma)
+    dp = [-(t-mu)/sigma**2*p_t for t, p_t in zip(x[0], p)]
+    M = [np.array([[1., 0.], [0., 0.]]), np.array([[0., 0.], [0., 1.]])]
+
+    BCRB_ref = {1: 3.4849922456, 2: 3.4156278114, 3: 0.8248168049}
+    BQCRB_ref = {1: 1.1846553904, 2: 1.182299214, 3: 0.4105734575}
+    for btype in [1, 2, 3]:
+        assert np.allclose(BCRB(x, p, dp, rho, drho, btype=btype), BCRB_ref[btype]) == 1
+        assert np.allclose(BQCRB(x, p, dp, rho, drho, btype=btype), BQCRB_ref[btype]) == 1
+    # biased estimators
+    b, db = [0.1*x[0]], [0.1*np.ones(41)]
+    assert np.allclose(BCRB(x, p, dp, rho, drho, b=b, db=db, btype=1), 4.2207494716) == 1
+    assert np.allclose(BQCRB(x, p, dp, rho, drho, b=b, db=db, btype=2), 1.4344909033) == 1
+
+    assert np.allclose(VTB(x, p, dp, rho, drho, M=M), 0.1612159222) == 1
+    assert np.allclose(QVTB(x, p, dp, rho, drho), 0.1550494759) == 1
+    assert np.allclose(OBB(x, p, dp, rho, drho, d2rho), 0.1281322226) == 1
+    assert np.allclose(QZZB(x, p, rho), 0.1008775912) == 1
+
+def test_BayesCramerRao_multipara():
+    """
+    Test the Bayesian bounds for a two-parameter qubit with the Bloch vector
+    0.8*(sin(a)cos(c), sin(a)sin(c), cos(a)). This test checks BCRB, BQCRB, VTB and
+    QVTB against the reference values of the implementation before the bounds were
+    computed on a ParameterGrid.
+    """
+    x = [np.linspace(0.2, 1.2, 6), np.linspace(0., 1., 5)]
+    sx = np.array([[0., 1.], [1., 0.]])
+    sy = np.array([[0., -1.j], [1.j, 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    p = np.array([[np.exp(-(a-0.7)**2-(c-0.5)**2) for c in x[1]] for a in x[0]])
+    dp = [[[-2*(a-0.7)*p[i, j], -2*(c-0.5)*p[i, j]] for j, c in enumerate(x[1])] for i, a in enumerate(x[0])]
+    rho = [[0.5*(np.identity(2) + 0.8*(np.sin(a)*np.cos(c)*sx + np.sin(a)*np.sin(c)*sy + np.cos(a)*sz))
+            for c in x[1]] for a in x[0]]
+    drho = [[[0.4*(np.cos(a)*np.cos(c)*sx + np.cos(a)*np.sin(c)*sy - np.sin(a)*sz),
+              0.4*(-np.sin(a)*np.sin(c)*sx + np.sin(a)*np.cos(c)*sy)] for c in x[1]] for a in x[0]]
+
+    BCRB_ref = {1: [[3.8736877568, -0.7321082159], [-0.7321082159, 21.867266533]],
+                2: [[3.5514135551, -0.0928611275], [-0.0928611275, 9.5095135648]]}
+    BQCRB_ref = {1: [[1.3305371759, 0.], [0., 5.9840603258]],
+                 2: [[1.3305371759, 0.], [0., 3.1143060641]]}
+    for btype in [1, 2]:
+        assert np.allclose(BCRB(x, p, dp, rho, drho, btype=btype), BCRB_ref[btype]) == 1
+        assert np.allclose(BQCRB(x, p, dp, rho, drho, btype=btype), BQCRB_ref[btype]) == 1
+    assert np.allclose(VTB(x, p, dp, rho, drho), [[2.1381169488, -0.0125214917], [-0.0125214917, 2.9365417467]]) == 1
+    assert np.allclose(QVTB(x, p, dp, rho, drho), [[1.2369057358, 0.], [0., 2.0116262363]]) == 1
@@ -0,0 +1,151 @@
+import pytest
+import numpy as np
+from scipy.integrate import simpson
+from quanestimation.BayesianBound.BayesEstimation import Bayes, Bayes_batch, MLE, StreamingEstimator, BayesCost, BCB
+
+def test_Bayes_MLE(tmp_path, monkeypatch):
+    """
+    Test the Bayesian estimation and the maximum likelihood estimation for a qubit
+    measured in the computational basis. This test checks that long records, for
+    which the likelihood function underflows, still give the right estimates.
+    """
+    monkeypatch.chdir(tmp_path)
+    x = [np.linspace(0., np.pi/2, 101)]
+    p = np.ones(101)/(np.pi/2)
+    rho = [np.array([[np.cos(t)**2, np.cos(t)*np.sin(t)], [np.cos(t)*np.sin(t), np.sin(t)**2]]) for t in x[0]]
+    M = [np.array([[1., 0.], [0., 0.]]), np.array([[0., 0.], [0., 1.]])]
+    # 2000 results with the frequency sin(x)^2 of the result 1 for x = pi/4
+    y = np.array([0, 1]*1000)
+
+    L, x_MLE = MLE(x, rho, y, M=M)
+    pout, x_MAP = Bayes(x, p, rho, y, M=M, estimator="MAP")
+    pout_mean, x_mean = Bayes(x, p, rho, y, M=M, estimator="mean", savefile=True)
+
+    assert np.allclose(x_MLE, np.pi/4) == 1
+    assert np.allclose(x_MAP, np.pi/4) == 1
+    assert np.allclose(x_mean, np.pi/4, atol=1e-3) == 1
+    assert np.allclose(simpson(pout, x=x[0]), 1.) == 1
+    assert np.load("pout.npy").shape == (2000, 101)
+    assert np.load("xout.npy").shape == (2000,)
+
+    # the final estimates only depend on the numbers of each result
+    L_counts, x_MLE_counts = MLE(x, rho, y, M=M, trace=False)
+    pout_counts, x_mean_counts = Bayes(x, p, rho, y, M=M, estimator="mean", trace=False)
+    assert np.allclose(L_counts, L) == 1
+    assert np.allclose(x_MLE_counts, x_MLE) == 1
+    assert np.allclose(pout_counts, pout_mean) == 1
+    assert np.allclose(x_mean_counts, x_mean) == 1
+
+    with pytest.raises(ValueError):
+        Bayes(x, p, rho, y, M=M, estimator="invalid")
+
+def test_MLE_long_record(tmp_path, monkeypatch):
+    """
+    Test the maximum likelihood estimation for a long record of 100000 results. This 
+    test checks that the returned and saved likelihood functions do not underflow.
+    """
+    monkeypatch.chdir(tmp_path)
+    x = [np.linspace(0., np.pi/2, 101)]
+    rho = [np.array([[np.cos(t)**2, np.cos(t)*np.sin(t)], [np.cos(t)*np.sin(t), np.sin(t)**2]]) for t in x[0]]
+    M = [np.array([[1., 0.], [0., 0.]]), np.array([[0., 0.], [0., 1.]])]
+    y = np.array([0, 1]*50000)
+
+    for trace in [True, False]:
+        L, x_MLE = MLE(x, rho, y, M=M, trace=trace)
+        assert np.allclose(x_MLE, np.pi/4) == 1
+        assert np.allclose(L.max(), 1.) == 1
+        assert np.allclose(x[0][np.argmax(L)], np.pi/4) == 1
+        assert np.allclose(np.load("Lout.npy"), L) == 1
+
+    L, x_MLE = MLE(x, rho, y[:1000], M=M, savefile=True)
+    assert np.allclose(np.load("Lout.npy").max(axis=1), 1.) == 1
+
+def test_Bayes_batch(tmp_path, monkeypatch):
+    """
+    Test the Bayesian estimation for many independent records of a qubit measured in 
+    the computational basis. This test checks that the batched estimation agrees with 
+    the estimation of every single record.
+    """
+    monkeypatch.chdir(tmp_path)
+    x = [np.linspace(0., np.pi/2, 101)]
+    p = np.exp(-(x[0]-np.pi/4)**2)
+    rho = [np.array([[np.cos(t)**2, np.cos(t)*np.sin(t)], [np.cos(t)*np.sin(t), np.sin(t)**2]]) for t in x[0]]
+    M = [np.array([[1., 0.], [0., 0.]]), np.array([[0., 0.], [0., 1.]])]
+    y = np.array([[0, 1, 1, 0]*10, [0, 0, 0, 1]*10, [1, 1, 1, 0]*10])
+
+    pout, xout = Bayes_batch(x, p, rho, y, M=M)
+    pout_final, xout_final = Bayes_batch(x, p, rho, y, M=M, trace=False)
+    assert pout.shape == (3, 101)
+    assert xout.shape == (3, 40)
+    for i in range(3):
+        pout_i, x_i = Bayes(x, p, rho, y[i], M=M, savefile=True)
+        assert np.allclose(pout[i], pout_i) == 1
+        assert np.allclose(xout[i], np.load("xout.npy")) == 1
+    assert np.allclose(pout_final, pout) == 1
+    assert np.allclose(xout_final, xout[:, -1]) == 1
+
+def test_StreamingEstimator(tmp_path, monkeypatch):
+    """
+    Test the online Bayesian estimation for a qubit measured in the computational basis.
+    This test checks that feeding the results in chunks reproduces the Bayesian estimation 
+    with the whole record, and that the state can be restored from a checkpoint.
+    """
+    monkeypatch.chdir(tmp_path)
+    x = [np.linspace(0., np.pi/2, 101)]
+    p = np.exp(-(x[0]-np.pi/4)**2)
+    rho = [np.array([[np.cos(t)**2, np.cos(t)*np.sin(t)], [np.cos(t)*np.sin(t), np.sin(t)**2]]) for t in x[0]]
+    M = [np.array([[1., 0.], [0., 0.]]), np.array([[0., 0.], [0., 1.]])]
+    y = np.array([0, 1, 1, 0, 1, 0, 0, 1]*25)
+
+    estimator = StreamingEstimator(x, p, rho, M=M)
+    for y_chunk in np.array_split(y, 7):
+        estimator.update(y_chunk)
+    pout, x_mean = Bayes(x, p, rho, y, M=M, estimator="mean")
+
+    assert estimator.count == 200
+    assert np.allclose(estimator.posterior, pout) == 1
+    assert np.allclose(estimator.mean(), x_mean) == 1
+    assert np.allclose(estimator.MAP(), np.pi/4) == 1
+    assert 0. < estimator.variance() < 1e-2
+
+    estimator.checkpoint("checkpoint")
+    restored = StreamingEstimator(x, p, rho, M=M).resume("checkpoint")
+    assert restored.count == 200
+    assert np.allclose(restored.posterior, pout) == 1
+    with pytest.raises(ValueError):
+        StreamingEstimator([x[0][:51]], p[:51], rho[:51], M=M).resume("checkpoint")
+
+    # single results and empty chunks
+    single = StreamingEstimator(x, p, rho, M=M)
+    for y_i in y:
+        single.update(y_i)
+    single.update([])
+    assert single.count == 200
+    assert np.allclose(single.posterior, pout) == 1
+
+    # a result impossible at the boundary of the grid rules it out
+    assert single.update(0).posterior[-1] == 0.
+    with pytest.raises(ValueError):
+        Bayes(x, p, rho, [], M=M)
+
+def test_BayesCost_BCB():
+    """
+    Test the average Bayesian cost and the Bayesian cost bound for a two-parameter
+    qutrit model. This test checks that the bound is not larger than the cost of a
+    given measurement and estimator, also for a weight matrix given as an array.
+    """
+    x = [np.linspace(0., 0.5, 11), np.linspace(0., 1., 21)]
+    p = np.ones((11, 21))/0.5
+    rho = [[np.diag([np.cos(a)**2*np.cos(b)**2, np.cos(a)**2*np.sin(b)**2, np.sin(a)**2]) 
+            for b in x[1]] for a in x[0]]
+    M = [np.diag([1., 0., 0.]), np.diag([0., 1., 0.]), np.diag([0., 0., 1.])]
+    xest = [np.array([0.2, 0.4]), np.array([0.2, 0.6]), np.array([0.4, 0.5])]
+    W = np.array([[2., 0.5], [0.5, 1.]])
+
+    for W_i in [[], W]:
+        cost = BayesCost(x, p, xest, rho, M, W=W_i)
+        bound = BCB(x, p, rho, W=W_i)
+        assert 0. < bound <= cost
+    # for a state independent of the parameter, the bound is the variance of the prior
+    assert np.allclose(BCB([x[0]], np.ones(11)/0.5, [np.diag([1., 0., 0.])]*11), 
+                       simpson((x[0]-0.25)**2/0.5, x=x[0])) == 1
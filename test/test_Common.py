@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
-from quanestimation.Common.Common import basis, gramschmidt, suN_generator, BayesInput
-from quanestimation.Common.Common import mat_vec_convert, SIC, annihilation, brgd
+from quanestimation.Common.Common import basis, gramschmidt, suN_generator, suN_basis, suN_structure, BayesInput
+from quanestimation.Common.Common import mat_vec_convert, SIC, SIC_vectors, SIC_prob, VectorPOVM, annihilation, brgd
 
 
 def test_basis():
@@ -71,6 +71,29 @@ def test_suN_generator():
     assert all(np.allclose(su3[i], expect[i]) for i in range(8)) == 1
     
 
+def test_suN_structure():
+    """
+    Test the SU(N) generators as an array and their structure constants.
+    This test checks the orthonormality of the generators, and the commutators and 
+    anticommutators of the generators given by the structure constants for N = 4.
+    """
+    n, K = 4, 15
+    Lambda = suN_basis(n)
+    assert Lambda.shape == (K, n, n)
+    assert np.allclose(Lambda, suN_generator(n)) == 1
+    assert np.allclose(np.einsum("aij,bji->ab", Lambda, Lambda), 2*np.identity(K)) == 1
+    assert np.allclose(suN_basis(n, sparse=True).toarray(), Lambda.reshape(K, n**2)) == 1
+
+    f, d = suN_structure(n)
+    f, d = f.toarray().reshape(K, K, K), d.toarray().reshape(K, K, K)
+    commu = np.einsum("aij,bjk->abik", Lambda, Lambda) - np.einsum("bij,ajk->abik", Lambda, Lambda)
+    anti_commu = np.einsum("aij,bjk->abik", Lambda, Lambda) + np.einsum("bij,ajk->abik", Lambda, Lambda)
+    assert np.allclose(commu, 2j*np.einsum("abc,cij->abij", f, Lambda)) == 1
+    assert np.allclose(anti_commu, 4/n*np.einsum("ab,ij->abij", np.identity(K), np.identity(n)) 
+                       + 2*np.einsum("abc,cij->abij", d, Lambda)) == 1
+    # f_{123} = 1 for the Pauli matrices
+    assert np.allclose(suN_structure(2)[0].toarray()[1], [0., 0., 1.]) == 1
+
 def test_mat_vec_convert():
     """
     Test the conversion of a matrix to a vector and vice versa.
@@ -103,6 +126,77 @@ def test_SIC():
     with pytest.raises(ValueError):
         SIC(200)
 
+def test_SIC_vectors():
+    """
+    Test the vectors of the SIC-POVM.
+    This test checks that the vectors give the SIC-POVM, and that the overlaps of the 
+    vectors are those of a SIC-POVM for a large dimension.
+    """
+    vectors = SIC_vectors(2)
+    assert vectors.shape == (4, 2)
+    assert all(np.allclose(np.outer(vectors[i], vectors[i].conj())/2, SIC(2)[i]) for i in range(4)) == 1
+
+    d = 61
+    vectors = SIC_vectors(d)
+    overlaps = np.abs(vectors.conj() @ vectors.T)**2
+    assert np.allclose(overlaps, (np.ones((d**2, d**2)) + d*np.identity(d**2))/(d + 1)) == 1
+    assert SIC_vectors(d) is vectors
+    assert vectors.flags.writeable == 0
+
+    with pytest.raises(ValueError):
+        SIC_vectors(1)
+
+def test_SIC_prob():
+    """
+    Test the probabilities of the results of the SIC-POVM.
+    This test checks the probabilities calculated with fast Fourier transforms against 
+    the traces with the SIC-POVM for a stack of random density matrices.
+    """
+    np.random.seed(1)
+    for d in [2, 3, 8]:
+        A = np.random.randn(4, d, d) + 1j*np.random.randn(4, d, d)
+        rho = A @ np.swapaxes(A.conj(), -1, -2)
+        rho = rho/np.trace(rho, axis1=-2, axis2=-1)[:, None, None]
+        expected = [[np.real(np.trace(rho_i @ M_j)) for M_j in SIC(d)] for rho_i in rho]
+        result = SIC_prob(rho)
+        assert result.shape == (4, d**2)
+        assert np.allclose(result, expected) == 1
+        assert np.allclose(np.sum(result, axis=-1), 1.) == 1
+
+def test_VectorPOVM(tmp_path, monkeypatch):
+    """
+    Test the POVM of rank-one elements in the vector form.
+    This test checks the elements and the probabilities against the dense POVM, and that
+    the CFI and the Bayesian estimation with it agree with those with the dense POVM.
+    """
+    from quanestimation import CFIM, Bayes
+
+    monkeypatch.chdir(tmp_path)
+    M = VectorPOVM.SIC(3)
+    assert len(M) == 9
+    assert all(np.allclose(M[i], SIC(3)[i]) for i in range(9)) == 1
+    assert np.allclose(sum(M.dense()), np.identity(3)) == 1
+    assert len(M[2:5]) == 3
+
+    theta = np.linspace(0., np.pi/2, 11)
+    rho = [np.array([[np.cos(t)**2, np.cos(t)*np.sin(t)], [np.cos(t)*np.sin(t), np.sin(t)**2]]) for t in theta]
+    drho = [[np.array([[-np.sin(2*t), np.cos(2*t)], [np.cos(2*t), np.sin(2*t)]])] for t in theta]
+    vectors = np.array([[np.cos(0.3), np.sin(0.3)], [-np.sin(0.3), np.cos(0.3)]])
+    M_vec = VectorPOVM(vectors)
+    M_dense = [np.outer(v, v) for v in vectors]
+    assert np.allclose(M_vec.prob(np.array(rho)), [[np.trace(r @ m) for m in M_dense] for r in rho]) == 1
+    assert np.allclose(CFIM(rho[3], drho[3], M_vec), CFIM(rho[3], drho[3], M_dense)) == 1
+
+    x = [theta]
+    y = np.array([0, 1, 1, 0, 1])
+    pout_vec, xout_vec = Bayes(x, np.ones(11), rho, y, M=M_vec)
+    pout_dense, xout_dense = Bayes(x, np.ones(11), rho, y, M=M_dense)
+    assert np.allclose(pout_vec, pout_dense) == 1
+    assert np.allclose(xout_vec, xout_dense) == 1
+
+    with pytest.raises(ValueError):
+        VectorPOVM(vectors, weights=[1.])
+
 def test_annilation():
     """
     Test the generation of annihilation operator for a 2-dimensional quantum system.
@@ -145,3 +239,44 @@ def test_BayesInput():
     # K = lambda x: [np.array([[1, 0], [0, 0]]), np.array([[0, 1], [1, 0]])]
     # dK = lambda x: [np.array([[1, 0], [0, 0]]), np.array([[0, 1], [1, 0]])]
 
+
+def test_import_without_julia():
+    """
+    Benchmark of the import time of quanestimation without Julia. This test checks 
+    that importing the package and using the NumPy-only functions neither boots 
+    Julia nor imports juliacall or the scipy integration and interpolation modules, 
+    and that a Julia-backed feature fails only when it is used. The import time is 
+    printed and not asserted, since it depends on the machine.
+    """
+    import os
+    import subprocess
+    import sys
+    code = "\n".join([
+        "import sys, time",
+        "t0 = time.perf_counter()",
+        "import quanestimation as qe",
+        "t1 = time.perf_counter()",
+        "assert 'juliacall' not in sys.modules",
+        "assert 'julia_project' not in sys.modules",
+        "assert 'scipy.integrate' not in sys.modules",
+        "assert 'scipy.interpolate' not in sys.modules",
+        "assert 'not loaded' in repr(qe.QJL)",
+        "import numpy as np",
+        "F = qe.QFIM(np.diag([1., 0.]), [np.array([[0., 1.], [1., 0.]])])",
+        "assert np.allclose(F, 4.)",
+        "assert 'juliacall' not in sys.modules",
+        "assert 'not loaded' in repr(qe.QJL)",
+        "sys.modules['juliacall'] = None",
+        "sys.modules['julia_project'] = None",
+        "try:",
+        "    qe.QJL.expm_py",
+        "    raise AssertionError('Julia should not be available')",
+        "except ImportError:",
+        "    pass",
+        "print(t1 - t0)",
+    ])
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, os.environ.get("PYTHONPATH", "")]))
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    assert res.returncode == 0, res.stderr
+    print("import time of quanestimation: {:.3f} s".format(float(res.stdout.split()[-1])))
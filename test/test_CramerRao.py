@@ -1,6 +1,8 @@
 import pytest
-from quanestimation.AsymptoticBound.CramerRao import QFIM, CFIM, QFIM_Kraus, QFIM_Bloch, QFIM_Gauss, LLD, RLD, FIM, FI_Expt, SLD
+from quanestimation.AsymptoticBound.CramerRao import QFIM, CFIM, CFIM_batch, QFIM_batch, QFIM_pure, QFIM_Kraus, QFIM_Bloch, QFIM_Bloch_batch, QFIM_Gauss, QFIM_Gauss_batch, LLD, RLD, FIM, FIM_batch, FI_Expt, StreamingFI, SLD
 import numpy as np
+from scipy.linalg import expm
+from quanestimation.Common.Common import SIC
 
 def test_CramerRao_SLD():
     """
@@ -26,6 +28,86 @@ def test_CramerRao_SLD():
     assert np.allclose(result, np.array([[4., 0.], [0., np.sin(2*theta)**2]])) == 1
     assert np.allclose(resultc, np.array([[4., 0], [0., 0.]])) == 1
 
+def test_CFIM_batch():
+    """
+    Test the Classical Fisher Information Matrix (CFIM) for a stack of density matrices.
+    This test checks the batched CFIM against the analytical result for the measurement 
+    in the computational basis and against the CFIM computed from the probabilities 
+    Tr(rho*M_y) of every single state for the SIC-POVM.
+    """
+    theta = np.linspace(0.1, 1.4, 5)
+    phi = np.pi/4
+    rho = np.array([[[np.cos(t)**2, np.cos(t)*np.sin(t)*np.exp(-1j*phi)],
+                     [np.cos(t)*np.sin(t)*np.exp(1j*phi), np.sin(t)**2]] for t in theta])
+    drho = np.array([[[[-np.sin(2*t), np.cos(2*t)*np.exp(-1j*phi)],
+                       [np.cos(2*t)*np.exp(1j*phi), np.sin(2*t)]],
+                      [[0, -1j*np.cos(t)*np.sin(t)*np.exp(-1j*phi)],
+                       [1j*np.cos(t)*np.sin(t)*np.exp(1j*phi), 0]]] for t in theta])
+    M = [np.array([[1., 0.], [0., 0.]]), np.array([[0., 0.], [0., 1.]])]
+    result = CFIM_batch(rho, drho, M)
+    assert result.shape == (5, 2, 2)
+    # F_theta,theta = (sin2t)^2/(cost)^2 + (sin2t)^2/(sint)^2 = 4, and phi is not measured
+    assert np.allclose(result, [[[4., 0.], [0., 0.]]]*5) == 1
+    # default measurement (SIC-POVM)
+    result_sic = CFIM_batch(rho, drho)
+    M_sic = SIC(2)
+    for i in range(len(theta)):
+        p = np.array([np.trace(rho[i] @ M_y).real for M_y in M_sic])
+        dp = np.array([[np.trace(drho[i][a] @ M_y).real for M_y in M_sic] for a in range(2)])
+        assert np.allclose(result_sic[i], (dp/p) @ dp.T) == 1
+
+    with pytest.raises(ValueError):
+        CFIM_batch(rho[0], drho[0], M)
+
+def test_QFIM_batch():
+    """
+    Test the Quantum Fisher Information Matrix (QFIM) for a stack of density matrices.
+    This test checks that the batched QFIM and logarithmic derivatives agree with those 
+    of every single state.
+    """
+    theta = np.linspace(0.1, 1.4, 5)
+    phi = np.pi/4
+    eta = 0.8
+    rho = np.array([0.5*np.array([[1+eta*np.cos(2*t), eta*np.sin(2*t)*np.exp(-1j*phi)],
+                                  [eta*np.sin(2*t)*np.exp(1j*phi), 1-eta*np.cos(2*t)]]) for t in theta])
+    drho = np.array([[eta*np.array([[-np.sin(2*t), np.cos(2*t)*np.exp(-1j*phi)],
+                                    [np.cos(2*t)*np.exp(1j*phi), np.sin(2*t)]]),
+                      0.5*np.array([[0., -1j*eta*np.sin(2*t)*np.exp(-1j*phi)],
+                                    [1j*eta*np.sin(2*t)*np.exp(1j*phi), 0.]])] for t in theta])
+    for LDtype in ["SLD", "RLD", "LLD"]:
+        result = QFIM_batch(rho, drho, LDtype=LDtype)
+        expected = [QFIM(rho[i], list(drho[i]), LDtype=LDtype) for i in range(len(theta))]
+        assert result.shape == (5, 2, 2)
+        assert np.allclose(result, expected) == 1
+    # logarithmic derivatives of the whole stack
+    L = SLD(rho, drho)
+    assert L.shape == (5, 2, 2, 2)
+    assert np.allclose(L[2], SLD(rho[2], list(drho[2]))) == 1
+
+    with pytest.raises(ValueError):
+        SLD(rho, drho[0])
+
+def test_QFIM_pure():
+    """
+    Test the Quantum Fisher Information Matrix (QFIM) for a pure state.
+    This test checks the calculation of the QFIM from the state vector and its derivatives 
+    and the rank-one path of QFIM.
+    """
+    # parameterized state
+    theta = np.pi/3
+    phi = np.pi/4
+    psi = np.array([np.cos(theta), np.sin(theta)*np.exp(1j*phi)])
+    # derivatives of the state w.r.t. theta, phi
+    dpsi = [np.array([-np.sin(theta), np.cos(theta)*np.exp(1j*phi)]),
+            np.array([0., 1j*np.sin(theta)*np.exp(1j*phi)])]
+    rho = np.outer(psi, psi.conj())
+    drho = [np.outer(dpsi_i, psi.conj()) + np.outer(psi, dpsi_i.conj()) for dpsi_i in dpsi]
+    expected = np.array([[4., 0.], [0., np.sin(2*theta)**2]])
+    # check the result
+    assert np.allclose(QFIM_pure(psi, dpsi), expected) == 1
+    assert np.allclose(QFIM_pure(psi, dpsi[:1]), 4.) == 1
+    assert np.allclose(QFIM(rho, drho), expected) == 1
+
 def test_QFIM_Kraus():
     """
     Test the Quantum Fisher Information Matrix (QFIM) for the Kraus representation.
@@ -65,6 +147,34 @@ def test_QFIM_Bloch():
     # check the result
     assert np.allclose(result, np.array([[4.*eta**2, 0.], [0., eta**2*np.sin(2*theta)**2]])) == 1
 
+def test_QFIM_Bloch_batch():
+    """
+    Test the QFIM in Bloch representation for a stack of qutrit Bloch vectors.
+    This test checks the QFIMs of the Bloch vectors against the QFIMs of the density 
+    matrices they represent.
+    """
+    from quanestimation.Common.Common import suN_generator
+    np.random.seed(2)
+    dim = 3
+    Lambda = np.array(suN_generator(dim))
+    coeff = np.sqrt(dim*(dim - 1)/2)
+    r, dr, rho, drho = [], [], [], []
+    for i in range(4):
+        A = np.random.randn(dim, dim) + 1j*np.random.randn(dim, dim)
+        rho_i = A @ A.conj().T/np.trace(A @ A.conj().T)
+        drho_i = [np.random.randn(dim, dim) + 1j*np.random.randn(dim, dim) for j in range(2)]
+        drho_i = [B + B.conj().T - np.trace(B + B.conj().T)*np.identity(dim)/dim for B in drho_i]
+        r.append(dim/(2*coeff)*np.real(np.einsum("ij,kji->k", rho_i, Lambda)))
+        dr.append([dim/(2*coeff)*np.real(np.einsum("ij,kji->k", B, Lambda)) for B in drho_i])
+        rho.append(rho_i)
+        drho.append(drho_i)
+
+    result = QFIM_Bloch_batch(r, dr)
+    assert result.shape == (4, 2, 2)
+    for i in range(4):
+        assert np.allclose(result[i], QFIM(rho[i], drho[i])) == 1
+        assert np.allclose(QFIM_Bloch(r[i], dr[i]), result[i]) == 1
+
 def test_QFIM_Gauss_multiparameter():
     """
     Test the Quantum Fisher Information Matrix (QFIM) for the Gaussian state representation in the case 
@@ -112,6 +222,33 @@ def test_QFIM_Gauss_singleparameter():
     # check the result
     assert np.allclose(result, (lamb*lamb-1)**2/2/(4*lamb**2-1)) == 1     
 
+def test_QFIM_Gauss_batch():
+    """
+    Test the QFIM for a stack of two-mode Gaussian states. This test checks that the 
+    batched QFIMs agree with the QFIMs of every single state.
+    """
+    np.random.seed(5)
+    m = 2
+    J = np.kron(np.identity(m), [[0., 1.], [-1., 0.]])
+    R, dR, D, dD = [], [], [], []
+    for i in range(3):
+        A = np.random.randn(2*m, 2*m)
+        S = expm(0.3*J @ (A + A.T))
+        C = S @ np.diag(np.repeat(0.6 + np.random.rand(m), 2)) @ S.T
+        mu = np.random.randn(2*m)
+        dmu = [np.random.randn(2*m) for j in range(2)]
+        dC = [B + B.T for B in np.random.randn(2, 2*m, 2*m)]
+        R.append(mu)
+        dR.append(dmu)
+        D.append(C + np.outer(mu, mu))
+        dD.append([dC[j] + np.outer(dmu[j], mu) + np.outer(mu, dmu[j]) for j in range(2)])
+
+    result = QFIM_Gauss_batch(R, dR, D, dD)
+    assert result.shape == (3, 2, 2)
+    for i in range(3):
+        assert np.allclose(result[i], QFIM_Gauss(R[i], dR[i], D[i], dD[i])) == 1
+        assert np.allclose(result[i], result[i].T) == 1
+
 def test_QFIM_LLD_singleparameter():
     """
     Test the left logarithmic derivative (LLD) for a specific parameterized quantum state.
@@ -188,6 +325,60 @@ def test_FI_Expt():
     # check the result is a float and approximately 1.0
     assert isinstance(result, float)
 
+def test_FIM_batch():
+    """
+    Test the FIM for a stack of probability distributions. This test checks that the 
+    batched FIMs agree with the FIMs of every single distribution, and that the 
+    outcomes with vanishing probabilities are discarded.
+    """
+    theta = np.linspace(0.1, 1.4, 5)
+    p = np.array([[np.cos(t)**2, np.sin(t)**2, 0.] for t in theta])
+    dp = np.array([[[-np.sin(2*t), np.sin(2*t), 1.], [0., 0., 1.]] for t in theta])
+    result = FIM_batch(p, dp)
+    assert result.shape == (5, 2, 2)
+    for i in range(5):
+        assert np.allclose(result[i], FIM(p[i], list(dp[i]))) == 1
+        assert np.allclose(result[i], [[4., 0.], [0., 0.]]) == 1
+
+def test_StreamingFI(tmp_path, monkeypatch):
+    """
+    Test the CFI based on the experiment data fed in chunks. This test checks that the 
+    streamed data give the same CFI as FI_Expt with all the data, also for pre-binned 
+    histograms, and that the state can be restored from a checkpoint.
+    """
+    monkeypatch.chdir(tmp_path)
+    np.random.seed(7)
+    dx = 0.1
+    y1 = np.random.normal(loc=0.0, scale=1.0, size=5000)
+    y2 = np.random.normal(loc=dx, scale=1.0, size=4000)
+    k1 = np.random.poisson(3., size=2000)
+    k2 = np.random.poisson(3.+dx, size=2000)
+    bins = np.linspace(-5., 5., 41)
+
+    for ftype, data1, data2 in [("norm", y1, y2), ("poisson", k1, k2), ("histogram", y1, y2)]:
+        stream = StreamingFI(ftype=ftype, bins=bins)
+        for chunk1 in np.array_split(data1, 7):
+            stream.update(y1=chunk1)
+        for chunk2 in np.array_split(data2, 3):
+            stream.update(y2=chunk2)
+        if ftype == "histogram":
+            expected = FI_Expt(np.histogram(data1, bins)[0], np.histogram(data2, bins)[0], dx, ftype="histogram")
+        else:
+            expected = FI_Expt(data1, data2, dx, ftype=ftype)
+        assert np.allclose(stream.FI(dx), expected) == 1
+        assert list(stream.count) == [len(data1), len(data2)]
+
+    stream.checkpoint("checkpoint")
+    restored = StreamingFI(ftype="histogram", bins=bins).resume("checkpoint")
+    assert np.allclose(restored.fidelity(), stream.fidelity()) == 1
+
+    with pytest.raises(ValueError):
+        StreamingFI(ftype="gamma")
+    with pytest.raises(ValueError):
+        StreamingFI(ftype="histogram")
+    with pytest.raises(ValueError):
+        StreamingFI().update(y1=y1).fidelity()
+
 def test_invalid_input():
     """
     Test the input validation for the functions in the Cramer-Rao module.
@@ -217,4 +408,5 @@ def test_invalid_input():
     with pytest.raises(TypeError):  
         RLD(np.array([[1, 0], [0, 1]]), None) # Invalid input type     
 
-
+    with pytest.raises(TypeError):
+        QFIM_pure(np.array([1., 0.]), None) # Invalid input type
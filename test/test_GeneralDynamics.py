@@ -0,0 +1,293 @@
+import pytest
+import numpy as np
+from scipy import sparse
+from quanestimation.Parameterization.GeneralDynamics import Lindblad, Lindblad_batch, _julia_output
+from quanestimation.AsymptoticBound.CramerRao import QFIM
+from quanestimation.Common.Common import annihilation
+
+def test_Lindblad_numpy():
+    """
+    Test the NumPy backend of the Lindblad dynamics for a qubit under dephasing.
+    This test checks the density matrix, its derivative and the QFI against the analytical
+    results rho_01 = exp(-i*omega*t - 2*gamma*t)/2 and F = t^2*exp(-4*gamma*t).
+    """
+    sz = np.array([[1., 0.], [0., -1.]])
+    omega, gamma = 1., 0.1
+    tspan = np.linspace(0., 5., 501)
+    rho0 = 0.5*np.ones((2, 2))
+    t = tspan[-1]
+    for method in ["expm", "ode"]:
+        dynamics = Lindblad(tspan, rho0, 0.5*omega*sz, [0.5*sz], decay=[[sz, gamma]], backend="numpy")
+        rho, drho = getattr(dynamics, method)()
+        assert len(rho) == 501 and len(drho) == 501
+        assert np.allclose(rho[0], rho0) == 1
+        assert np.allclose(rho[-1][0, 1], 0.5*np.exp(-1j*omega*t - 2*gamma*t)) == 1
+        assert np.allclose(drho[-1][0][0, 1], -0.5j*t*np.exp(-1j*omega*t - 2*gamma*t)) == 1
+        assert np.allclose(QFIM(rho[-1], drho[-1]), t**2*np.exp(-4*gamma*t)) == 1
+
+    # an empty dH is replaced by a zero derivative
+    rho, drho = Lindblad(tspan, rho0, 0.5*omega*sz, [], backend="numpy").expm(output="final")
+    assert np.allclose(rho[0, 1], 0.5*np.exp(-1j*omega*t)) == 1
+    assert np.allclose(drho, 0.) == 1
+
+    with pytest.raises(ValueError):
+        Lindblad(tspan, rho0, 0.5*omega*sz, [0.5*sz], backend="invalid")
+
+def test_Lindblad_numpy_controls():
+    """
+    Test the NumPy backend of the Lindblad dynamics with piecewise constant controls.
+    This test checks that one propagator is calculated for every distinct set of control
+    coefficients, and that the expm and ode methods agree for small time steps.
+    """
+    sx = np.array([[0., 1.], [1., 0.]])
+    sy = np.array([[0., -1.j], [1.j, 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    tspan = np.linspace(0., 5., 5001)
+    rho0 = 0.5*np.ones((2, 2))
+    ctrl = [0.5*np.sin(np.arange(50)), 0.3*np.cos(np.arange(50))]
+    ctrl[0][10:20] = ctrl[0][:10]
+    ctrl[1][10:20] = ctrl[1][:10]
+
+    res = []
+    for method in ["expm", "ode"]:
+        dynamics = Lindblad(tspan, rho0, 0.5*sz, [0.5*sz], decay=[[sz, 0.1]], Hc=[sx, sy], ctrl=ctrl, backend="numpy")
+        rho, drho = getattr(dynamics, method)()
+        assert len(dynamics._propagators) == 40
+        assert np.allclose(np.trace(rho[-1]), 1.) == 1
+        res.append(QFIM(rho[-1], drho[-1]))
+    assert np.allclose(res[0], res[1], rtol=1e-4) == 1
+
+def test_Lindblad_missing_ctrl():
+    """
+    Test the Lindblad dynamics with fewer control coefficient sequences than control 
+    Hamiltonians. This test checks that the missing sequences are set to zero, so that 
+    the decay rates are not paired with the remaining control Hamiltonians.
+    """
+    sx = np.array([[0., 1.], [1., 0.]])
+    sy = np.array([[0., -1.j], [1.j, 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    tspan = np.linspace(0., 1., 11)
+    rho0 = 0.5*np.ones((2, 2))
+    with pytest.warns(DeprecationWarning):
+        dynamics = Lindblad(tspan, rho0, 0.5*sz, [0.5*sz], decay=[[sz, 0.3]], Hc=[sx, sy], ctrl=[np.ones(10)], backend="numpy")
+    assert len(dynamics.control_coefficients) == 2
+    assert np.allclose(dynamics.control_coefficients[1], 0.) == 1
+    padded = Lindblad(tspan, rho0, 0.5*sz, [0.5*sz], decay=[[sz, 0.3]], Hc=[sx, sy], ctrl=[np.ones(10), np.zeros(10)], backend="numpy")
+    for method in ["expm", "ode"]:
+        rho, drho = getattr(dynamics, method)(output="final")
+        rho_padded, drho_padded = getattr(padded, method)(output="final")
+        assert np.allclose(rho, rho_padded) == 1
+        assert np.allclose(drho, drho_padded) == 1
+
+def test_Lindblad_output():
+    """
+    Test the output modes of the Lindblad dynamics with the NumPy backend.
+    This test checks that the final state, every kth state and the states at given times
+    agree with the corresponding entries of the whole evolution.
+    """
+    sx = np.array([[0., 1.], [1., 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    tspan = np.linspace(0., 2., 201)
+    dynamics = Lindblad(tspan, 0.5*np.ones((2, 2)), 0.5*sz, [0.5*sz, 0.5*sx], decay=[[sz, 0.1]], backend="numpy")
+    rho, drho = dynamics.expm()
+
+    rho_final, drho_final = dynamics.expm(output="final")
+    assert np.allclose(rho_final, rho[-1]) == 1
+    assert np.allclose(drho_final, drho[-1]) == 1
+
+    rho_k, drho_k = dynamics.ode(output=50)
+    rho_ode, drho_ode = dynamics.ode()
+    assert len(rho_k) == 5
+    assert np.allclose(rho_k, rho_ode[::50]) == 1
+    assert np.allclose(drho_k, drho_ode[::50]) == 1
+
+    rho_t, drho_t = dynamics.expm(output=[0.5, 1.5, 0.])
+    assert np.allclose(rho_t, [rho[50], rho[150], rho[0]]) == 1
+    assert np.allclose(drho_t, [drho[50], drho[150], drho[0]]) == 1
+
+    with pytest.raises(ValueError):
+        dynamics.expm(output="invalid")
+    with pytest.raises(ValueError):
+        dynamics.expm(output=0)
+
+def test_Lindblad_stacked():
+    """
+    Test the stacked arrays as the inputs and outputs of the Lindblad dynamics with the 
+    NumPy backend. This test checks that the stacked Hamiltonians and controls give the 
+    same dynamics as the lists without a copy of every matrix, and that the stacked 
+    outputs agree with the lists.
+    """
+    sx = np.array([[0., 1.], [1., 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    tspan = np.linspace(0., 1., 101)
+    rho0 = 0.5*np.ones((2, 2))
+    H0 = [0.5*sz*(1. + 0.1*t) for t in tspan]
+    dH = [0.5*sz, 0.5*sx]
+    ctrl = [0.2*np.sin(np.arange(10))]
+    rho, drho = Lindblad(tspan, rho0, H0, dH, Hc=[sx], ctrl=ctrl, backend="numpy").expm()
+
+    dH_s = np.array(dH, dtype=np.complex128)
+    dynamics = Lindblad(tspan, rho0, np.array(H0), dH_s, Hc=np.array([sx]), ctrl=np.array(ctrl), backend="numpy")
+    assert np.shares_memory(dynamics.Hamiltonian_derivative[1], dH_s)
+    rho_s, drho_s = dynamics.expm(stacked=True)
+    assert rho_s.shape == (101, 2, 2) and drho_s.shape == (101, 2, 2, 2)
+    assert rho_s.flags["C_CONTIGUOUS"] and drho_s.flags["C_CONTIGUOUS"]
+    assert np.allclose(rho_s, rho) == 1
+    assert np.allclose(drho_s, drho) == 1
+
+    rho_final, drho_final = dynamics.ode(output="final", stacked=True)
+    assert rho_final.shape == (2, 2) and drho_final.shape == (2, 2, 2)
+    assert np.allclose(drho_final, dynamics.ode()[1][-1]) == 1
+
+def test_julia_output():
+    """
+    Test the conversion of the results from Julia, whose vectors are indexed from zero 
+    in Python like lists. This test checks the lists and the stacked arrays at all and 
+    at the selected time points, including the second derivatives.
+    """
+    rho = [np.full((2, 2), t) for t in range(4)]
+    drho = [[np.full((2, 2), 10*t + i) for i in range(3)] for t in range(4)]
+    d2rho = [[np.full((2, 2), 100*t + i) for i in range(3)] for t in range(4)]
+
+    rho_l, drho_l, d2rho_l = _julia_output(rho, drho, np.arange(4), False, False, d2rho=d2rho)
+    assert type(rho_l) == list and type(drho_l[0]) == list and type(d2rho_l[0][0]) == np.ndarray
+    assert np.allclose(drho_l[2][1], 21.) == 1 and np.allclose(d2rho_l[3][2], 302.) == 1
+
+    rho_s, drho_s = _julia_output(rho, drho, np.array([1, 3]), False, True)
+    assert rho_s.shape == (2, 2, 2) and drho_s.shape == (2, 3, 2, 2)
+    assert np.allclose(rho_s, [rho[1], rho[3]]) == 1
+    assert np.allclose(drho_s, [drho[1], drho[3]]) == 1
+
+    rho_f, drho_f, d2rho_f = _julia_output(rho, drho, np.array([3]), True, True, d2rho=d2rho)
+    assert rho_f.shape == (2, 2) and drho_f.shape == (3, 2, 2) and d2rho_f.shape == (3, 2, 2)
+    assert np.allclose(d2rho_f, d2rho[3]) == 1
+
+def test_Lindblad_batch():
+    """
+    Test the Lindblad dynamics on a parameter grid. This test checks that the final 
+    states of all the grid points, evolved in one call and in several threads, agree 
+    with the dynamics of every single point with the NumPy and the sparse backends.
+    """
+    sx = np.array([[0., 1.], [1., 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    tspan = np.linspace(0., 2., 201)
+    rho0 = 0.5*np.ones((2, 2))
+    x = [np.linspace(0., 1., 5), np.linspace(0., 0.5, 4)]
+    H = lambda a, b: 0.5*a*sz + 0.5*b*sx
+    dH = lambda a, b: [0.5*sz, 0.5*sx]
+    ctrl = [0.2*np.sin(np.arange(20))]
+
+    for method in ["expm", "ode"]:
+        rho, drho = Lindblad_batch(tspan, rho0, H, dH, decay=[[sz, 0.1]], Hc=[sx], ctrl=ctrl, x=x, 
+                                   method=method, n_jobs=3)
+        assert rho.shape == (20, 2, 2) and drho.shape == (20, 2, 2, 2)
+        for i, (a, b) in enumerate([(a, b) for a in x[0] for b in x[1]]):
+            for backend in ["numpy", "sparse"]:
+                dynamics = Lindblad(tspan, rho0, H(a, b), dH(a, b), decay=[[sz, 0.1]], Hc=[sx], ctrl=ctrl, backend=backend)
+                rho_i, drho_i = getattr(dynamics, method)(output="final")
+                assert np.allclose(rho[i], rho_i) == 1
+                assert np.allclose(drho[i], drho_i) == 1
+
+    # the stacked Hamiltonians give the same states as the function on the grid
+    H_stack = np.array([H(a, b) for a in x[0] for b in x[1]])
+    dH_stack = np.array([dH(a, b) for a in x[0] for b in x[1]])
+    rho_stack, drho_stack = Lindblad_batch(tspan, rho0, H_stack, dH_stack, decay=[[sz, 0.1]], Hc=[sx], ctrl=ctrl, 
+                                           method="ode")
+    assert np.allclose(rho_stack, rho) == 1
+    assert np.allclose(drho_stack, drho) == 1
+
+    with pytest.raises(ValueError):
+        Lindblad_batch(tspan, rho0, H, dH)
+    with pytest.raises(ValueError):
+        Lindblad_batch(tspan, rho0, H_stack, dH_stack, method="invalid")
+
+def test_Lindblad_sparse():
+    """
+    Test the sparse backend of the Lindblad dynamics for a damped cavity and a qubit with 
+    controls. This test checks that the propagation with the sparse operators agrees with 
+    the NumPy backend for both methods.
+    """
+    a = annihilation(10, sparse=True)
+    assert sparse.issparse(a)
+    n = a.conj().T @ a
+    psi = np.zeros(10)
+    psi[:3] = 1./np.sqrt(3)
+    tspan = np.linspace(0., 1., 21)
+    for method in ["expm", "ode"]:
+        rho, drho = getattr(Lindblad(tspan, np.outer(psi, psi), n, [n], decay=[[a, 0.1]], backend="sparse"), method)()
+        dynamics = Lindblad(tspan, np.outer(psi, psi), n.toarray(), [n.toarray()], decay=[[a.toarray(), 0.1]], backend="numpy")
+        rho_dense, drho_dense = getattr(dynamics, method)()
+        assert np.allclose(rho, rho_dense) == 1
+        assert np.allclose(drho, drho_dense) == 1
+
+    sx = np.array([[0., 1.], [1., 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    tspan = np.linspace(0., 2., 201)
+    ctrl = [0.3*np.sin(np.arange(20))]
+    dynamics = Lindblad(tspan, 0.5*np.ones((2, 2)), sparse.csr_matrix(0.5*sz), [0.5*sz, 0.5*sx], 
+                        decay=[[sz, 0.1]], Hc=[sx], ctrl=ctrl, backend="sparse")
+    rho, drho = dynamics.ode(output="final", stacked=True)
+    dynamics = Lindblad(tspan, 0.5*np.ones((2, 2)), 0.5*sz, [0.5*sz, 0.5*sx], 
+                        decay=[[sz, 0.1]], Hc=[sx], ctrl=ctrl, backend="numpy")
+    rho_dense, drho_dense = dynamics.ode(output="final", stacked=True)
+    assert np.allclose(rho, rho_dense) == 1
+    assert np.allclose(drho, drho_dense) == 1
+
+    # the missing control sequences are zero, so the decay rate is not paired with sy
+    sy = np.array([[0., -1.j], [1.j, 0.]])
+    tspan = np.linspace(0., 1., 11)
+    for backend in ["sparse", "numpy"]:
+        with pytest.warns(DeprecationWarning):
+            dynamics = Lindblad(tspan, 0.5*np.ones((2, 2)), 0.5*sz, [0.5*sz], decay=[[sz, 0.3]], 
+                                Hc=[sx, sy], ctrl=[np.ones(10)], backend=backend)
+        for method in ["expm", "ode"]:
+            rho, drho = getattr(dynamics, method)(output="final")
+            assert np.allclose(rho[0, 1], 0.19042245-0.07452570j) == 1
+
+def test_Lindblad_julia_stacked(julia):
+    """
+    Test the stacked outputs of the Lindblad dynamics with the Julia backend. This test 
+    checks that the stacked arrays agree with the lists and with the NumPy backend, and 
+    that the second derivatives are returned as NumPy arrays.
+    """
+    sx = np.array([[0., 1.], [1., 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    tspan = np.linspace(0., 1., 101)
+    rho0 = 0.5*np.ones((2, 2))
+    dynamics = Lindblad(tspan, rho0, 0.5*sz, [0.5*sz, 0.5*sx], decay=[[sz, 0.1]], Hc=[sx], ctrl=[0.2*np.sin(np.arange(10))])
+    rho, drho = dynamics.expm()
+    rho_s, drho_s = dynamics.expm(stacked=True)
+    assert rho_s.shape == (101, 2, 2) and drho_s.shape == (101, 2, 2, 2)
+    assert rho_s.flags["C_CONTIGUOUS"] and drho_s.flags["C_CONTIGUOUS"]
+    assert np.allclose(rho_s, rho) == 1
+    assert np.allclose(drho_s, drho) == 1
+
+    rho_2, drho_2, d2rho = dynamics.secondorder_derivative([np.zeros((2, 2)), np.zeros((2, 2))])
+    assert type(d2rho[-1][0]) == np.ndarray
+    rho_2s, drho_2s, d2rho_s = dynamics.secondorder_derivative([np.zeros((2, 2)), np.zeros((2, 2))], stacked=True)
+    assert d2rho_s.shape == (101, 2, 2, 2)
+    assert np.allclose(rho_2s, rho_2) == 1 and np.allclose(d2rho_s, d2rho) == 1
+
+    dynamics.backend = "numpy"
+    rho_numpy, drho_numpy = dynamics.expm(stacked=True)
+    assert np.allclose(rho_s, rho_numpy) == 1
+    assert np.allclose(drho_s, drho_numpy) == 1
+
+def test_Lindblad_sparse_julia(julia):
+    """
+    Test the sparse backend of the Lindblad dynamics against the Julia backend for a 
+    qubit with fewer control coefficient sequences than control Hamiltonians.
+    """
+    sx = np.array([[0., 1.], [1., 0.]])
+    sy = np.array([[0., -1.j], [1.j, 0.]])
+    sz = np.array([[1., 0.], [0., -1.]])
+    tspan = np.linspace(0., 1., 11)
+    for method in ["expm", "ode"]:
+        res = []
+        for backend in ["sparse", "julia"]:
+            with pytest.warns(DeprecationWarning):
+                dynamics = Lindblad(tspan, 0.5*np.ones((2, 2)), 0.5*sz, [0.5*sz], decay=[[sz, 0.3]], 
+                                    Hc=[sx, sy], ctrl=[np.ones(10)], backend=backend)
+            res.append(getattr(dynamics, method)(output="final"))
+        assert np.allclose(res[0][0], res[1][0], rtol=1e-4) == 1
+        assert np.allclose(res[0][1], res[1][1], rtol=1e-4) == 1
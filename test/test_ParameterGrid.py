@@ -0,0 +1,53 @@
+import pytest
+import numpy as np
+from quanestimation.BayesianBound.ParameterGrid import ParameterGrid
+from quanestimation.BayesianBound.BayesCramerRao import BCFIM, BQFIM, BCRB, BQCRB, VTB, QVTB
+from quanestimation.BayesianBound.BayesEstimation import MLE, BayesCost
+
+def test_ParameterGrid():
+    """
+    Test the ParameterGrid for a two-parameter qubit model.
+    This test checks that the Bayesian bounds computed from a ParameterGrid agree with
+    those computed from the nested lists, and that the Fisher information is cached.
+    """
+    x = [np.linspace(0.1, 1.4, 5), np.linspace(0., np.pi/2, 7)]
+    p = np.ones((5, 7))/(1.3*np.pi/2)
+    dp = [[[0., 0.] for phi in x[1]] for theta in x[0]]
+    rho = [[np.array([[np.cos(theta)**2, np.cos(theta)*np.sin(theta)*np.exp(-1j*phi)],
+                      [np.cos(theta)*np.sin(theta)*np.exp(1j*phi), np.sin(theta)**2]])
+            for phi in x[1]] for theta in x[0]]
+    drho = [[[np.array([[-np.sin(2*theta), np.cos(2*theta)*np.exp(-1j*phi)],
+                        [np.cos(2*theta)*np.exp(1j*phi), np.sin(2*theta)]]),
+              np.array([[0, -1j*np.cos(theta)*np.sin(theta)*np.exp(-1j*phi)],
+                        [1j*np.cos(theta)*np.sin(theta)*np.exp(1j*phi), 0]])]
+             for phi in x[1]] for theta in x[0]]
+    grid = ParameterGrid(x, p, rho, drho, dp=dp)
+    assert grid.rho.shape == (35, 2, 2)
+    assert grid.drho.shape == (35, 2, 2, 2)
+
+    assert np.allclose(BCFIM(grid), BCFIM(x, p, rho, drho)) == 1
+    assert np.allclose(BQFIM(grid), BQFIM(x, p, rho, drho)) == 1
+    assert np.allclose(BCRB(grid, btype=2), BCRB(x, p, dp, rho, drho, btype=2)) == 1
+    assert np.allclose(BQCRB(grid, btype=2), BQCRB(x, p, dp, rho, drho, btype=2)) == 1
+    assert np.allclose(VTB(grid), VTB(x, p, dp, rho, drho)) == 1
+    assert np.allclose(QVTB(grid), QVTB(x, p, dp, rho, drho)) == 1
+    # the QFIM of the grid is computed once and shared
+    assert grid.QFIM() is grid.QFIM()
+    assert np.allclose(grid.QFIM()[0], [[4., 0.], [0., np.sin(2*x[0][0])**2]]) == 1
+
+    M = [np.array([[1., 0.], [0., 0.]]), np.array([[0., 0.], [0., 1.]])]
+    xest = [np.array([0.5, 0.5]), np.array([1., 1.])]
+    assert np.allclose(BayesCost(grid, xest=xest, M=M), BayesCost(x, p, xest, rho, M)) == 1
+    assert np.allclose(grid.likelihood(M)[:, 0], [np.cos(theta)**2 for theta in x[0] for phi in x[1]]) == 1
+
+    with pytest.raises(ValueError):
+        ParameterGrid(x, p, rho[0], drho)
+
+    # the grid points shared among threads give the same bounds
+    assert np.allclose(BCFIM(x, p, rho, drho, n_jobs=4), BCFIM(grid)) == 1
+    assert np.allclose(BQCRB(x, p, dp, rho, drho, btype=2, n_jobs=3), BQCRB(grid, btype=2)) == 1
+    assert np.allclose(QVTB(x, p, dp, rho, drho, n_jobs=-1), QVTB(grid)) == 1
+    assert np.allclose(ParameterGrid(x, p, rho, drho).LD(n_jobs=2), grid.LD()) == 1
+    assert np.allclose(BCFIM(x, p, rho, drho, n_jobs=np.int64(2)), BCFIM(grid)) == 1
+    with pytest.raises(ValueError):
+        BQFIM(x, p, rho, drho, n_jobs=0)